@@ -14,20 +14,56 @@ import argparse
 import logging
 import os
 import sys
+from collections.abc import Callable, Iterable
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from agnolog.core.registry import LogTypeRegistry
+    from agnolog.formatters import BaseFormatter
     from agnolog.scheduling import LogScheduler
 
-from agnolog.core.constants import DEFAULT_LOG_COUNT, DEFAULT_TIME_SCALE, VERSION
+from agnolog.core.constants import (
+    COLUMNAR_FORMATS,
+    COMPRESSION_CODECS,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_JSON_BACKEND,
+    DEFAULT_LOG_COUNT,
+    DEFAULT_TIME_SCALE,
+    DEFAULT_ZIPF_EXPONENT,
+    HTTP_APIS,
+    HTTP_CONCURRENCY,
+    JSON_BACKENDS,
+    ROTATION_INTERVALS,
+    STREAM_BUFFER_SIZE,
+    STREAM_FLUSH_INTERVAL,
+    SYSLOG_FORMATS,
+    TABLE_FORMATS,
+    TEE_FORMATS,
+    VERSION,
+)
+from agnolog.core.errors import ConfigurationError, InvalidConfigValueError, OutputError
 from agnolog.core.factory import LogFactory
+from agnolog.core.lua_adapter import get_lua_registry
+from agnolog.core.lua_runtime import LuaGeneratorError
 from agnolog.core.registry import get_registry, register_lua_generators
-from agnolog.formatters import JSONFormatter, LoghubCSVFormatter, TextFormatter
+from agnolog.formatters import (
+    JSONFormatter,
+    LoghubCSVFormatter,
+    SyslogFormatter,
+    TextFormatter,
+)
 from agnolog.logutils import get_internal_logger, setup_internal_logging
-from agnolog.output import FileOutputHandler, StreamOutputHandler
+from agnolog.output import (
+    ColumnarFileHandler,
+    FileOutputHandler,
+    MmapFileHandler,
+    QueuedOutputHandler,
+    SocketOutputHandler,
+    StreamOutputHandler,
+)
+from agnolog.output.compression import check_codec, compressed_path
 from agnolog.scheduling import LogScheduler
 
 
@@ -78,41 +114,88 @@ def list_themes() -> None:
     print()
 
 
-def resolve_resources_path(parsed: argparse.Namespace) -> str | None:
-    """Resolve the final resources path from --theme or --resources."""
-    if parsed.resources:
-        return parsed.resources
-
-    if parsed.theme:
-        theme_path = get_theme_path(parsed.theme)
-        if theme_path:
-            return theme_path
-        # If not frozen but --theme used, try local resources/
-        local_path = os.path.join("resources", parsed.theme)
-        if os.path.isdir(local_path):
-            return local_path
-        print(f"Error: Theme '{parsed.theme}' not found.", file=sys.stderr)
-        if is_frozen():
-            print("Use --list-themes to see available themes.", file=sys.stderr)
-        return None
+def resolve_theme(theme_name: str) -> str | None:
+    """Resolve a single --theme value to its resource directory path."""
+    theme_path = get_theme_path(theme_name)
+    if theme_path:
+        return theme_path
+    # If not frozen but --theme used, try local resources/
+    local_path = os.path.join("resources", theme_name)
+    if os.path.isdir(local_path):
+        return local_path
+    print(f"Error: Theme '{theme_name}' not found.", file=sys.stderr)
+    if is_frozen():
+        print("Use --list-themes to see available themes.", file=sys.stderr)
+    return None
+
+
+def resolve_resources_paths(parsed: argparse.Namespace) -> list[str] | None:
+    """
+    Resolve the final resources paths from --theme and --resources.
+
+    Both options may be repeated; more than one path selects mixed-theme
+    generation, where every theme is loaded under its own namespace.
+    """
+    paths: list[str] = list(parsed.resources or [])
+
+    for theme_name in parsed.theme or []:
+        theme_path = resolve_theme(theme_name)
+        if theme_path is None:
+            return None
+        paths.append(theme_path)
+
+    if paths:
+        namespaces = [theme_namespace(p) for p in paths]
+        duplicates = sorted({ns for ns in namespaces if namespaces.count(ns) > 1})
+        if duplicates:
+            print(f"Error: Duplicate themes: {', '.join(duplicates)}", file=sys.stderr)
+            return None
+        return paths
 
     # No --resources and no --theme: use default bundled theme if frozen
     if is_frozen():
         default_theme = get_theme_path("mmorpg")
         if default_theme:
-            return default_theme
+            return [default_theme]
         # Fall back to first available theme
         bundled = get_bundled_resources_path()
         if bundled:
             for entry in sorted(os.listdir(bundled)):
                 theme_dir = os.path.join(bundled, entry)
                 if os.path.isdir(theme_dir):
-                    return theme_dir
+                    return [theme_dir]
 
     print("Error: --resources or --theme is required.", file=sys.stderr)
     return None
 
 
+def theme_namespace(resources_path: str) -> str:
+    """Derive a theme namespace from its resources directory name."""
+    return Path(resources_path).resolve().name
+
+
+def load_lua_generators(resources_paths: list[str] | None) -> int:
+    """
+    Register Lua generators for the selected theme(s).
+
+    A single theme keeps its plain log type names. Several themes are
+    each loaded into their own sandbox and registered as
+    "<theme>:<log_type>" so they can share one scheduler.
+
+    Returns:
+        Number of Lua generators registered
+    """
+    if not resources_paths:
+        return register_lua_generators(None)
+    if len(resources_paths) == 1:
+        return register_lua_generators(resources_paths[0])
+
+    count = 0
+    for path in resources_paths:
+        count += register_lua_generators(path, namespace=theme_namespace(path))
+    return count
+
+
 def parse_categories(category_strs: list[str] | None) -> list[str] | None:
     """Parse category strings to uppercase category names."""
     if not category_strs:
@@ -123,7 +206,29 @@ def parse_categories(category_strs: list[str] | None) -> list[str] | None:
     return categories if categories else None
 
 
-def list_types(use_lua: bool = True, resources_path: str | None = None) -> None:
+def parse_cardinality(specs: list[str] | None) -> dict[str, tuple[int, float]]:
+    """
+    Parse --cardinality specs of the form FIELD=SIZE[:ZIPF_S].
+
+    Raises:
+        ValueError: If a spec is malformed
+    """
+    settings: dict[str, tuple[int, float]] = {}
+    for spec in specs or []:
+        field, sep, value = spec.partition("=")
+        size_str, _, zipf_str = value.partition(":")
+        try:
+            if not field or not sep:
+                raise ValueError
+            size = int(size_str)
+            zipf_s = float(zipf_str) if zipf_str else DEFAULT_ZIPF_EXPONENT
+        except ValueError:
+            raise ValueError(f"Invalid cardinality spec: {spec!r} (expected FIELD=SIZE[:ZIPF_S])")
+        settings[field] = (size, zipf_s)
+    return settings
+
+
+def list_types(use_lua: bool = True, resources_paths: list[str] | None = None) -> None:
     """List all available log types."""
     # Import Python generators to register them
     from agnolog import generators  # noqa
@@ -131,7 +236,7 @@ def list_types(use_lua: bool = True, resources_path: str | None = None) -> None:
     # Load Lua generators if requested
     if use_lua:
         try:
-            lua_count = register_lua_generators(resources_path)
+            lua_count = load_lua_generators(resources_paths)
         except Exception as e:
             print(f"Warning: Failed to load Lua generators: {e}", file=sys.stderr)
             lua_count = 0
@@ -158,7 +263,7 @@ def list_types(use_lua: bool = True, resources_path: str | None = None) -> None:
                     print(f"  {log_type:<35} {meta.recurrence.name:<15}")
 
 
-def list_categories(use_lua: bool = True, resources_path: str | None = None) -> None:
+def list_categories(use_lua: bool = True, resources_paths: list[str] | None = None) -> None:
     """List all available categories."""
     # Import Python generators to register them
     from agnolog import generators  # noqa
@@ -166,7 +271,7 @@ def list_categories(use_lua: bool = True, resources_path: str | None = None) ->
     # Load Lua generators if requested
     if use_lua:
         try:
-            register_lua_generators(resources_path)
+            load_lua_generators(resources_paths)
         except Exception as e:
             print(f"Warning: Failed to load Lua generators: {e}", file=sys.stderr)
 
@@ -180,7 +285,7 @@ def list_categories(use_lua: bool = True, resources_path: str | None = None) ->
     print()
 
 
-def show_merge_groups(use_lua: bool = True, resources_path: str | None = None) -> None:
+def show_merge_groups(use_lua: bool = True, resources_paths: list[str] | None = None) -> None:
     """Show merge groups in LLM-readable format for validation."""
     # Import Python generators to register them
     from agnolog import generators  # noqa
@@ -188,7 +293,7 @@ def show_merge_groups(use_lua: bool = True, resources_path: str | None = None) -
     # Load Lua generators if requested
     if use_lua:
         try:
-            register_lua_generators(resources_path)
+            load_lua_generators(resources_paths)
         except Exception as e:
             print(f"Warning: Failed to load Lua generators: {e}", file=sys.stderr)
 
@@ -341,6 +446,114 @@ def validate_resources(resources_path: str | None = None) -> int:
         return 0
 
 
+def _reset_run_state(
+    parsed: argparse.Namespace,
+    cardinality: dict[str, tuple[int, float]],
+    use_lua: bool,
+) -> bool:
+    """
+    Seed `random` and give every Lua sandbox fresh per-run state.
+
+    Sandboxes outlive a run when main() is called in-process, and
+    sampling entries ahead of a run draws from them too; starting from
+    fresh pools lets --seed reproduce the same output.
+
+    Returns:
+        False after printing an error if a --cardinality override is invalid
+    """
+    if parsed.seed is not None:
+        import random
+
+        random.seed(parsed.seed)
+    if not use_lua:
+        return True
+
+    lua_registry = get_lua_registry()
+    lua_registry.reset_state()
+
+    # Apply --cardinality overrides to every loaded theme
+    try:
+        for field, (size, zipf_s) in cardinality.items():
+            lua_registry.configure_cardinality(field, size, zipf_s)
+    except LuaGeneratorError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def _time_range(parsed: argparse.Namespace) -> tuple[datetime, datetime] | None:
+    """
+    Get the generation time range from --start-time and --duration.
+
+    Called before any output is opened, so a bad start time leaves
+    existing files untouched.
+
+    Returns:
+        (start, end), or None after printing an error if --start-time is invalid
+    """
+    if parsed.start_time:
+        try:
+            start_time = datetime.fromisoformat(parsed.start_time)
+        except ValueError:
+            print(f"Error: Invalid start time format: {parsed.start_time}", file=sys.stderr)
+            return None
+    else:
+        start_time = datetime.now()
+
+    return start_time, start_time + timedelta(seconds=parsed.duration)
+
+
+def _run_generation(
+    parsed: argparse.Namespace,
+    chunks: Iterable[list],
+    write: Callable[[list], None],
+    handler: object,
+    logger: logging.Logger,
+) -> int:
+    """
+    Write generated chunks, closing the output handler on every path.
+
+    Closing finishes the output even when generation stops early (final
+    compressed blocks, manifests, the real size of preallocated files).
+
+    Args:
+        parsed: Parsed arguments
+        chunks: Chunks of entries from the scheduler
+        write: Called with each chunk
+        handler: Output handler, closed when generation ends
+        logger: Internal logger
+
+    Returns:
+        0 on success, 130 if interrupted, 1 on error
+    """
+    closed = False
+    try:
+        for chunk in chunks:
+            write(chunk)
+        closed = True
+        handler.close()  # type: ignore[attr-defined]
+        return 0
+
+    except KeyboardInterrupt:
+        if not parsed.quiet:
+            print("\nInterrupted", file=sys.stderr)
+        return 130
+
+    except Exception as e:
+        logger.exception(f"Error during generation: {e}")
+        if not parsed.quiet:
+            print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    finally:
+        if not closed:
+            # The error being reported is the first one, not a follow-up from close
+            try:
+                handler.close()  # type: ignore[attr-defined]
+            except Exception as e:
+                logger.warning(f"Error closing output: {e}")
+
+
 def _generate_loghub_output(
     parsed: argparse.Namespace,
     scheduler: "LogScheduler",
@@ -355,87 +568,406 @@ def _generate_loghub_output(
     - PREFIX_structured.csv: Structured CSV with templates
     - PREFIX_templates.csv: Unique templates list
     """
-    from datetime import timedelta
-
-    prefix = parsed.loghub
-    log_path = f"{prefix}.log"
-    structured_path = f"{prefix}_structured.csv"
-    templates_path = f"{prefix}_templates.csv"
+    from agnolog.output.loghub_handler import LoghubFileHandler
 
-    if not parsed.quiet:
-        print("Generating loghub output:", file=sys.stderr)
-        print(f"  - {log_path}", file=sys.stderr)
-        print(f"  - {structured_path}", file=sys.stderr)
-        print(f"  - {templates_path}", file=sys.stderr)
+    # Before the handler, which truncates existing files
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
 
-    # Create formatters
-    text_formatter = TextFormatter(registry=registry)
+    # Create formatter
     csv_formatter = LoghubCSVFormatter(
         registry=registry,
         component=parsed.server_id or "Server",
     )
 
-    # Create output handlers
-    log_handler = FileOutputHandler(log_path)
-    structured_handler = FileOutputHandler(structured_path)
+    handler = LoghubFileHandler(
+        parsed.loghub,
+        formatter=csv_formatter,
+        compression=parsed.compress,
+        compression_threads=parsed.compress_threads,
+    )
 
-    # Write CSV header
-    structured_handler.write(csv_formatter.format_header())
+    if not parsed.quiet:
+        print("Generating loghub output:", file=sys.stderr)
+        for path in handler.paths:
+            print(f"  - {path}", file=sys.stderr)
 
-    # Determine time range
-    if parsed.start_time:
-        try:
-            start_time = datetime.fromisoformat(parsed.start_time)
-        except ValueError:
-            print(f"Error: Invalid start time format: {parsed.start_time}", file=sys.stderr)
+    # Generate logs; each text line is rendered once, for both .log and the Content column
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, handler.write_entries, handler, logger)
+
+    if status == 0 and not parsed.quiet:
+        print(f"Generated {handler.entry_count} log entries", file=sys.stderr)
+        print(f"Created {handler.template_count} unique templates", file=sys.stderr)
+
+    return status
+
+
+def _generate_columnar_output(
+    parsed: argparse.Namespace,
+    scheduler: "LogScheduler",
+    registry: "LogTypeRegistry",
+    logger: logging.Logger,
+) -> int:
+    """
+    Generate logs into a Parquet or Arrow IPC file.
+
+    Entries are buffered into one row group per log type (or merge group).
+    """
+    from agnolog.formatters import ColumnarFormatter
+
+    if not parsed.output:
+        print(f"Error: -f {parsed.format} needs an output file (-o)", file=sys.stderr)
+        return 1
+
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+
+    try:
+        handler = ColumnarFileHandler(
+            parsed.output, file_format=parsed.format, formatter=ColumnarFormatter(registry)
+        )
+    except ConfigurationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not parsed.quiet:
+        print(f"Writing {parsed.format} to {parsed.output}...", file=sys.stderr)
+
+    # Generate logs
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, handler.write_entries, handler, logger)
+
+    if status == 0 and not parsed.quiet:
+        print(
+            f"Generated {handler.entry_count} log entries in {handler.row_group_count} row groups",
+            file=sys.stderr,
+        )
+
+    return status
+
+
+def _generate_segmented_output(
+    parsed: argparse.Namespace,
+    scheduler: "LogScheduler",
+    formatter: "BaseFormatter",
+    logger: logging.Logger,
+) -> int:
+    """
+    Generate logs into segment files rotated by log time and/or line count.
+
+    Segment names carry the period of their entries (see SegmentedFileHandler).
+    """
+    from agnolog.output.segment_handler import SegmentedFileHandler
+
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+
+    try:
+        handler = SegmentedFileHandler(
+            compressed_path(parsed.output, parsed.compress),
+            formatter=formatter,
+            interval=parsed.rotate,
+            max_lines=parsed.rotate_lines,
+            compression=parsed.compress,
+            compression_threads=parsed.compress_threads,
+        )
+    except (ConfigurationError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not parsed.quiet:
+        print(f"Writing segments of {parsed.output}...", file=sys.stderr)
+
+    # Generate logs
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, handler.write_entries, handler, logger)
+
+    if status == 0 and not parsed.quiet:
+        print(
+            f"Generated {handler.entry_count} log entries in {len(handler.paths)} segments",
+            file=sys.stderr,
+        )
+
+    return status
+
+
+def _generate_partitioned_output(
+    parsed: argparse.Namespace,
+    scheduler: "LogScheduler",
+    formatter: "BaseFormatter",
+    logger: logging.Logger,
+) -> int:
+    """
+    Generate logs into category=/date=/hour= partition directories.
+
+    A _manifest.json at the root lists the row counts of every partition.
+    """
+    from agnolog.output.partition_handler import PartitionedFileHandler
+
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+
+    try:
+        handler = PartitionedFileHandler(
+            parsed.partitions,
+            formatter=formatter,
+            extension=".log" if parsed.format == "text" else ".ndjson",
+            max_rows_per_file=parsed.rotate_lines,
+            compression=parsed.compress,
+        )
+    except (ConfigurationError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not parsed.quiet:
+        print(f"Writing partitions to {parsed.partitions}/...", file=sys.stderr)
+
+    # Generate logs
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, handler.write_entries, handler, logger)
+
+    if status == 0 and not parsed.quiet:
+        print(
+            f"Generated {handler.entry_count} log entries in {len(handler.paths)} files",
+            file=sys.stderr,
+        )
+
+    return status
+
+
+def _generate_http_output(
+    parsed: argparse.Namespace,
+    scheduler: "LogScheduler",
+    formatter: "BaseFormatter",
+    logger: logging.Logger,
+) -> int:
+    """
+    Generate logs and post them in batches to an HTTP bulk ingestion API.
+
+    Requests are sent by a pool of keep-alive connections (--http-concurrency).
+    """
+    from agnolog.output.http_handler import HttpBulkHandler
+
+    headers = {}
+    for header in parsed.http_header or ():
+        name, separator, value = header.partition(":")
+        if not separator or not name.strip():
+            print(f"Error: Invalid header (expected 'Name: value'): {header}", file=sys.stderr)
             return 1
-    else:
-        start_time = datetime.now()
+        headers[name.strip()] = value.strip()
 
-    end_time = start_time + timedelta(seconds=parsed.duration)
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+
+    try:
+        handler = HttpBulkHandler(
+            parsed.send,
+            api=parsed.http_api,
+            formatter=formatter,
+            concurrency=parsed.http_concurrency,
+            compress=parsed.http_gzip,
+            headers=headers,
+            json_backend=parsed.json_backend,
+        )
+    except (ConfigurationError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not parsed.quiet:
+        print(f"Sending to {parsed.send} ({parsed.http_api})...", file=sys.stderr)
 
     # Generate logs
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, handler.write_entries, handler, logger)
+
+    stats = handler.stats
+    logger.debug(
+        f"HTTP output: {stats.requests} requests, {stats.retries} retries, "
+        f"{stats.rejected} rejected documents"
+    )
+    if status == 0 and not parsed.quiet:
+        print(
+            f"Generated {handler.entry_count} log entries in {stats.requests} requests",
+            file=sys.stderr,
+        )
+
+    return status
+
+
+def _tee_sink(
+    parsed: argparse.Namespace,
+    sink_format: str,
+    destination: str,
+    registry: "LogTypeRegistry",
+) -> object:
+    """Build one --tee sink: an entry-based handler or a (formatter, handler) pair."""
+    from agnolog.formatters import ColumnarFormatter
+    from agnolog.output.loghub_handler import LoghubFileHandler
+
+    if destination == "-" and sink_format not in ("json", "ndjson", "text"):
+        raise InvalidConfigValueError("--tee", f"{sink_format}:-", "a file destination")
+    if sink_format == "loghub":
+        return LoghubFileHandler(
+            destination,
+            formatter=LoghubCSVFormatter(registry=registry, component=parsed.server_id or "Server"),
+            compression=parsed.compress,
+            compression_threads=parsed.compress_threads,
+        )
+    if sink_format in COLUMNAR_FORMATS:
+        return ColumnarFileHandler(
+            destination, file_format=sink_format, formatter=ColumnarFormatter(registry)
+        )
+
+    formatter: BaseFormatter
+    if sink_format == "text":
+        formatter = TextFormatter()
+    else:
+        formatter = JSONFormatter(
+            pretty=parsed.pretty and sink_format == "json", backend=parsed.json_backend
+        )
+    if parsed.syslog:
+        formatter = SyslogFormatter(formatter, rfc=parsed.syslog)
+    if destination == "-":
+        handler = StreamOutputHandler(
+            add_newline=True,
+            buffer_size=STREAM_BUFFER_SIZE,
+            flush_interval=STREAM_FLUSH_INTERVAL,
+            binary=True,
+        )
+    else:
+        handler = FileOutputHandler(
+            compressed_path(destination, parsed.compress),
+            compression=parsed.compress,
+            compression_threads=parsed.compress_threads,
+        )
+    return formatter, handler
+
+
+def _generate_tee_output(
+    parsed: argparse.Namespace,
+    scheduler: "LogScheduler",
+    registry: "LogTypeRegistry",
+    logger: logging.Logger,
+) -> int:
+    """
+    Generate logs once and write them to every --tee sink.
+
+    Each sink formats and writes on its own thread.
+    """
+    from agnolog.output.tee_handler import TeeHandler
+
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+
+    sinks: list[object] = []
+    written: set[str] = set()
     try:
-        count = 0
-        for entry in scheduler.generate_range(start_time, end_time, max_logs=parsed.count):
-            # Write to .log file
-            text_output = text_formatter.format(entry)
-            log_handler.write(text_output)
+        for spec in parsed.tee:
+            sink_format, separator, destination = spec.partition(":")
+            if not separator or not destination or sink_format not in TEE_FORMATS:
+                raise InvalidConfigValueError(
+                    "--tee", spec, f"FORMAT:DEST with FORMAT one of {', '.join(TEE_FORMATS)}"
+                )
+            # Two sinks writing one file would interleave or truncate each other
+            paths = (
+                [f"{destination}.log", f"{destination}_structured.csv"]
+                if sink_format == "loghub"
+                else [destination]
+            )
+            for path in paths:
+                path = os.path.abspath(path) if destination != "-" else path
+                if path in written:
+                    raise InvalidConfigValueError(
+                        "--tee", spec, "a destination no other sink writes"
+                    )
+                written.add(path)
+            sinks.append(_tee_sink(parsed, sink_format, destination, registry))
+        tee = TeeHandler(sinks)
+    except (ConfigurationError, OutputError) as e:
+        for sink in sinks:
+            (sink[1] if isinstance(sink, tuple) else sink).close()
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
-            # Write to _structured.csv
-            csv_output = csv_formatter.format(entry)
-            structured_handler.write(csv_output)
+    if not parsed.quiet:
+        print(f"Writing to {len(sinks)} outputs...", file=sys.stderr)
 
-            count += 1
+    # Generate logs
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, tee.write_entries, tee, logger)
 
-        log_handler.close()
-        structured_handler.close()
+    for spec, stats in zip(parsed.tee, tee.stats, strict=True):
+        logger.debug(
+            f"Tee sink {spec}: high-water mark {stats.high_water_mark}/{stats.capacity}, "
+            f"{stats.stalls} stalls ({stats.stall_seconds:.3f}s)"
+        )
+    if status == 0 and not parsed.quiet:
+        print(f"Generated {tee.entry_count} log entries", file=sys.stderr)
 
-        # Write templates.csv
-        templates_content = csv_formatter.format_templates_csv()
-        with open(templates_path, "w", encoding="utf-8") as f:
-            f.write(templates_content)
-            f.write("\n")
+    return status
 
-        if not parsed.quiet:
-            print(f"Generated {count} log entries", file=sys.stderr)
-            print(f"Created {len(csv_formatter.get_templates())} unique templates", file=sys.stderr)
 
-        return 0
+def _generate_table_output(
+    parsed: argparse.Namespace,
+    scheduler: "LogScheduler",
+    factory: LogFactory,
+    registry: "LogTypeRegistry",
+    cardinality: dict[str, tuple[int, float]],
+    use_lua: bool,
+    logger: logging.Logger,
+) -> int:
+    """
+    Generate logs into one table file per merge group.
 
-    except KeyboardInterrupt:
-        if not parsed.quiet:
-            print("\nInterrupted", file=sys.stderr)
-        log_handler.close()
-        structured_handler.close()
-        return 130
+    Table columns are fixed from sample entries of every enabled log type
+    before generation starts; generator state is reset after sampling.
+    """
+    from agnolog.output.table_writer import MergeGroupTableWriter, sample_entries
 
-    except Exception as e:
-        logger.exception(f"Error during generation: {e}")
-        if not parsed.quiet:
-            print(f"Error: {e}", file=sys.stderr)
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+    start_time = time_range[0]
+
+    samples = sample_entries(factory, scheduler.get_enabled_types(), timestamp=start_time)
+    # The samples are never written: the run starts from the state it would have without them
+    if not _reset_run_state(parsed, cardinality, use_lua):
         return 1
 
+    try:
+        writer = MergeGroupTableWriter(
+            parsed.tables,
+            parsed.table_format,
+            registry=registry,
+            samples=samples,
+            json_backend=parsed.json_backend,
+        )
+    except ConfigurationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not parsed.quiet:
+        print(f"Writing {parsed.table_format} tables to {parsed.tables}/...", file=sys.stderr)
+
+    # Generate logs
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count)
+    status = _run_generation(parsed, chunks, writer.write_entries, writer, logger)
+
+    if status == 0 and not parsed.quiet:
+        print(
+            f"Generated {writer.entry_count} log entries into {len(writer.paths)} tables",
+            file=sys.stderr,
+        )
+
+    return status
+
 
 def main(args: list[str] | None = None) -> int:
     """Main CLI entry point."""
@@ -450,6 +982,7 @@ Examples:
   agnolog --resources ./res --loghub output -n 1000  Generate loghub format (3 files)
   agnolog --list-themes                              List available themes
   agnolog --theme mmorpg --list-types                List all log types in a theme
+  agnolog --theme linux-logs --theme windows11 -n 1000  Mix themes into one stream
   agnolog --resources ./res validate                 Validate all resources
         """,
     )
@@ -472,9 +1005,10 @@ Examples:
     parser.add_argument(
         "-f",
         "--format",
-        choices=["json", "text", "ndjson"],
+        choices=["json", "text", "ndjson", *COLUMNAR_FORMATS],
         default="json",
-        help="Output format (default: json)",
+        help="Output format (default: json). parquet and arrow (Arrow IPC / Feather) "
+        "need -o and pyarrow (pip install agnolog[columnar])",
     )
 
     parser.add_argument(
@@ -485,6 +1019,69 @@ Examples:
         help="Output file (default: stdout)",
     )
 
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="With -o: preallocate the file from the first lines' length times -n and "
+        "write through a memory-mapped window (large fixed-size builds)",
+    )
+
+    parser.add_argument(
+        "--send",
+        type=str,
+        metavar="URL",
+        default=None,
+        help="Send lines to a collector instead of a file: tcp://HOST:PORT, "
+        "udp://HOST:PORT, unix:///PATH or unixgram:///PATH; or post batches to an "
+        "HTTP bulk API at http(s)://HOST:PORT/PATH (see --http-api)",
+    )
+
+    parser.add_argument(
+        "--http-api",
+        choices=HTTP_APIS,
+        default="elasticsearch",
+        help="Request shape for http(s) --send URLs: elasticsearch (_bulk), loki (push) "
+        "or splunk (HEC) (default: elasticsearch)",
+    )
+
+    parser.add_argument(
+        "--http-header",
+        action="append",
+        metavar="'NAME: VALUE'",
+        default=None,
+        help="Extra HTTP request header, repeatable (e.g. 'Authorization: Splunk TOKEN')",
+    )
+
+    parser.add_argument(
+        "--http-gzip",
+        action="store_true",
+        help="Gzip HTTP request bodies",
+    )
+
+    parser.add_argument(
+        "--http-concurrency",
+        type=int,
+        metavar="N",
+        default=HTTP_CONCURRENCY,
+        help=f"HTTP requests in flight, one keep-alive connection each "
+        f"(default: {HTTP_CONCURRENCY})",
+    )
+
+    parser.add_argument(
+        "--syslog",
+        choices=SYSLOG_FORMATS,
+        default=None,
+        help="Wrap each line in an RFC 5424 or RFC 3164 syslog header "
+        "(octet-counted framing over tcp://)",
+    )
+
+    parser.add_argument(
+        "--line-buffered",
+        action="store_true",
+        help="Write and flush stdout after every entry (for interactive tailing); "
+        "by default stdout is buffered for throughput",
+    )
+
     parser.add_argument(
         "--loghub",
         type=str,
@@ -493,6 +1090,74 @@ Examples:
         help="Output in loghub format: PREFIX.log, PREFIX_structured.csv, PREFIX_templates.csv",
     )
 
+    parser.add_argument(
+        "--rotate",
+        choices=tuple(ROTATION_INTERVALS),
+        default=None,
+        help="With -o: write one file per minute/hour/day of log time, named after "
+        "the period (e.g. server-2026-01-01_13.log)",
+    )
+
+    parser.add_argument(
+        "--rotate-lines",
+        type=int,
+        metavar="N",
+        default=None,
+        help="With -o: start a new numbered part every N lines "
+        "(with --partitions: rows per part file)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSION_CODECS,
+        default=None,
+        help="Compress -o and --loghub files as they are written, adding the codec's "
+        "extension (.gz, .zst, .lz4); zstd and lz4 need pip install agnolog[compression]",
+    )
+
+    parser.add_argument(
+        "--compress-threads",
+        type=int,
+        metavar="N",
+        default=None,
+        help="Threads compressing blocks in parallel (default: CPU count, at most 4)",
+    )
+
+    parser.add_argument(
+        "--tables",
+        type=str,
+        metavar="DIR",
+        default=None,
+        help="Write one table file per merge group (ungrouped types: one per type) into DIR",
+    )
+
+    parser.add_argument(
+        "--table-format",
+        choices=TABLE_FORMATS,
+        default="csv",
+        help="File format for --tables (default: csv; parquet needs pyarrow)",
+    )
+
+    parser.add_argument(
+        "--partitions",
+        type=str,
+        metavar="DIR",
+        default=None,
+        help="Write DIR/category=X/date=YYYY-MM-DD/hour=HH/part-N files (json/ndjson/text) "
+        "and a _manifest.json of row counts",
+    )
+
+    parser.add_argument(
+        "--tee",
+        action="append",
+        metavar="FORMAT:DEST",
+        default=None,
+        help="Write the same entries to several outputs, each formatted on its own thread "
+        f"(repeatable). FORMAT: {', '.join(TEE_FORMATS)}; DEST: a file, - for stdout, or "
+        "the file prefix for loghub (e.g. --tee ndjson:out.ndjson --tee text:- "
+        "--tee loghub:out/server)",
+    )
+
     parser.add_argument(
         "--categories",
         type=str,
@@ -541,6 +1206,13 @@ Examples:
         help="Pretty-print JSON output",
     )
 
+    parser.add_argument(
+        "--json-backend",
+        choices=JSON_BACKENDS,
+        default=DEFAULT_JSON_BACKEND,
+        help="JSON serializer (default: auto, the fastest installed of orjson/msgspec/stdlib)",
+    )
+
     parser.add_argument(
         "--server-id",
         type=str,
@@ -585,18 +1257,31 @@ Examples:
         help="Random seed for reproducible output",
     )
 
+    parser.add_argument(
+        "--cardinality",
+        type=str,
+        nargs="+",
+        metavar="FIELD=SIZE[:ZIPF_S]",
+        help="Bound a ctx.gen field to SIZE distinct Zipf-skewed values "
+        "(e.g., ip_address=500:1.2 session_id=2000)",
+    )
+
     parser.add_argument(
         "--resources",
         type=str,
+        action="append",
         default=None,
-        help="Path to resources directory (contains data/ and generators/ subdirectories)",
+        help="Path to resources directory (contains data/ and generators/ subdirectories). "
+        "Repeat to mix several themes into one stream",
     )
 
     parser.add_argument(
         "--theme",
         type=str,
+        action="append",
         default=None,
-        help="Theme name to use (resolves to bundled or local resources/<name>)",
+        help="Theme name to use (resolves to bundled or local resources/<name>). "
+        "Repeat to mix several themes into one stream",
     )
 
     parser.add_argument(
@@ -633,38 +1318,98 @@ Examples:
         list_themes()
         return 0
 
-    # Resolve resources path from --resources or --theme
-    resources_path = resolve_resources_path(parsed)
-    if resources_path is None:
+    # Resolve resources paths from --resources or --theme
+    resources_paths = resolve_resources_paths(parsed)
+    if resources_paths is None:
         return 1
 
     # Handle validate subcommand
     if parsed.command == "validate":
-        return validate_resources(resources_path)
+        return max(validate_resources(path) for path in resources_paths)
 
     # Determine whether to use Lua
     use_lua = parsed.use_lua and not parsed.use_python
 
     # Handle list-types early
     if parsed.list_types:
-        list_types(use_lua=use_lua, resources_path=resources_path)
+        list_types(use_lua=use_lua, resources_paths=resources_paths)
         return 0
 
     # Handle list-categories early
     if parsed.list_categories:
-        list_categories(use_lua=use_lua, resources_path=resources_path)
+        list_categories(use_lua=use_lua, resources_paths=resources_paths)
         return 0
 
     # Handle show-merge-groups early
     if parsed.show_merge_groups:
-        show_merge_groups(use_lua=use_lua, resources_path=resources_path)
+        show_merge_groups(use_lua=use_lua, resources_paths=resources_paths)
         return 0
 
-    # Set random seed if provided
-    if parsed.seed is not None:
-        import random
+    try:
+        cardinality = parse_cardinality(parsed.cardinality)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
-        random.seed(parsed.seed)
+    # Compression applies to the text files of -o and --loghub
+    if parsed.compress:
+        if not parsed.loghub and (
+            parsed.tables
+            or parsed.format in COLUMNAR_FORMATS
+            or not (parsed.output or parsed.partitions or parsed.tee)
+        ):
+            print(
+                "Error: --compress needs text output to files (-o, --loghub, --partitions "
+                "or --tee)",
+                file=sys.stderr,
+            )
+            return 1
+        if parsed.compress_threads is not None and parsed.compress_threads < 1:
+            print("Error: --compress-threads must be at least 1", file=sys.stderr)
+            return 1
+        try:
+            check_codec(parsed.compress)
+        except ConfigurationError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    if parsed.send and (
+        parsed.output or parsed.loghub or parsed.tables or parsed.partitions or parsed.rotate
+    ):
+        print("Error: --send cannot be combined with file output options", file=sys.stderr)
+        return 1
+    if parsed.tee and (
+        parsed.output
+        or parsed.loghub
+        or parsed.send
+        or parsed.tables
+        or parsed.partitions
+        or parsed.rotate
+        or parsed.rotate_lines is not None
+        or parsed.mmap
+    ):
+        print("Error: --tee cannot be combined with other output options", file=sys.stderr)
+        return 1
+    if parsed.mmap and (
+        parsed.loghub
+        or parsed.tables
+        or parsed.partitions
+        or parsed.rotate
+        or parsed.rotate_lines is not None
+        or parsed.format in COLUMNAR_FORMATS
+    ):
+        print("Error: --mmap cannot be combined with other output options", file=sys.stderr)
+        return 1
+    if parsed.mmap and (not parsed.output or parsed.compress):
+        print("Error: --mmap needs an uncompressed output file (-o)", file=sys.stderr)
+        return 1
+    if parsed.send and parsed.pretty and parsed.format == "json":
+        # Every line is a message: an indented document would arrive in fragments
+        print("Error: --send needs one line per entry; drop --pretty", file=sys.stderr)
+        return 1
+    if (parsed.send or parsed.syslog) and parsed.format in COLUMNAR_FORMATS:
+        print("Error: --send and --syslog need json, ndjson or text lines", file=sys.stderr)
+        return 1
 
     # Setup internal logging
     log_level = "DEBUG" if parsed.verbose else "WARNING"
@@ -680,13 +1425,16 @@ Examples:
     # Load Lua generators if enabled
     if use_lua:
         try:
-            lua_count = register_lua_generators(resources_path)
+            lua_count = load_lua_generators(resources_paths)
             logger.info(f"Loaded {lua_count} Lua generators")
         except Exception as e:
             logger.warning(f"Failed to load Lua generators: {e}")
             if not parsed.quiet:
                 print(f"Warning: Failed to load Lua generators: {e}", file=sys.stderr)
 
+    if not _reset_run_state(parsed, cardinality, use_lua):
+        return 1
+
     logger.info(f"Starting log generation: {parsed.count} logs")
 
     # Validate categories if specified
@@ -713,6 +1461,15 @@ Examples:
     if parsed.exclude_types:
         scheduler.disable_log_types(parsed.exclude_types)
 
+    # Fan one entry stream out to several sinks
+    if parsed.tee:
+        return _generate_tee_output(
+            parsed=parsed,
+            scheduler=scheduler,
+            registry=registry,
+            logger=logger,
+        )
+
     # Handle loghub output mode
     if parsed.loghub:
         return _generate_loghub_output(
@@ -722,60 +1479,136 @@ Examples:
             logger=logger,
         )
 
+    # Handle merge-group table output
+    if parsed.tables:
+        return _generate_table_output(
+            parsed=parsed,
+            scheduler=scheduler,
+            factory=factory,
+            registry=registry,
+            cardinality=cardinality,
+            use_lua=use_lua,
+            logger=logger,
+        )
+
+    # Handle columnar output formats
+    if parsed.format in COLUMNAR_FORMATS:
+        return _generate_columnar_output(
+            parsed=parsed,
+            scheduler=scheduler,
+            registry=registry,
+            logger=logger,
+        )
+
     # Setup formatter
-    if parsed.format == "json":
-        formatter = JSONFormatter(pretty=parsed.pretty)
-    elif parsed.format == "ndjson":
-        formatter = JSONFormatter(pretty=False)
-    else:
-        formatter = TextFormatter()
+    try:
+        if parsed.format == "json":
+            formatter = JSONFormatter(pretty=parsed.pretty, backend=parsed.json_backend)
+        elif parsed.format == "ndjson":
+            formatter = JSONFormatter(pretty=False, backend=parsed.json_backend)
+        else:
+            formatter = TextFormatter()
+        if parsed.syslog:
+            formatter = SyslogFormatter(formatter, rfc=parsed.syslog)
+    except ConfigurationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
-    # Setup output handler
-    if parsed.output:
-        output_handler = FileOutputHandler(parsed.output)
-        if not parsed.quiet:
-            print(f"Writing to {parsed.output}...", file=sys.stderr)
-    else:
-        output_handler = StreamOutputHandler(add_newline=True)
+    # HTTP bulk ingestion APIs
+    if parsed.send and parsed.send.startswith(("http://", "https://")):
+        return _generate_http_output(
+            parsed=parsed,
+            scheduler=scheduler,
+            formatter=formatter,
+            logger=logger,
+        )
 
-    # Determine time range
-    if parsed.start_time:
+    # Partition directories
+    if parsed.partitions:
+        return _generate_partitioned_output(
+            parsed=parsed,
+            scheduler=scheduler,
+            formatter=formatter,
+            logger=logger,
+        )
+
+    # Rotated segment files
+    if parsed.rotate or parsed.rotate_lines is not None:
+        if not parsed.output:
+            print("Error: --rotate/--rotate-lines need an output file (-o)", file=sys.stderr)
+            return 1
+        return _generate_segmented_output(
+            parsed=parsed,
+            scheduler=scheduler,
+            formatter=formatter,
+            logger=logger,
+        )
+
+    time_range = _time_range(parsed)
+    if time_range is None:
+        return 1
+
+    # Setup output handler
+    if parsed.send:
+        # RFC 6587 octet counting for syslog over TCP, newlines otherwise
+        framing = "octet" if parsed.syslog and parsed.send.startswith("tcp:") else "newline"
         try:
-            start_time = datetime.fromisoformat(parsed.start_time)
-        except ValueError:
-            print(f"Error: Invalid start time format: {parsed.start_time}", file=sys.stderr)
+            output_handler = SocketOutputHandler(parsed.send, framing=framing)
+        except (ConfigurationError, OutputError) as e:
+            print(f"Error: {e}", file=sys.stderr)
             return 1
+        if not parsed.quiet:
+            print(f"Sending to {parsed.send}...", file=sys.stderr)
+    elif parsed.output:
+        output_path = compressed_path(parsed.output, parsed.compress)
+        if parsed.mmap:
+            output_handler = MmapFileHandler(output_path, expected_lines=parsed.count)
+        else:
+            output_handler = FileOutputHandler(
+                output_path,
+                compression=parsed.compress,
+                compression_threads=parsed.compress_threads,
+            )
+        if not parsed.quiet:
+            print(f"Writing to {output_path}...", file=sys.stderr)
     else:
-        start_time = datetime.now()
+        # Buffered for pipes; --line-buffered flushes every entry for tailing
+        output_handler = StreamOutputHandler(
+            add_newline=True,
+            auto_flush=parsed.line_buffered,
+            buffer_size=0 if parsed.line_buffered else STREAM_BUFFER_SIZE,
+            flush_interval=STREAM_FLUSH_INTERVAL,
+            binary=not parsed.line_buffered,
+        )
 
-    end_time = start_time + timedelta(seconds=parsed.duration)
+    # Write on a background thread so I/O overlaps with generation
+    if not parsed.line_buffered:
+        output_handler = QueuedOutputHandler(output_handler)
 
-    # Generate logs
-    try:
-        count = 0
-        for entry in scheduler.generate_range(start_time, end_time, max_logs=parsed.count):
-            formatted = formatter.format(entry)
-            output_handler.write(formatted)
-            count += 1
+    count = 0
 
-        output_handler.close()
+    def write(chunk: list) -> None:
+        nonlocal count
+        output_handler.write(formatter.format_lines(chunk))
+        count += len(chunk)
 
-        if not parsed.quiet and parsed.output:
-            print(f"Generated {count} log entries", file=sys.stderr)
+    # Generate logs; one pre-joined buffer and one write per chunk of entries
+    chunk_size = 1 if parsed.line_buffered else DEFAULT_BATCH_SIZE
+    chunks = scheduler.generate_chunks(*time_range, max_logs=parsed.count, chunk_size=chunk_size)
+    status = _run_generation(parsed, chunks, write, output_handler, logger)
 
-        return 0
+    if isinstance(output_handler, QueuedOutputHandler):
+        stats = output_handler.stats
+        logger.debug(
+            f"Writer queue: {stats.chunks} chunks, high-water mark "
+            f"{stats.high_water_mark}/{stats.capacity}, {stats.stalls} stalls "
+            f"({stats.stall_seconds:.3f}s)"
+        )
 
-    except KeyboardInterrupt:
-        if not parsed.quiet:
-            print("\nInterrupted", file=sys.stderr)
-        output_handler.close()
-        return 130
+    if status == 0 and not parsed.quiet and (parsed.output or parsed.send):
+        print(f"Generated {count} log entries", file=sys.stderr)
 
-    except Exception as e:
-        logger.exception(f"Error during generation: {e}")
-        if not parsed.quiet:
-            print(f"Error: {e}", file=sys.stderr)
-        return 1
+    return status
 
 
 if __name__ == "__main__":
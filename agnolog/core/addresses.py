@@ -0,0 +1,266 @@
+"""
+Integer-packed IP address generation from CIDR pools.
+
+Each address is a single integer draw inside a weighted range (a CIDR
+block or an explicit "start-end" span), formatted through a cached
+octet table. Addresses are drawn and formatted in blocks and served
+from a buffer.
+
+Pools come from the optional `constants.addresses` YAML data of a
+theme, e.g. resources/<theme>/data/constants/addresses.yaml:
+
+    data:
+      internal:
+        - "10.0.0.0/8"
+        - {cidr: "192.168.0.0/16", weight: 3}
+      datacenters:
+        eu-west: ["10.10.0.0/16"]
+        us-east: ["10.20.0.0/16", "10.21.0.0/16"]
+      ipv6:
+        - "2001:db8:100::/48"
+
+Sections that are not configured fall back to the defaults in
+agnolog.core.constants.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import random
+from collections.abc import Iterable
+from typing import Any
+
+from agnolog.core.constants import (
+    ADDRESS_BLOCK,
+    DEFAULT_INTERNAL_IPV4_RANGES,
+    DEFAULT_IPV6_RANGES,
+    DEFAULT_PUBLIC_IPV4_RANGES,
+)
+
+# Decimal strings for every octet value, so formatting is four lookups
+_OCTETS = tuple(str(i) for i in range(256))
+
+
+def format_ipv4(value: int) -> str:
+    """Format a 32-bit integer as a dotted-quad IPv4 address."""
+    o = _OCTETS
+    return f"{o[value >> 24]}.{o[(value >> 16) & 255]}.{o[(value >> 8) & 255]}.{o[value & 255]}"
+
+
+def format_ipv6(value: int) -> str:
+    """Format a 128-bit integer as a compressed IPv6 address."""
+    return str(ipaddress.IPv6Address(value))
+
+
+class AddressRange:
+    """
+    A contiguous span of addresses to draw from.
+
+    Usage:
+        AddressRange.parse("10.0.0.0/8")
+        AddressRange.parse("1.0.0.0-9.255.255.255")
+    """
+
+    __slots__ = ("start", "size", "version", "skip_edges")
+
+    def __init__(self, start: int, size: int, version: int) -> None:
+        """
+        Initialize the range.
+
+        Args:
+            start: First address as an integer
+            size: Number of addresses in the range
+            version: IP version (4 or 6)
+        """
+        if size < 1:
+            raise ValueError("Address range must not be empty")
+        self.start = start
+        self.size = size
+        self.version = version
+        # Whole /24 blocks: steer .0 and .255 to .1 and .254 (stays in range)
+        self.skip_edges = version == 4 and start & 255 == 0 and size & 255 == 0
+
+    @classmethod
+    def parse(cls, spec: str) -> AddressRange:
+        """
+        Parse a CIDR block or a "start-end" range.
+
+        IPv4 blocks of /25 to /30 exclude their network and broadcast
+        addresses.
+
+        Raises:
+            ValueError: If the spec is not a valid network or range
+        """
+        spec = spec.strip()
+        if "-" in spec:
+            first_text, last_text = spec.split("-", 1)
+            first = ipaddress.ip_address(first_text.strip())
+            last = ipaddress.ip_address(last_text.strip())
+            if first.version != last.version or int(last) < int(first):
+                raise ValueError(f"Invalid address range: {spec}")
+            return cls(int(first), int(last) - int(first) + 1, first.version)
+
+        network = ipaddress.ip_network(spec, strict=False)
+        start = int(network.network_address)
+        size = network.num_addresses
+        if network.version == 4 and 25 <= network.prefixlen <= 30:
+            start, size = start + 1, size - 2
+        return cls(start, size, network.version)
+
+    def __repr__(self) -> str:
+        fmt = format_ipv4 if self.version == 4 else format_ipv6
+        return f"AddressRange({fmt(self.start)}-{fmt(self.start + self.size - 1)})"
+
+
+class AddressPool:
+    """
+    Weighted set of address ranges with block-buffered draws.
+
+    Usage:
+        pool = AddressPool(["10.0.0.0/8", {"cidr": "192.168.0.0/16", "weight": 3}])
+        ip = pool.draw()
+        ips = pool.block(10000)
+    """
+
+    def __init__(self, entries: Iterable[Any], block_size: int = ADDRESS_BLOCK) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            entries: Range specs, each a string or a mapping with
+                `cidr` (or `range`) and an optional `weight` (default 1)
+            block_size: Addresses formatted per refill
+
+        Raises:
+            ValueError: If an entry is malformed or the pool is empty
+        """
+        ranges: list[AddressRange] = []
+        weights: list[float] = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                spec = entry.get("cidr", entry.get("range"))
+                weight = float(entry.get("weight", 1))
+            else:
+                spec, weight = entry, 1.0
+            if not isinstance(spec, str):
+                raise ValueError(f"Invalid address pool entry: {entry!r}")
+            if weight <= 0:
+                raise ValueError(f"Address pool weight must be positive: {entry!r}")
+            ranges.append(AddressRange.parse(spec))
+            weights.append(weight)
+        if not ranges:
+            raise ValueError("Address pool needs at least one range")
+
+        self._ranges = ranges
+        self._weights = weights
+        self._block_size = max(1, block_size)
+        self._buffer: list[str] = []
+
+    def block(self, count: int) -> list[str]:
+        """Draw and format `count` addresses at once."""
+        if len(self._ranges) == 1:
+            picks = self._ranges * count
+        else:
+            picks = random.choices(self._ranges, weights=self._weights, k=count)
+        rand = random.random
+        randrange = random.randrange
+        addresses = []
+        for rng in picks:
+            size = rng.size
+            # random() has 53 bits, plenty for IPv4-sized ranges
+            value = rng.start + (int(rand() * size) if size <= 1 << 32 else randrange(size))
+            if rng.version == 4:
+                if rng.skip_edges:
+                    low = value & 255
+                    if low == 0 or low == 255:
+                        value ^= 1
+                addresses.append(format_ipv4(value))
+            else:
+                addresses.append(format_ipv6(value))
+        return addresses
+
+    def draw(self) -> str:
+        """Draw one address."""
+        if not self._buffer:
+            self._buffer = self.block(self._block_size)
+            # Served with pop(), so reverse to keep generation order
+            self._buffer.reverse()
+        return self._buffer.pop()
+
+    @property
+    def ranges(self) -> tuple[AddressRange, ...]:
+        """Get the ranges of this pool."""
+        return tuple(self._ranges)
+
+    def __repr__(self) -> str:
+        return f"AddressPool(ranges={len(self._ranges)})"
+
+
+def _pool_entries(value: Any) -> list[Any]:
+    """Get the range specs of a configured pool; one spec needs no list."""
+    if isinstance(value, (str, dict)):
+        return [value]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"Address pool must be a range or a list of ranges: {value!r}")
+    return list(value)
+
+
+class AddressBook:
+    """
+    The address pools of one theme.
+
+    Backs ctx.gen.ip_address (public/internal IPv4), ctx.gen.ipv6_address
+    and ctx.gen.datacenter_ip. Pools are built from `constants.addresses`
+    data when the theme has it, otherwise from the built-in defaults.
+    """
+
+    def __init__(self, config: dict[str, Any] | None = None) -> None:
+        """
+        Initialize the address book.
+
+        Args:
+            config: Optional `constants.addresses` data
+
+        Raises:
+            ValueError: If a configured pool is malformed
+        """
+        config = config if isinstance(config, dict) else {}
+        self.public = AddressPool(_pool_entries(config.get("public") or DEFAULT_PUBLIC_IPV4_RANGES))
+        self.internal = AddressPool(
+            _pool_entries(config.get("internal") or DEFAULT_INTERNAL_IPV4_RANGES)
+        )
+        self.ipv6 = AddressPool(_pool_entries(config.get("ipv6") or DEFAULT_IPV6_RANGES))
+
+        datacenters = config.get("datacenters") or {}
+        if not isinstance(datacenters, dict):
+            raise ValueError("Address datacenters must be a mapping of name to ranges")
+        self.datacenters = {
+            str(name): AddressPool(_pool_entries(entries)) for name, entries in datacenters.items()
+        }
+        self._datacenter_names = tuple(self.datacenters)
+
+    def datacenter(self, name: str | None = None) -> str:
+        """
+        Draw an address from a datacenter subnet.
+
+        Args:
+            name: Datacenter name (a random datacenter when omitted)
+
+        Returns:
+            Address string (internal when no datacenters are configured)
+
+        Raises:
+            ValueError: If the datacenter is unknown
+        """
+        if name is None:
+            if not self._datacenter_names:
+                return self.internal.draw()
+            name = random.choice(self._datacenter_names)
+        pool = self.datacenters.get(name)
+        if pool is None:
+            available = ", ".join(self._datacenter_names) or "none configured"
+            raise ValueError(f"Unknown datacenter '{name}' (available: {available})")
+        return pool.draw()
+
+    def __repr__(self) -> str:
+        return f"AddressBook(datacenters={list(self._datacenter_names)})"
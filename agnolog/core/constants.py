@@ -23,6 +23,48 @@ DEFAULT_SERVER_ID: Final[str] = "server-01"
 DEFAULT_TIMEZONE: Final[str] = "UTC"
 DEFAULT_TIME_SCALE: Final[float] = 1.0
 
+# =============================================================================
+# THEME CONFIGURATION
+# =============================================================================
+# Separator between theme namespace and log type when several themes are
+# loaded into one process (e.g. "windows11:security.logon")
+THEME_NAMESPACE_SEPARATOR: Final[str] = ":"
+
+# =============================================================================
+# ENTITY POOLS (bounded players/hosts/sessions exposed as ctx.entities)
+# Themes override these in data/constants/entities.yaml
+# =============================================================================
+DEFAULT_PLAYER_POOL_SIZE: Final[int] = 1000
+DEFAULT_HOST_POOL_SIZE: Final[int] = 50
+DEFAULT_MAX_ACTIVE_SESSIONS: Final[int] = 200
+DEFAULT_ZIPF_EXPONENT: Final[float] = 1.1
+# Indices drawn per refill when a ctx.gen helper has bounded cardinality
+# (themes configure fields in data/constants/cardinality.yaml)
+CARDINALITY_DRAW_BLOCK: Final[int] = 4096
+# IDs (uuid, guid, sid, hex_string, session_id) precomputed per refill
+ID_POOL_BLOCK: Final[int] = 1024
+
+# =============================================================================
+# ADDRESS POOLS (CIDR ranges behind ctx.gen.ip_address and friends)
+# Themes override these in data/constants/addresses.yaml
+# =============================================================================
+# Public IPv4 space by first-octet band (each band equally likely)
+DEFAULT_PUBLIC_IPV4_RANGES: Final[tuple[str, ...]] = (
+    "1.0.0.0-9.255.255.255",
+    "11.0.0.0-126.255.255.255",
+    "128.0.0.0-191.255.255.255",
+    "192.0.0.0-223.255.255.255",
+)
+DEFAULT_INTERNAL_IPV4_RANGES: Final[tuple[str, ...]] = (
+    "192.168.0.0/16",
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+)
+# IPv6 documentation prefix (RFC 3849)
+DEFAULT_IPV6_RANGES: Final[tuple[str, ...]] = ("2001:db8::/32",)
+# Addresses drawn and formatted per refill
+ADDRESS_BLOCK: Final[int] = 1024
+
 # =============================================================================
 # RECURRENCE WEIGHTS (events per hour at normal rate)
 # These determine how often each log type fires
@@ -42,8 +84,94 @@ MAX_LOG_LINE_LENGTH: Final[int] = 4096
 DEFAULT_TIMESTAMP_FORMAT: Final[str] = "%Y-%m-%d %H:%M:%S.%f"
 SHORT_TIMESTAMP_FORMAT: Final[str] = "%Y-%m-%d %H:%M:%S"
 JSON_INDENT: Final[int] = 2
+# Compact single-line separators, the same for every JSON backend
+JSON_SEPARATORS: Final[tuple[str, str]] = (",", ":")
+# JSON serializer backends; "auto" picks the fastest installed one
+JSON_BACKENDS: Final[tuple[str, ...]] = ("auto", "orjson", "msgspec", "stdlib")
+DEFAULT_JSON_BACKEND: Final[str] = "auto"
+# Columnar file formats (optional pyarrow); "arrow" is the Arrow IPC / Feather v2 file
+COLUMNAR_FORMATS: Final[tuple[str, ...]] = ("parquet", "arrow")
+COLUMNAR_COMPRESSION: Final[str] = "zstd"
+# Entries per row group, and buffered entries across all partitions before
+# the largest partition is flushed early
+COLUMNAR_ROW_GROUP_SIZE: Final[int] = 65536
+COLUMNAR_MAX_BUFFERED_ROWS: Final[int] = 4 * 65536
+# Merge-group tables (one file per merge group); parquet needs pyarrow
+TABLE_FORMATS: Final[tuple[str, ...]] = ("csv", "ndjson", "parquet")
+# Sink formats of --tee FORMAT:DEST (loghub: DEST is the file prefix)
+TEE_FORMATS: Final[tuple[str, ...]] = ("json", "ndjson", "text", "loghub", "parquet", "arrow")
+# Rows buffered per table before a bulk write
+TABLE_BUFFER_ROWS: Final[int] = 4096
+# Entries generated per log type to fix table columns up front
+TABLE_SCHEMA_SAMPLES: Final[int] = 20
+# Partitioned directory output (category=/date=/hour=/part-N): open part files
+# kept in the LRU, rows buffered per partition and across all partitions
+# before a write, and the manifest written at the root on close
+PARTITION_MAX_OPEN_FILES: Final[int] = 64
+PARTITION_BUFFER_ROWS: Final[int] = 4096
+PARTITION_MAX_BUFFERED_ROWS: Final[int] = 65536
+PARTITION_MANIFEST: Final[str] = "_manifest.json"
+# Buffered stdout (CLI without --line-buffered): bytes collected per write,
+# and the longest time output may sit in the buffer
+STREAM_BUFFER_SIZE: Final[int] = 64 * 1024
+STREAM_FLUSH_INTERVAL: Final[float] = 1.0
+# Formatted chunks queued for the background writer thread
+WRITER_QUEUE_CHUNKS: Final[int] = 8
+# Streaming compression of file output; zstd and lz4 need optional packages
+COMPRESSION_CODECS: Final[tuple[str, ...]] = ("gzip", "zstd", "lz4")
+COMPRESSION_EXTENSIONS: Final[dict[str, str]] = {"gzip": ".gz", "zstd": ".zst", "lz4": ".lz4"}
+COMPRESSION_LEVELS: Final[dict[str, int]] = {"gzip": 6, "zstd": 3, "lz4": 0}
+# Uncompressed bytes per independently compressed block (gzip member / frame),
+# and the most compression threads used by default
+COMPRESSION_BLOCK_SIZE: Final[int] = 1024 * 1024
+COMPRESSION_MAX_THREADS: Final[int] = 4
+# Memory-mapped output (--mmap): bytes mapped (and allocated ahead) per window,
+# and the headroom added to the size estimated from the first lines
+MMAP_WINDOW_SIZE: Final[int] = 64 * 1024 * 1024
+MMAP_SIZE_MARGIN: Final[float] = 1.1
+# Network output (--send): transports, bytes collected per stream send,
+# socket timeout, and reconnect attempts (with the delay before the first,
+# doubled each time) when a stream connection drops
+NETWORK_TRANSPORTS: Final[tuple[str, ...]] = ("tcp", "udp", "unix", "unixgram")
+NETWORK_BATCH_BYTES: Final[int] = 64 * 1024
+NETWORK_TIMEOUT: Final[float] = 10.0
+NETWORK_RECONNECT_ATTEMPTS: Final[int] = 3
+NETWORK_RECONNECT_DELAY: Final[float] = 0.5
+# Syslog framing (--syslog): RFC 5424 or BSD RFC 3164 headers, facility
+# (1 = user-level) and the APP-NAME/TAG field
+SYSLOG_FORMATS: Final[tuple[str, ...]] = ("5424", "3164")
+SYSLOG_FACILITY: Final[int] = 1
+SYSLOG_APP_NAME: Final[str] = "agnolog"
+# Syslog severity codes by LogSeverity name
+SYSLOG_SEVERITIES: Final[dict[str, int]] = {
+    "DEBUG": 7,
+    "INFO": 6,
+    "WARNING": 4,
+    "ERROR": 3,
+    "CRITICAL": 2,
+}
+# HTTP bulk output (--send http://...): ingestion API shapes, entries per
+# request, requests in flight, request timeout, retries (with the delay
+# before the first, doubled each time) on the retryable statuses, and the
+# gzip level of request bodies
+HTTP_APIS: Final[tuple[str, ...]] = ("elasticsearch", "loki", "splunk")
+HTTP_BATCH_ROWS: Final[int] = 5000
+HTTP_CONCURRENCY: Final[int] = 4
+HTTP_TIMEOUT: Final[float] = 30.0
+HTTP_RETRY_ATTEMPTS: Final[int] = 5
+HTTP_RETRY_DELAY: Final[float] = 0.5
+HTTP_RETRY_STATUSES: Final[frozenset[int]] = frozenset({408, 429, 500, 502, 503, 504})
+HTTP_GZIP_LEVEL: Final[int] = 1
+HTTP_ES_INDEX: Final[str] = "agnolog"
 FILE_ROTATION_SIZE: Final[int] = 10 * 1024 * 1024  # 10MB
 FILE_ROTATION_COUNT: Final[int] = 5
+# Time-based rotation of segment files by log timestamp: interval -> strftime
+# format of the period in the segment file name
+ROTATION_INTERVALS: Final[dict[str, str]] = {
+    "minute": "%Y-%m-%d_%H-%M",
+    "hour": "%Y-%m-%d_%H",
+    "day": "%Y-%m-%d",
+}
 FILE_ENCODING: Final[str] = "utf-8"
 
 # =============================================================================
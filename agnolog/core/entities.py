@@ -0,0 +1,361 @@
+"""
+Entity and value pools for stateful, bounded-cardinality identifiers.
+
+Instead of minting a fresh player name or IP for every log line,
+generators draw from bounded, preallocated pools of players and hosts.
+Draws follow a Zipf distribution so a few entities are very active and
+most are rarely seen, like real traffic. Sessions follow a
+login -> actions -> logout lifecycle on top of the player pool.
+
+Pools are sized from the optional `constants.entities` YAML data of
+a theme, e.g. resources/<theme>/data/constants/entities.yaml:
+
+    data:
+      players:
+        size: 2000
+        zipf_s: 1.2
+      hosts:
+        size: 50
+        prefix: "web"
+      sessions:
+        max_active: 300
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any
+
+from agnolog.core.constants import (
+    CARDINALITY_DRAW_BLOCK,
+    DEFAULT_HOST_POOL_SIZE,
+    DEFAULT_MAX_ACTIVE_SESSIONS,
+    DEFAULT_PLAYER_POOL_SIZE,
+    DEFAULT_ZIPF_EXPONENT,
+)
+
+if TYPE_CHECKING:
+    from agnolog.core.lua_runtime import LuaGeneratorUtils
+
+
+class ZipfSampler:
+    """
+    Draws indices in [0, size) with Zipf-distributed probability.
+
+    Rank k (1-based) has weight 1 / k**s. Cumulative weights are
+    computed once, so each draw is one random() and a bisect.
+    """
+
+    def __init__(self, size: int, s: float = DEFAULT_ZIPF_EXPONENT) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            size: Number of ranks (must be positive)
+            s: Zipf exponent (0 = uniform, higher = more skewed)
+        """
+        if size < 1:
+            raise ValueError(f"Zipf size must be positive, got {size}")
+        if s < 0:
+            raise ValueError(f"Zipf exponent must be non-negative, got {s}")
+        self._size = size
+        self._s = s
+        self._cum_weights = list(accumulate(1.0 / (k**s) for k in range(1, size + 1)))
+        self._total = self._cum_weights[-1]
+
+    def draw(self) -> int:
+        """Draw one index (0 is the most popular)."""
+        index = bisect(self._cum_weights, random.random() * self._total)
+        # Guard against float rounding at the very top of the range
+        return index if index < self._size else self._size - 1
+
+    def draw_many(self, k: int) -> list[int]:
+        """Draw k indices at once."""
+        cum_weights = self._cum_weights
+        total = self._total
+        last = self._size - 1
+        rand = random.random
+        return [min(bisect(cum_weights, rand() * total), last) for _ in range(k)]
+
+    @property
+    def size(self) -> int:
+        """Get the number of ranks."""
+        return self._size
+
+    @property
+    def s(self) -> float:
+        """Get the Zipf exponent."""
+        return self._s
+
+    def __repr__(self) -> str:
+        return f"ZipfSampler(size={self._size}, s={self._s})"
+
+
+class CardinalityPool:
+    """
+    Bounded, Zipf-skewed stand-in for a value generator.
+
+    Calls the wrapped generator up to `size` times to build a table of
+    distinct values (one table per argument combination), then serves
+    draws by index. Indices are drawn in blocks to amortize sampling.
+
+    Usage:
+        pool = CardinalityPool(gen.ip_address, ZipfSampler(500, 1.2))
+        ip = pool()          # one of at most 500 public IPs
+        ip = pool(True)      # one of at most 500 internal IPs
+    """
+
+    def __init__(self, factory: Callable[..., Any], sampler: ZipfSampler) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Generator producing one fresh value per call
+            sampler: Index sampler; its size is the target cardinality
+        """
+        self._factory = factory
+        self._sampler = sampler
+        self._tables: dict[tuple[Any, ...], list[Any]] = {}
+        self._indices: list[int] = []
+
+    def _build_table(self, args: tuple[Any, ...]) -> list[Any]:
+        """Build the value table for one argument combination."""
+        size = self._sampler.size
+        seen: set[Any] = set()
+        values: list[Any] = []
+        # Small value spaces may never reach `size` distinct values; stop trying
+        for _ in range(size * 4):
+            value = self._factory(*args)
+            if value not in seen:
+                seen.add(value)
+                values.append(value)
+                if len(values) == size:
+                    break
+        self._tables[args] = values
+        return values
+
+    def __call__(self, *args: Any) -> Any:
+        """Draw a value (arguments are forwarded to the generator when building)."""
+        table = self._tables.get(args)
+        if table is None:
+            table = self._build_table(args)
+        if not self._indices:
+            self._indices = self._sampler.draw_many(CARDINALITY_DRAW_BLOCK)
+            self._indices.reverse()
+        index = self._indices.pop()
+        # Tables smaller than the sampler (small value spaces) wrap around
+        return table[index % len(table)]
+
+    @property
+    def size(self) -> int:
+        """Get the target cardinality."""
+        return self._sampler.size
+
+    @property
+    def zipf_s(self) -> float:
+        """Get the Zipf exponent."""
+        return self._sampler.s
+
+    def __repr__(self) -> str:
+        return f"CardinalityPool(size={self._sampler.size}, zipf_s={self._sampler.s})"
+
+
+@dataclass(slots=True)
+class Player:
+    """A pooled player identity (fields are readable from Lua as p.name, p.ip, ...)."""
+
+    index: int
+    name: str
+    character_name: str
+    account_id: str
+    ip: str
+
+
+@dataclass(slots=True)
+class Host:
+    """A pooled host identity."""
+
+    index: int
+    hostname: str
+    ip: str
+
+
+@dataclass(slots=True)
+class Session:
+    """An open session of a pooled player."""
+
+    session_id: str
+    player: Player
+    ip: str
+    actions: int = 0
+
+
+class EntityPool:
+    """
+    Bounded pools of players, hosts and sessions for Lua generators.
+
+    Exposed to Lua as ctx.entities:
+        ctx.entities.player()   -- Zipf-drawn Player
+        ctx.entities.host()     -- Zipf-drawn Host
+        ctx.entities.login()    -- open a session for a Zipf-drawn player
+        ctx.entities.session()  -- an active session (for actions)
+        ctx.entities.logout()   -- close an active session and return it
+
+    Pools are built lazily on first use, so themes that never touch
+    ctx.entities pay nothing.
+    """
+
+    def __init__(self, gen: LuaGeneratorUtils, config: dict[str, Any] | None = None) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            gen: Generator utilities used to build entity values
+            config: Optional `constants.entities` data (sizes, Zipf exponents)
+        """
+        self._gen = gen
+        self._config = config if isinstance(config, dict) else {}
+
+        self._players: list[Player] = []
+        self._player_sampler: ZipfSampler | None = None
+        self._hosts: list[Host] = []
+        self._host_sampler: ZipfSampler | None = None
+
+        # Active sessions: swap-remove list for O(1) random pick and removal
+        self._active: list[Session] = []
+        self._active_slot: dict[int, int] = {}  # player index -> position in _active
+        self._max_active = max(
+            1, int(self._section("sessions").get("max_active", DEFAULT_MAX_ACTIVE_SESSIONS))
+        )
+
+    def _section(self, name: str) -> dict[str, Any]:
+        """Get a config section as a dict."""
+        section = self._config.get(name, {})
+        return section if isinstance(section, dict) else {}
+
+    def _sampler(self, section: str, default_size: int) -> ZipfSampler:
+        """Build a Zipf sampler from a config section."""
+        cfg = self._section(section)
+        return ZipfSampler(
+            int(cfg.get("size", default_size)),
+            float(cfg.get("zipf_s", DEFAULT_ZIPF_EXPONENT)),
+        )
+
+    def _build_players(self) -> ZipfSampler:
+        """Preallocate the player pool."""
+        sampler = self._sampler("players", DEFAULT_PLAYER_POOL_SIZE)
+        seen: set[str] = set()
+        players = []
+        for index in range(sampler.size):
+            name = self._gen.player_name()
+            if name in seen:
+                # Keep names unique so cardinality equals the pool size
+                name = f"{name}{index}"
+            seen.add(name)
+            players.append(
+                Player(
+                    index=index,
+                    name=name,
+                    character_name=self._gen.character_name(),
+                    account_id=self._gen.account_id(),
+                    ip=self._gen.ip_address(),
+                )
+            )
+        self._players = players
+        self._player_sampler = sampler
+        return sampler
+
+    def _build_hosts(self) -> ZipfSampler:
+        """Preallocate the host pool."""
+        sampler = self._sampler("hosts", DEFAULT_HOST_POOL_SIZE)
+        prefix = self._section("hosts").get("prefix", "host")
+        self._hosts = [
+            Host(index=index, hostname=f"{prefix}-{index + 1:03d}", ip=self._gen.datacenter_ip())
+            for index in range(sampler.size)
+        ]
+        self._host_sampler = sampler
+        return sampler
+
+    def player(self) -> Player:
+        """Draw a player (Zipf-weighted)."""
+        sampler = self._player_sampler or self._build_players()
+        return self._players[sampler.draw()]
+
+    def host(self) -> Host:
+        """Draw a host (Zipf-weighted)."""
+        sampler = self._host_sampler or self._build_hosts()
+        return self._hosts[sampler.draw()]
+
+    def _remove_active(self, position: int) -> Session:
+        """Remove the session at a position of the active list."""
+        session = self._active[position]
+        last = self._active.pop()
+        if last is not session:
+            self._active[position] = last
+            self._active_slot[last.player.index] = position
+        del self._active_slot[session.player.index]
+        return session
+
+    def login(self) -> Session:
+        """
+        Open a session for a Zipf-drawn player.
+
+        A player who is already online gets a fresh session (re-login).
+        When the active limit is reached, a random session expires.
+        """
+        player = self.player()
+        position = self._active_slot.get(player.index)
+        if position is not None:
+            self._remove_active(position)
+        elif len(self._active) >= self._max_active:
+            self._remove_active(random.randrange(len(self._active)))
+
+        session = Session(session_id=self._gen.session_id(), player=player, ip=player.ip)
+        self._active_slot[player.index] = len(self._active)
+        self._active.append(session)
+        return session
+
+    def session(self) -> Session:
+        """
+        Get an active session for an in-session action.
+
+        Popular players act more often: the drawn player's session is used
+        when online, otherwise a random active one. Logs a player in when
+        nobody is online.
+        """
+        if not self._active:
+            session = self.login()
+        else:
+            position = self._active_slot.get(self.player().index)
+            if position is None:
+                position = random.randrange(len(self._active))
+            session = self._active[position]
+        session.actions += 1
+        return session
+
+    def logout(self) -> Session:
+        """
+        Close a random active session and return it.
+
+        When nobody is online, returns a session that started before the
+        generated window (it is not tracked).
+        """
+        if not self._active:
+            player = self.player()
+            return Session(session_id=self._gen.session_id(), player=player, ip=player.ip)
+        return self._remove_active(random.randrange(len(self._active)))
+
+    @property
+    def active_count(self) -> int:
+        """Get the number of open sessions."""
+        return len(self._active)
+
+    def __repr__(self) -> str:
+        return (
+            f"EntityPool(players={len(self._players)}, hosts={len(self._hosts)}, "
+            f"active_sessions={len(self._active)})"
+        )
@@ -85,6 +85,19 @@ class InvalidConfigValueError(ConfigurationError):
         self.expected = expected
 
 
+class MissingDependencyError(ConfigurationError):
+    """Raised when a feature needs an optional package that is not installed."""
+
+    def __init__(self, package: str, feature: str, extra: str | None = None) -> None:
+        install = f"agnolog[{extra}]" if extra else package
+        super().__init__(
+            f"{feature} requires the '{package}' package. Install it with: pip install {install}",
+            details={"package": package, "feature": feature},
+        )
+        self.package = package
+        self.feature = feature
+
+
 class ConfigFileError(ConfigurationError):
     """Raised when configuration file cannot be read or parsed."""
 
@@ -322,6 +335,18 @@ class DirectoryNotFoundError(OutputError):
         self.path = path
 
 
+class NetworkSendError(OutputError):
+    """Raised when sending to a network or socket destination fails."""
+
+    def __init__(self, address: str, reason: str) -> None:
+        super().__init__(
+            f"Failed to send to '{address}': {reason}",
+            details={"address": address, "reason": reason},
+        )
+        self.address = address
+        self.reason = reason
+
+
 # =============================================================================
 # SCHEDULING ERRORS
 # =============================================================================
@@ -0,0 +1,152 @@
+"""
+Bulk identifier generation for Lua generator utilities.
+
+uuid, guid, sid, hex_string and session_id are called from most
+generators. Instead of building each ID from per-character random
+calls (or os.urandom through uuid.uuid4), IDs are produced in blocks
+from one large random.getrandbits() draw, hex-encoded in a single
+bytes.hex() call, and served from a buffer. Everything comes from the
+`random` module, so output is reproducible under --seed.
+"""
+
+from __future__ import annotations
+
+import random
+import string
+from collections.abc import Callable
+
+from agnolog.core.constants import ID_POOL_BLOCK
+
+# uuid4 variant nibble (10xx): map any hex digit onto 8, 9, a or b
+_UUID_VARIANT = {c: "89ab"[int(c, 16) & 3] for c in "0123456789abcdef"}
+
+SESSION_ID_CHARS = string.ascii_lowercase + string.digits
+
+
+class CharStream:
+    """
+    Buffered stream of random characters, refilled in blocks.
+
+    Usage:
+        hex_chars = CharStream(lambda: random.randbytes(4096).hex())
+        token = hex_chars.take(32)
+    """
+
+    def __init__(self, refill: Callable[[], str]) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            refill: Callable returning a fresh block of random characters
+        """
+        self._refill = refill
+        self._buffer = ""
+        self._pos = 0
+
+    def take(self, length: int) -> str:
+        """Take the next `length` characters."""
+        if length <= 0:
+            return ""
+        end = self._pos + length
+        if end > len(self._buffer):
+            # Keep the unread tail so no random characters are skipped
+            buffer = self._buffer[self._pos :]
+            while len(buffer) < length:
+                buffer += self._refill()
+            self._buffer = buffer
+            self._pos = 0
+            end = length
+        chunk = self._buffer[self._pos : end]
+        self._pos = end
+        return chunk
+
+
+class IdPool:
+    """
+    Per-sandbox pool of precomputed random identifiers.
+
+    Fixed-format IDs (uuid, guid, sid) are formatted a block at a time and
+    popped from a list; variable-length ones (hex_string, session_id) are
+    sliced from buffered character streams.
+    """
+
+    def __init__(self, block_size: int = ID_POOL_BLOCK) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            block_size: Number of IDs produced per refill
+        """
+        if block_size < 1:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        self._block_size = block_size
+        self._uuids: list[str] = []
+        self._guids: list[str] = []
+        self._sids: list[str] = []
+        self._hex = CharStream(self._hex_block)
+        self._session_chars = CharStream(self._session_block)
+
+    def _random_hex(self, nbytes: int) -> str:
+        """Draw `nbytes` random bytes as a lowercase hex string."""
+        return random.getrandbits(nbytes * 8).to_bytes(nbytes, "big").hex()
+
+    def _hex_block(self) -> str:
+        """Refill block for hex_string (32 hex chars per ID)."""
+        return self._random_hex(16 * self._block_size)
+
+    def _session_block(self) -> str:
+        """Refill block for session_id (16 chars per ID)."""
+        return "".join(random.choices(SESSION_ID_CHARS, k=16 * self._block_size))
+
+    def _uuid_block(self) -> list[str]:
+        """Format a block of version-4 UUID strings."""
+        h = self._random_hex(16 * self._block_size)
+        variant = _UUID_VARIANT
+        block = [
+            f"{h[i : i + 8]}-{h[i + 8 : i + 12]}-4{h[i + 13 : i + 16]}-"
+            f"{variant[h[i + 16]]}{h[i + 17 : i + 20]}-{h[i + 20 : i + 32]}"
+            for i in range(0, len(h), 32)
+        ]
+        # Served with pop(), so reverse to keep generation order
+        block.reverse()
+        return block
+
+    def _sid_block(self) -> list[str]:
+        """Format a block of Windows SIDs."""
+        randint = random.randint
+        block = [
+            f"S-1-5-21-{randint(1000000000, 9999999999)}-{randint(1000000000, 9999999999)}-"
+            f"{randint(1000000000, 9999999999)}-{randint(1000, 9999)}"
+            for _ in range(self._block_size)
+        ]
+        block.reverse()
+        return block
+
+    def uuid(self) -> str:
+        """Get a random version-4 UUID string."""
+        if not self._uuids:
+            self._uuids = self._uuid_block()
+        return self._uuids.pop()
+
+    def guid(self) -> str:
+        """Get a Windows GUID (uppercase UUID with braces)."""
+        if not self._guids:
+            self._guids = [f"{{{u.upper()}}}" for u in self._uuid_block()]
+        return self._guids.pop()
+
+    def sid(self) -> str:
+        """Get a Windows SID."""
+        if not self._sids:
+            self._sids = self._sid_block()
+        return self._sids.pop()
+
+    def hex_string(self, length: int = 32) -> str:
+        """Get a random lowercase hex string."""
+        return self._hex.take(length)
+
+    def session_token(self, length: int = 16) -> str:
+        """Get a random lowercase alphanumeric token."""
+        return self._session_chars.take(length)
+
+    def __repr__(self) -> str:
+        return f"IdPool(block_size={self._block_size})"
@@ -8,10 +8,12 @@ allowing them to be used seamlessly with the existing registry and factory.
 from __future__ import annotations
 
 import logging
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from agnolog.core.constants import THEME_NAMESPACE_SEPARATOR
 from agnolog.core.types import (
     LogEntry,
     LogSeverity,
@@ -197,6 +199,11 @@ class LuaGeneratorRegistry:
 
     Manages loading, registration, and access to Lua generators.
     Works alongside the Python registry for a unified interface.
+
+    Several themes can be loaded side by side by giving each a namespace.
+    Every namespace gets its own sandbox and resource loader, and its
+    generators are registered as "<namespace>:<name>" so that identical
+    log type names from different themes do not collide.
     """
 
     _instance: LuaGeneratorRegistry | None = None
@@ -216,6 +223,7 @@ class LuaGeneratorRegistry:
         self._adapters: dict[str, LuaGeneratorAdapter] = {}
         self._metadata: dict[str, LogTypeMetadata] = {}
         self._lua_sandbox: Any | None = None
+        self._sandboxes: dict[str, Any] = {}  # namespace -> LuaSandbox
         self._initialized = True
 
     @classmethod
@@ -236,6 +244,7 @@ class LuaGeneratorRegistry:
         self,
         generators_path: Path | None = None,
         resources_path: Path | None = None,
+        namespace: str | None = None,
     ) -> int:
         """
         Load all Lua generators.
@@ -243,10 +252,16 @@ class LuaGeneratorRegistry:
         Args:
             generators_path: Path to generators directory
             resources_path: Path to resources directory (for ResourceLoader)
+            namespace: Optional theme namespace. When set, the theme is loaded
+                       into a dedicated sandbox and its generators are
+                       registered as "<namespace>:<name>".
 
         Returns:
             Number of generators loaded
         """
+        if namespace is not None:
+            return self._load_namespace(namespace, generators_path, resources_path)
+
         if self._lua_sandbox is None:
             from agnolog.core.lua_runtime import LuaSandbox
             from agnolog.core.resource_loader import ResourceLoader
@@ -269,6 +284,93 @@ class LuaGeneratorRegistry:
 
         return len(self._adapters)
 
+    def _load_namespace(
+        self,
+        namespace: str,
+        generators_path: Path | None,
+        resources_path: Path | None,
+    ) -> int:
+        """
+        Load a theme into its own sandbox under a namespace.
+
+        Args:
+            namespace: Theme namespace (e.g., "windows11")
+            generators_path: Path to generators directory
+            resources_path: Path to resources directory
+
+        Returns:
+            Number of generators loaded for this namespace
+        """
+        if not namespace or THEME_NAMESPACE_SEPARATOR in namespace:
+            raise ValueError(f"Invalid theme namespace: {namespace!r}")
+
+        sandbox = self._sandboxes.get(namespace)
+        if sandbox is None:
+            from agnolog.core.lua_runtime import LuaSandbox
+            from agnolog.core.resource_loader import ResourceLoader
+
+            resource_loader = ResourceLoader(resource_path=resources_path, shared=False)
+            sandbox = LuaSandbox(resource_loader=resource_loader)
+            self._sandboxes[namespace] = sandbox
+
+        all_metadata = sandbox.load_all_generators(generators_path)
+
+        count = 0
+        for name, lua_meta in all_metadata.items():
+            qualified = f"{namespace}{THEME_NAMESPACE_SEPARATOR}{name}"
+            try:
+                metadata = replace(metadata_from_lua(lua_meta), name=qualified)
+                # The adapter keeps the bare name: that is what the sandbox knows
+                adapter = LuaGeneratorAdapter(name, metadata, sandbox)
+                self._adapters[qualified] = adapter
+                self._metadata[qualified] = metadata
+                count += 1
+            except Exception as e:
+                logger.error(f"Failed to create adapter for {qualified}: {e}")
+
+        return count
+
+    def get_sandbox(self, namespace: str | None = None) -> Any | None:
+        """
+        Get the sandbox serving a namespace.
+
+        Args:
+            namespace: Theme namespace, or None for the default sandbox
+
+        Returns:
+            LuaSandbox or None
+        """
+        if namespace is None:
+            return self._lua_sandbox
+        return self._sandboxes.get(namespace)
+
+    def configure_cardinality(self, field: str, size: int, zipf_s: float) -> None:
+        """
+        Bound a ctx.gen helper's cardinality in every loaded sandbox.
+
+        Args:
+            field: Helper name (e.g., "ip_address")
+            size: Number of distinct values
+            zipf_s: Zipf exponent (0 = uniform)
+        """
+        sandboxes = list(self._sandboxes.values())
+        if self._lua_sandbox is not None:
+            sandboxes.append(self._lua_sandbox)
+        for sandbox in sandboxes:
+            sandbox.configure_cardinality(field, size, zipf_s)
+
+    def reset_state(self) -> None:
+        """Discard per-run generator state in every loaded sandbox."""
+        sandboxes = list(self._sandboxes.values())
+        if self._lua_sandbox is not None:
+            sandboxes.append(self._lua_sandbox)
+        for sandbox in sandboxes:
+            sandbox.reset_state()
+
+    def namespaces(self) -> list[str]:
+        """Get all loaded theme namespaces."""
+        return list(self._sandboxes.keys())
+
     def get_adapter(self, name: str) -> LuaGeneratorAdapter | None:
         """
         Get adapter for a generator.
@@ -12,7 +12,6 @@ from __future__ import annotations
 import logging
 import random
 import string
-import uuid
 from pathlib import Path
 from typing import Any
 
@@ -25,6 +24,10 @@ except ImportError:
     LUPA_AVAILABLE = False
     LuaRuntime = None  # type: ignore
 
+from agnolog.core.addresses import AddressBook
+from agnolog.core.constants import DEFAULT_ZIPF_EXPONENT
+from agnolog.core.entities import CardinalityPool, EntityPool, ZipfSampler
+from agnolog.core.id_pool import IdPool
 from agnolog.core.resource_loader import ResourceLoader
 
 logger = logging.getLogger(__name__)
@@ -50,6 +53,7 @@ class LuaContext:
     - Random utilities (ctx.random.*)
     - Data access (ctx.data.*)
     - Built-in generators (ctx.gen.*)
+    - Pooled entities and sessions (ctx.entities.*)
     """
 
     def __init__(self, data: dict[str, Any]) -> None:
@@ -62,6 +66,7 @@ class LuaContext:
         self._data = data
         self._random = LuaRandomContext()
         self._gen = LuaGeneratorUtils(data)  # Pass data for theme-driven utilities
+        self._entities = EntityPool(self._gen, self._gen._get_data("constants", "entities"))
 
     @property
     def data(self) -> dict[str, Any]:
@@ -78,6 +83,11 @@ class LuaContext:
         """Built-in generators."""
         return self._gen
 
+    @property
+    def entities(self) -> EntityPool:
+        """Pooled players, hosts and sessions."""
+        return self._entities
+
 
 class LuaRandomContext:
     """Random utilities for Lua generators."""
@@ -204,6 +214,13 @@ class LuaGeneratorUtils:
 
     The Python code remains theme-agnostic - all themed content comes from
     YAML/Lua resources.
+
+    Any helper can be given a bounded, Zipf-skewed cardinality, either in
+    data/constants/cardinality.yaml or through configure_cardinality():
+
+        data:
+          ip_address: {size: 500, zipf_s: 1.2}
+          windows_computer: {size: 40}
     """
 
     def __init__(self, data: dict[str, Any] | None = None) -> None:
@@ -214,6 +231,108 @@ class LuaGeneratorUtils:
             data: Nested dict of all loaded YAML data
         """
         self._data = data or {}
+        self._ids = IdPool()
+        try:
+            self._addresses = AddressBook(self._get_data("constants", "addresses"))
+        except ValueError as e:
+            raise LuaGeneratorError(f"Invalid address pools: {e}") from e
+        self._compile_name_tables()
+
+        cardinality = self._get_data("constants", "cardinality", default={})
+        if isinstance(cardinality, dict):
+            for field, settings in cardinality.items():
+                if not isinstance(settings, dict) or "size" not in settings:
+                    raise LuaGeneratorError(
+                        f"Invalid cardinality settings for {field}: expected a mapping with 'size'"
+                    )
+                self.configure_cardinality(
+                    field,
+                    int(settings["size"]),
+                    float(settings.get("zipf_s", DEFAULT_ZIPF_EXPONENT)),
+                )
+
+    def configure_cardinality(
+        self, field: str, size: int, zipf_s: float = DEFAULT_ZIPF_EXPONENT
+    ) -> None:
+        """
+        Bound a helper to at most `size` distinct values drawn with Zipf skew.
+
+        Values are precomputed into a table on first use; each call is then
+        an index draw. The instance attribute shadows the method, so it must
+        be set before the helper is injected into Lua.
+
+        Args:
+            field: Helper name (e.g., "ip_address", "session_id")
+            size: Number of distinct values
+            zipf_s: Zipf exponent (0 = uniform)
+
+        Raises:
+            LuaGeneratorError: If the helper does not exist
+        """
+        method = getattr(type(self), field, None)
+        if field.startswith("_") or field == "configure_cardinality" or not callable(method):
+            raise LuaGeneratorError(f"Unknown generator utility for cardinality: {field}")
+        try:
+            sampler = ZipfSampler(size, zipf_s)
+        except ValueError as e:
+            raise LuaGeneratorError(f"Invalid cardinality for {field}: {e}")
+        setattr(self, field, CardinalityPool(method.__get__(self), sampler))
+
+    @staticmethod
+    def _flatten(value: Any) -> tuple[Any, ...]:
+        """Flatten a list, or a dict of lists (e.g. grouped by rarity), into a tuple."""
+        if isinstance(value, list):
+            return tuple(value)
+        if isinstance(value, dict):
+            return tuple(
+                item for group in value.values() if isinstance(group, list) for item in group
+            )
+        return ()
+
+    def _compile_name_tables(self) -> None:
+        """
+        Compile theme name data into flat tuples once.
+
+        item_name, monster_name, boss_name and skill_name then only do
+        indexed picks. Runs on every sandbox (re)initialization, so a
+        reload picks up changed YAML.
+        """
+        self._item_prefixes = self._flatten(self._get_data("items", "item_prefixes"))
+        self._item_suffixes = self._flatten(self._get_data("items", "item_suffixes"))
+        weapons = self._get_data("items", "weapon_types", default=[])
+        armor = self._get_data("items", "armor_types", default=[])
+        self._item_bases = self._flatten(weapons) + self._flatten(armor)
+
+        monster_types = self._get_data("monsters", "monster_types", default={})
+        if not isinstance(monster_types, dict):
+            monster_types = {}
+        types = monster_types.get("types", [])
+        if not isinstance(types, list):
+            types = [types] if types else []
+        self._monster_types = tuple(types)
+        self._monster_prefixes: dict[str, tuple[Any, ...]] = {}
+        self._monster_names: dict[str, tuple[Any, ...]] = {}
+        for key, table in (("prefixes", self._monster_prefixes), ("names", self._monster_names)):
+            by_type = monster_types.get(key, {})
+            if isinstance(by_type, dict):
+                for monster_type, values in by_type.items():
+                    if isinstance(values, list) and values:
+                        table[monster_type] = tuple(values)
+
+        self._world_bosses = self._flatten(self._get_data("monsters", "world_bosses"))
+        self._dungeon_bosses = self._flatten(self._get_data("monsters", "dungeon_bosses"))
+
+        # Skills are stored per class: classes.skills.<class_name> (list, or dict of lists)
+        skills_data = self._get_data("classes", "skills", default={})
+        self._skills_by_class: dict[str, tuple[Any, ...]] = {}
+        if isinstance(skills_data, dict):
+            for class_key, class_data in skills_data.items():
+                class_skills = self._flatten(class_data)
+                if class_skills:
+                    self._skills_by_class[class_key] = class_skills
+        self._all_skills = tuple(
+            skill for skills in self._skills_by_class.values() for skill in skills
+        )
 
     def _get_data(self, *keys: str, default: Any = None) -> Any:
         """
@@ -257,33 +376,23 @@ class LuaGeneratorUtils:
         return value
 
     def ip_address(self, internal: bool = False) -> str:
-        """Generate a random IP address."""
-        if internal:
-            prefix = random.choice(["192.168", "10.0", "172.16"])
-            if prefix == "192.168":
-                return f"192.168.{random.randint(0, 255)}.{random.randint(1, 254)}"
-            elif prefix == "10.0":
-                return (
-                    f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
-                )
-            else:
-                return f"172.{random.randint(16, 31)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
-        else:
-            first = random.choice(
-                [
-                    random.randint(1, 9),
-                    random.randint(11, 126),
-                    random.randint(128, 191),
-                    random.randint(192, 223),
-                ]
-            )
-            return f"{first}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+        """Generate a random IPv4 address (public, or internal when `internal`)."""
+        return (self._addresses.internal if internal else self._addresses.public).draw()
+
+    def ipv6_address(self) -> str:
+        """Generate a random IPv6 address."""
+        return self._addresses.ipv6.draw()
+
+    def datacenter_ip(self, name: str | None = None) -> str:
+        """Generate an address in a datacenter subnet (random datacenter when omitted)."""
+        try:
+            return self._addresses.datacenter(name)
+        except ValueError as e:
+            raise LuaGeneratorError(str(e)) from e
 
     def session_id(self, length: int = 16) -> str:
         """Generate a session ID."""
-        chars = string.ascii_lowercase + string.digits
-        random_part = "".join(random.choice(chars) for _ in range(length))
-        return f"sess_{random_part}"
+        return f"sess_{self._ids.session_token(int(length))}"
 
     def numeric_id(
         self, prefix: str = "", min_val: int = 100000000, max_val: int = 999999999
@@ -293,11 +402,11 @@ class LuaGeneratorUtils:
 
     def uuid(self) -> str:
         """Generate a UUID."""
-        return str(uuid.uuid4())
+        return self._ids.uuid()
 
     def hex_string(self, length: int = 32) -> str:
         """Generate a random hex string."""
-        return "".join(random.choice("0123456789abcdef") for _ in range(length))
+        return self._ids.hex_string(int(length))
 
     def random_string(self, length: int = 8, charset: str = None) -> str:
         """Generate a random string from the given charset."""
@@ -364,31 +473,9 @@ class LuaGeneratorUtils:
 
     def item_name(self) -> str:
         """Generate a random item name from loaded data."""
-        prefix_data = self._get_data("items", "item_prefixes", default={})
-        weapons = self._get_data("items", "weapon_types", default=[])
-        armor = self._get_data("items", "armor_types", default=[])
-
-        # Get prefix list (item_prefixes may be nested by rarity)
-        prefixes = []
-        if isinstance(prefix_data, dict):
-            for prefix_list in prefix_data.values():
-                if isinstance(prefix_list, list):
-                    prefixes.extend(prefix_list)
-        elif isinstance(prefix_data, list):
-            prefixes = prefix_data
-
-        # Get suffix list (item_suffixes may be nested by type)
-        suffix_data = self._get_data("items", "item_suffixes", default={})
-        suffixes = []
-        if isinstance(suffix_data, dict):
-            for suf_list in suffix_data.values():
-                if isinstance(suf_list, list):
-                    suffixes.extend(suf_list)
-        elif isinstance(suffix_data, list):
-            suffixes = suffix_data
-
-        # Combine weapons and armor for base items
-        base_items = weapons + armor if weapons or armor else []
+        prefixes = self._item_prefixes
+        base_items = self._item_bases
+        suffixes = self._item_suffixes
 
         if prefixes and base_items and suffixes:
             return (
@@ -403,56 +490,27 @@ class LuaGeneratorUtils:
 
     def monster_name(self) -> str:
         """Generate a random monster name from loaded data."""
-        monster_types = self._get_data("monsters", "monster_types", default={})
-
-        if not isinstance(monster_types, dict):
-            return f"Monster_{random.randint(100, 999)}"
-
-        # Get available monster types
-        types = monster_types.get("types", [])
+        types = self._monster_types
         if not types:
             return f"Monster_{random.randint(100, 999)}"
 
-        # Pick a random type
-        monster_type = random.choice(types) if isinstance(types, list) else types
-
-        # Get prefixes and names for this type
-        prefixes_by_type = monster_types.get("prefixes", {})
-        names_by_type = monster_types.get("names", {})
-
-        prefix = ""
-        name = monster_type
-
-        if isinstance(prefixes_by_type, dict) and monster_type in prefixes_by_type:
-            type_prefixes = prefixes_by_type[monster_type]
-            if isinstance(type_prefixes, list) and type_prefixes:
-                prefix = random.choice(type_prefixes)
-
-        if isinstance(names_by_type, dict) and monster_type in names_by_type:
-            type_names = names_by_type[monster_type]
-            if isinstance(type_names, list) and type_names:
-                name = random.choice(type_names)
+        # Pick a random type, then a prefix and name for it
+        monster_type = random.choice(types)
+        type_prefixes = self._monster_prefixes.get(monster_type)
+        type_names = self._monster_names.get(monster_type)
 
-        if prefix:
-            return f"{prefix} {name}"
+        name = random.choice(type_names) if type_names else monster_type
+        if type_prefixes:
+            return f"{random.choice(type_prefixes)} {name}"
         return name
 
     def boss_name(self) -> str:
         """Generate a random boss name from loaded data."""
-        # Try world bosses first
-        world_bosses = self._get_data("monsters", "world_bosses", default=[])
-        if world_bosses:
-            return random.choice(world_bosses)
-
-        # Try dungeon bosses (nested structure)
-        dungeon_bosses = self._get_data("monsters", "dungeon_bosses", default={})
-        if isinstance(dungeon_bosses, dict):
-            all_bosses = []
-            for bosses in dungeon_bosses.values():
-                if isinstance(bosses, list):
-                    all_bosses.extend(bosses)
-            if all_bosses:
-                return random.choice(all_bosses)
+        # World bosses first, then all dungeon bosses
+        if self._world_bosses:
+            return random.choice(self._world_bosses)
+        if self._dungeon_bosses:
+            return random.choice(self._dungeon_bosses)
 
         return f"Boss_{random.randint(100, 999)}"
 
@@ -490,35 +548,15 @@ class LuaGeneratorUtils:
 
     def skill_name(self, char_class: str = None) -> str:
         """Generate a random skill name from loaded data."""
-        # Skills are stored per class: classes.skills.<class_name>
-        skills_data = self._get_data("classes", "skills", default={})
-
-        if char_class and isinstance(skills_data, dict):
+        if char_class:
             # Normalize class name (lowercase, replace spaces)
-            class_key = char_class.lower().replace(" ", "_")
-            class_skills = skills_data.get(class_key, {})
-            if isinstance(class_skills, dict):
-                # Skills might be nested under 'abilities' or similar
-                all_skills = []
-                for skill_list in class_skills.values():
-                    if isinstance(skill_list, list):
-                        all_skills.extend(skill_list)
-                if all_skills:
-                    return random.choice(all_skills)
-
-        # Get all skills across all classes
-        all_skills = []
-        if isinstance(skills_data, dict):
-            for class_data in skills_data.values():
-                if isinstance(class_data, dict):
-                    for skill_list in class_data.values():
-                        if isinstance(skill_list, list):
-                            all_skills.extend(skill_list)
-                elif isinstance(class_data, list):
-                    all_skills.extend(class_data)
+            class_skills = self._skills_by_class.get(char_class.lower().replace(" ", "_"))
+            if class_skills:
+                return random.choice(class_skills)
 
-        if all_skills:
-            return random.choice(all_skills)
+        # Any skill across all classes
+        if self._all_skills:
+            return random.choice(self._all_skills)
 
         return f"Skill_{random.randint(100, 999)}"
 
@@ -550,11 +588,11 @@ class LuaGeneratorUtils:
 
     def guid(self) -> str:
         """Generate Windows GUID (uppercase with braces)."""
-        return f"{{{uuid.uuid4()!s}}}".upper()
+        return self._ids.guid()
 
     def sid(self) -> str:
         """Generate Windows SID."""
-        return f"S-1-5-21-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000000000, 9999999999)}-{random.randint(1000, 9999)}"
+        return self._ids.sid()
 
 
 class LuaSandbox:
@@ -669,6 +707,8 @@ class LuaSandbox:
         # Generic utilities (theme-agnostic)
         ctx["gen"] = self._lua.table()
         ctx["gen"]["ip_address"] = self._context.gen.ip_address
+        ctx["gen"]["ipv6_address"] = self._context.gen.ipv6_address
+        ctx["gen"]["datacenter_ip"] = self._context.gen.datacenter_ip
         ctx["gen"]["session_id"] = self._context.gen.session_id
         ctx["gen"]["numeric_id"] = self._context.gen.numeric_id
         ctx["gen"]["uuid"] = self._context.gen.uuid
@@ -692,6 +732,14 @@ class LuaSandbox:
         ctx["gen"]["guid"] = self._context.gen.guid
         ctx["gen"]["sid"] = self._context.gen.sid
 
+        # Inject entity pools (bounded, Zipf-distributed identities)
+        ctx["entities"] = self._lua.table()
+        ctx["entities"]["player"] = self._context.entities.player
+        ctx["entities"]["host"] = self._context.entities.host
+        ctx["entities"]["login"] = self._context.entities.login
+        ctx["entities"]["session"] = self._context.entities.session
+        ctx["entities"]["logout"] = self._context.entities.logout
+
         # Inject data (convert Python dict to Lua table recursively)
         ctx["data"] = self._python_to_lua(self._context.data)
 
@@ -895,6 +943,38 @@ class LuaSandbox:
         metadata = generator["metadata"]
         return self._lua_to_python(metadata) if metadata else None
 
+    def configure_cardinality(
+        self, field: str, size: int, zipf_s: float = DEFAULT_ZIPF_EXPONENT
+    ) -> None:
+        """
+        Bound a ctx.gen helper to a fixed number of Zipf-skewed values.
+
+        Args:
+            field: Helper name (e.g., "ip_address")
+            size: Number of distinct values
+            zipf_s: Zipf exponent (0 = uniform)
+        """
+        self.initialize()
+
+        if self._lua is None or self._context is None:
+            raise LuaGeneratorError("Lua runtime not initialized")
+
+        self._context.gen.configure_cardinality(field, size, zipf_s)
+        self._lua.globals().ctx["gen"][field] = getattr(self._context.gen, field)
+
+    def reset_state(self) -> None:
+        """
+        Discard per-run generator state and start from a fresh context.
+
+        Buffered IDs and addresses, entity pools and cardinality tables are
+        all drawn from `random`, so they must be dropped after reseeding for
+        a run to be reproducible. Loaded generators are kept.
+        """
+        if self._lua is None or self._context is None:
+            return
+        self._context = LuaContext(self._context.data)
+        self._inject_context()
+
     def list_generators(self) -> list[str]:
         """List all loaded generator names."""
         return list(self._generators.keys())
@@ -347,7 +347,10 @@ def get_registry() -> LogTypeRegistry:
     return LogTypeRegistry()
 
 
-def register_lua_generators(resources_path: str | Path | None = None) -> int:
+def register_lua_generators(
+    resources_path: str | Path | None = None,
+    namespace: str | None = None,
+) -> int:
     """
     Load and register all Lua generators.
 
@@ -355,8 +358,13 @@ def register_lua_generators(resources_path: str | Path | None = None) -> int:
     with the main LogTypeRegistry, making them available alongside
     Python generators.
 
+    Calling it once per theme with a distinct namespace mixes several
+    themes in one registry, so a single scheduler interleaves them.
+
     Args:
         resources_path: Optional path to resources directory
+        namespace: Optional theme namespace; generators are then registered
+                   as "<namespace>:<name>" (e.g., "windows11:security.logon")
 
     Returns:
         Number of Lua generators registered
@@ -376,6 +384,7 @@ def register_lua_generators(resources_path: str | Path | None = None) -> int:
     count = lua_registry.load_generators(
         generators_path=generators_path,
         resources_path=resources_path_obj,
+        namespace=namespace,
     )
 
     # Register adapters with main registry
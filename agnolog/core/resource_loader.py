@@ -31,21 +31,28 @@ class ResourceLoader:
 
     _instance: ResourceLoader | None = None
 
-    def __new__(cls, resource_path: Path | None = None) -> ResourceLoader:
+    def __new__(cls, resource_path: Path | None = None, shared: bool = True) -> ResourceLoader:
         """Ensure singleton instance (can be reset with new path)."""
+        if not shared:
+            # Private loader (one per theme when several themes are mixed)
+            instance = super().__new__(cls)
+            instance._initialized = False
+            return instance
         if cls._instance is None or resource_path is not None:
             instance = super().__new__(cls)
             instance._initialized = False
             cls._instance = instance
         return cls._instance
 
-    def __init__(self, resource_path: Path | None = None) -> None:
+    def __init__(self, resource_path: Path | None = None, shared: bool = True) -> None:
         """
         Initialize the resource loader.
 
         Args:
             resource_path: Path to the resources directory.
                           Must be provided - there is no default.
+            shared: Whether to become the global instance. Pass False to get
+                   an independent loader that leaves the singleton untouched.
 
         Raises:
             ValueError: If resource_path is None and no instance exists.
@@ -4,6 +4,8 @@ Log formatters for converting LogEntry objects to output strings.
 Provides multiple output formats using the Strategy pattern:
 - JSONFormatter: Machine-readable JSON output
 - TextFormatter: Human-readable printf-style output
+- ColumnarFormatter: Arrow record batches for Parquet/Arrow files (optional pyarrow)
+- SyslogFormatter: RFC 5424 / RFC 3164 syslog messages around another format
 
 Usage:
     from agnolog.formatters import JSONFormatter, TextFormatter
@@ -16,14 +18,25 @@ Usage:
 """
 
 from agnolog.formatters.base import BaseFormatter
-from agnolog.formatters.csv_formatter import LoghubCSVFormatter, template_to_loghub
+from agnolog.formatters.columnar_formatter import ColumnarFormatter
+from agnolog.formatters.csv_formatter import (
+    LoghubCSVFormatter,
+    LoghubCSVWriter,
+    LoghubEmitter,
+    template_to_loghub,
+)
 from agnolog.formatters.json_formatter import JSONFormatter
+from agnolog.formatters.syslog_formatter import SyslogFormatter
 from agnolog.formatters.text_formatter import TextFormatter
 
 __all__ = [
     "BaseFormatter",
+    "ColumnarFormatter",
     "JSONFormatter",
     "LoghubCSVFormatter",
+    "LoghubCSVWriter",
+    "LoghubEmitter",
+    "SyslogFormatter",
     "TextFormatter",
     "template_to_loghub",
 ]
@@ -20,6 +20,10 @@ class BaseFormatter(ABC):
     Subclasses must implement:
     - format(): Format a single log entry
     - format_batch(): Format multiple log entries
+
+    format_lines() renders a chunk of entries into one newline-terminated
+    buffer for a single output write; subclasses may override it with a
+    faster batch path.
     """
 
     @abstractmethod
@@ -48,5 +52,21 @@ class BaseFormatter(ABC):
         """
         pass
 
+    def format_lines(self, entries: list[LogEntry]) -> str:
+        """
+        Format entries as newline-terminated lines in one buffer.
+
+        Matches writing each format() result through an output handler
+        with add_newline, in a single write.
+
+        Args:
+            entries: List of log entries to format
+
+        Returns:
+            Concatenated lines, each ending with a newline
+        """
+        lines = [self.format(entry) for entry in entries]
+        return "".join([line if line.endswith("\n") else line + "\n" for line in lines])
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
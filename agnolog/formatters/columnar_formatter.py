@@ -0,0 +1,372 @@
+"""
+Columnar (Apache Arrow) record batches for Parquet and Arrow IPC output.
+
+Entries are buffered per partition: the first merge group of their log
+type (types in a merge group share a table schema) or else the log type
+itself. A full partition becomes one Arrow record batch, which the
+columnar output handler writes as one row group, so each row group
+holds a single kind of event.
+
+Every batch shares one file schema:
+- timestamp, type, severity, category, server_id, session_id
+- one column per data field, typed from sample entries and the entries
+  buffered before the first batch (bool, int64, float64 or string)
+- extra: JSON object of data values that fit no column (fields first
+  seen later, or values of another type)
+
+Low-cardinality columns (type, severity, category, server_id) are
+dictionary-encoded with dictionaries that only grow, so every batch of
+a file extends the previous one.
+
+Requires the optional pyarrow package: pip install agnolog[columnar]
+"""
+
+import json
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import chain
+from typing import Any
+
+from agnolog.core.constants import COLUMNAR_MAX_BUFFERED_ROWS, COLUMNAR_ROW_GROUP_SIZE
+from agnolog.core.errors import MissingDependencyError
+from agnolog.core.registry import LogTypeRegistry, get_registry
+from agnolog.core.types import LogEntry
+
+try:
+    import pyarrow as pa
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None  # type: ignore
+    PYARROW_AVAILABLE = False
+
+# Columns written for every entry, before the data columns
+ENTRY_COLUMNS = ("timestamp", "type", "severity", "category", "server_id", "session_id")
+DICTIONARY_COLUMNS = frozenset({"type", "severity", "category", "server_id"})
+EXTRA_COLUMN = "extra"
+
+# Prefix for data fields whose name is taken by an entry column
+DATA_COLUMN_PREFIX = "data_"
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+# Value types each column kind takes without conversion
+_NONE = type(None)
+_ACCEPTED_TYPES: dict[str, set[type]] = {
+    "bool": {bool, _NONE},
+    "int": {int, _NONE},
+    "float": {int, float, _NONE},
+    "string": {str, _NONE},
+}
+
+
+def _infer_kind(types: set[type], ints_fit: bool) -> str:
+    """Pick the column kind for the value types seen in a data field."""
+    types = types - {type(None)}
+    if types == {bool}:
+        return "bool"
+    if types == {int} and ints_fit:
+        return "int"
+    if types and types <= {int, float} and ints_fit:
+        return "float"
+    return "string"
+
+
+def data_columns(keys: Iterable[str]) -> list[tuple[str, str]]:
+    """
+    Name the columns of data fields.
+
+    Fields named like an entry column (or extra) get DATA_COLUMN_PREFIX;
+    a field whose prefixed name is also taken gets no column (its values
+    go to extra).
+
+    Args:
+        keys: Data field names, in column order
+
+    Returns:
+        (column name, data key) pairs
+    """
+    taken = set(ENTRY_COLUMNS) | {EXTRA_COLUMN}
+    columns = []
+    for key in keys:
+        name = f"{DATA_COLUMN_PREFIX}{key}" if key in taken else key
+        if name in taken:
+            continue
+        taken.add(name)
+        columns.append((name, key))
+    return columns
+
+
+def value_to_text(value: Any) -> str:
+    """Render a value as text, like JSONFormatter would serialize it."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    if hasattr(value, "name") and hasattr(value, "value"):
+        return value.name
+    return str(value)
+
+
+class ColumnarFormatter:
+    """
+    Convert log entries into Arrow record batches, one per row group.
+
+    Not a BaseFormatter: it produces record batches, not text.
+
+    Usage:
+        formatter = ColumnarFormatter()
+        for entry in entries:
+            for batch in formatter.add(entry):
+                writer.write_batch(batch)
+        for batch in formatter.drain():
+            writer.write_batch(batch)
+    """
+
+    def __init__(
+        self,
+        registry: LogTypeRegistry | None = None,
+        row_group_size: int = COLUMNAR_ROW_GROUP_SIZE,
+        max_buffered_rows: int = COLUMNAR_MAX_BUFFERED_ROWS,
+        sample: Iterable[LogEntry] = (),
+    ) -> None:
+        """
+        Initialize the formatter.
+
+        Args:
+            registry: Log type registry for merge groups (uses singleton if None)
+            row_group_size: Entries per record batch
+            max_buffered_rows: Buffered entries (all partitions) before the
+                largest partition is emitted early
+            sample: Example entries whose data fields (with the buffered
+                entries) fix the schema; not written
+
+        Raises:
+            MissingDependencyError: If pyarrow is not installed
+            ValueError: If a size is not positive
+        """
+        if not PYARROW_AVAILABLE:
+            raise MissingDependencyError("pyarrow", "Parquet/Arrow output", extra="columnar")
+        if row_group_size < 1 or max_buffered_rows < 1:
+            raise ValueError("Row group size and buffer limit must be positive")
+
+        self._registry = registry or get_registry()
+        self._row_group_size = row_group_size
+        self._max_buffered_rows = max_buffered_rows
+        self._buffers: dict[str, list[LogEntry]] = {}
+        self._buffered = 0
+        self._partitions: dict[str, str] = {}
+        self._sample = list(sample)
+        # Data columns: (column name, data key, kind, arrow type), fixed with the schema
+        self._data_columns: list[tuple[str, str, str, Any]] = []
+        self._schema: Any = None
+        # Growing value -> index maps of the dictionary columns
+        self._dictionaries: dict[str, dict[str, int]] = {}
+
+    def partition(self, log_type: str) -> str:
+        """
+        Get the partition (row group key) of a log type.
+
+        Args:
+            log_type: Log type name
+
+        Returns:
+            The log type's first merge group, or the log type itself
+        """
+        partition = self._partitions.get(log_type)
+        if partition is None:
+            metadata = self._registry.get_metadata(log_type)
+            partition = metadata.merge_groups[0] if metadata and metadata.merge_groups else log_type
+            self._partitions[log_type] = partition
+        return partition
+
+    def add(self, entry: LogEntry) -> list[Any]:
+        """
+        Buffer an entry.
+
+        Args:
+            entry: Log entry to buffer
+
+        Returns:
+            Record batches that became ready (usually none)
+        """
+        partition = self.partition(entry.log_type)
+        buffer = self._buffers.get(partition)
+        if buffer is None:
+            buffer = self._buffers[partition] = []
+        buffer.append(entry)
+        self._buffered += 1
+
+        if len(buffer) >= self._row_group_size:
+            return [self._emit(partition)]
+        if self._buffered > self._max_buffered_rows:
+            return [self._emit(max(self._buffers, key=lambda key: len(self._buffers[key])))]
+        return []
+
+    def add_batch(self, entries: list[LogEntry]) -> list[Any]:
+        """
+        Buffer several entries.
+
+        Args:
+            entries: Log entries to buffer
+
+        Returns:
+            Record batches that became ready
+        """
+        batches = []
+        for entry in entries:
+            batches.extend(self.add(entry))
+        return batches
+
+    def drain(self) -> list[Any]:
+        """
+        Emit every buffered partition.
+
+        Returns:
+            One record batch per non-empty partition
+        """
+        self._ensure_schema()
+        return [self._emit(partition) for partition in list(self._buffers)]
+
+    @property
+    def schema(self) -> Any:
+        """Get the file schema, fixing it from the buffered entries if needed."""
+        self._ensure_schema()
+        return self._schema
+
+    @property
+    def buffered(self) -> int:
+        """Get the number of buffered entries."""
+        return self._buffered
+
+    def _ensure_schema(self) -> None:
+        """Fix the schema from the sample and every entry buffered so far."""
+        if self._schema is not None:
+            return
+
+        seen: dict[str, set[type]] = {}
+        ints_fit: dict[str, bool] = {}
+        for entry in chain(self._sample, *self._buffers.values()):
+            for key, value in entry.data.items():
+                types = seen.get(key)
+                if types is None:
+                    types = seen[key] = set()
+                    ints_fit[key] = True
+                types.add(type(value))
+                if type(value) is int and not _INT64_MIN <= value <= _INT64_MAX:
+                    ints_fit[key] = False
+
+        arrow_types = {"bool": pa.bool_(), "int": pa.int64(), "float": pa.float64()}
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        fields = [pa.field("timestamp", pa.timestamp("us"))]
+        fields.extend(
+            pa.field(name, dictionary if name in DICTIONARY_COLUMNS else pa.string())
+            for name in ENTRY_COLUMNS[1:]
+        )
+        for name, key in data_columns(seen):
+            kind = _infer_kind(seen[key], ints_fit[key])
+            arrow_type = arrow_types.get(kind, pa.string())
+            self._data_columns.append((name, key, kind, arrow_type))
+            fields.append(pa.field(name, arrow_type))
+        fields.append(pa.field(EXTRA_COLUMN, pa.string()))
+        self._schema = pa.schema(fields)
+
+    def _dictionary_array(self, column: str, values: list[str | None]) -> Any:
+        """Dictionary-encode a column against its growing dictionary."""
+        index = self._dictionaries.setdefault(column, {})
+        indices = [
+            None if value is None else index.setdefault(value, len(index)) for value in values
+        ]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, pa.int32()), pa.array(list(index), pa.string())
+        )
+
+    def _emit(self, partition: str) -> Any:
+        """Convert a partition's buffered entries into a record batch."""
+        self._ensure_schema()
+        entries = self._buffers.pop(partition)
+        self._buffered -= len(entries)
+        return self._build(entries)
+
+    def _coerce(
+        self, key: str, kind: str, values: list[Any], extras: list[dict[str, Any] | None]
+    ) -> list[Any]:
+        """Convert values to a column kind, moving misfits into extras."""
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            value_type = type(value)
+            if kind == "string":
+                values[i] = value if value_type is str else value_to_text(value)
+                continue
+            if kind == "int":
+                fits = value_type is int and _INT64_MIN <= value <= _INT64_MAX
+            elif kind == "float":
+                fits = value_type is int or value_type is float
+                if fits:
+                    value = float(value)
+            else:
+                fits = value_type is bool
+            if fits:
+                values[i] = value
+            else:
+                # Keep values that do not fit the column type
+                extras[i] = extras[i] or {}
+                extras[i][key] = value  # type: ignore[index]
+                values[i] = None
+        return values
+
+    def _build(self, entries: list[LogEntry]) -> Any:
+        """Build a record batch in the file schema."""
+        count = len(entries)
+        datas = [entry.data for entry in entries]
+        present = set().union(*datas)
+        extras: list[dict[str, Any] | None] = [None] * count
+
+        columns = [
+            pa.array([entry.timestamp for entry in entries], pa.timestamp("us")),
+            self._dictionary_array("type", [entry.log_type for entry in entries]),
+            self._dictionary_array("severity", [entry.severity.name for entry in entries]),
+            self._dictionary_array("category", [entry.category for entry in entries]),
+            self._dictionary_array("server_id", [entry.server_id or None for entry in entries]),
+            pa.array([entry.session_id or None for entry in entries], pa.string()),
+        ]
+
+        for _, key, kind, arrow_type in self._data_columns:
+            if key not in present:
+                columns.append(pa.nulls(count, arrow_type))
+                continue
+            values = [data.get(key) for data in datas]
+            if set(map(type, values)) <= _ACCEPTED_TYPES[kind]:
+                try:
+                    columns.append(pa.array(values, arrow_type))
+                    continue
+                except (OverflowError, pa.ArrowInvalid):
+                    pass
+            columns.append(pa.array(self._coerce(key, kind, values, extras), arrow_type))
+
+        known = {key for _, key, _, _ in self._data_columns}
+        unknown = present - known
+        if unknown:
+            for i, data in enumerate(datas):
+                for key in unknown & data.keys():
+                    extras[i] = extras[i] or {}
+                    extras[i][key] = data[key]  # type: ignore[index]
+        columns.append(
+            pa.array(
+                [
+                    None if extra is None else json.dumps(extra, default=str, ensure_ascii=False)
+                    for extra in extras
+                ],
+                pa.string(),
+            )
+        )
+        return pa.RecordBatch.from_arrays(columns, schema=self._schema)
+
+    def __repr__(self) -> str:
+        return (
+            f"ColumnarFormatter(row_group_size={self._row_group_size}, buffered={self._buffered})"
+        )
@@ -11,12 +11,15 @@ Reference: https://github.com/logpai/loghub
 import csv
 import io
 import re
+from collections.abc import Iterable
+from typing import Any, Protocol
 
 from agnolog.core.constants import LOGHUB_CSV_COLUMNS, LOGHUB_PLACEHOLDER, LOGHUB_TEMPLATE_COLUMNS
 from agnolog.core.registry import LogTypeRegistry, get_registry
 from agnolog.core.types import LogEntry
 from agnolog.formatters.base import BaseFormatter
 from agnolog.formatters.text_formatter import TextFormatter
+from agnolog.formatters.timestamps import MONTH_ABBR, timestamp_renderer
 from agnolog.logutils import get_internal_logger
 
 
@@ -80,6 +83,11 @@ class LoghubCSVFormatter(BaseFormatter):
         # Template mapping: log_type -> (EventId, EventTemplate, MergeGroups)
         self._template_map: dict[str, tuple[str, str, str]] = {}
         self._line_id = 0
+        self._render_time = timestamp_renderer("%H:%M:%S").render
+
+        # Reused row buffer for format(); one writer instead of one per row
+        self._row_buffer = io.StringIO()
+        self._row_writer = csv.writer(self._row_buffer, lineterminator="\n")
 
         self._build_template_map()
 
@@ -95,6 +103,11 @@ class LoghubCSVFormatter(BaseFormatter):
 
         self._logger.debug(f"Built template map with {len(self._template_map)} entries")
 
+    @property
+    def text_formatter(self) -> TextFormatter:
+        """Get the text formatter rendering the Content column."""
+        return self._text_formatter
+
     def reset_line_counter(self) -> None:
         """Reset the line ID counter to 0."""
         self._line_id = 0
@@ -111,17 +124,19 @@ class LoghubCSVFormatter(BaseFormatter):
         writer.writerow(LOGHUB_CSV_COLUMNS)
         return output.getvalue().rstrip("\r\n")
 
-    def format(self, entry: LogEntry) -> str:
+    def build_row(self, entry: LogEntry, content: str | None = None) -> list[Any]:
         """
-        Format a single log entry as a CSV row.
+        Build the CSV row values for an entry.
 
         Automatically increments the line ID counter.
 
         Args:
             entry: Log entry to format
+            content: Pre-rendered text line for the Content column
+                     (rendered with the text formatter if None)
 
         Returns:
-            CSV row string
+            Row values in LOGHUB_CSV_COLUMNS order
         """
         self._line_id += 1
 
@@ -136,17 +151,19 @@ class LoghubCSVFormatter(BaseFormatter):
             self._logger.warning(f"No template found for log type: {entry.log_type}")
 
         # Generate Content using text formatter
-        content = self._text_formatter.format(entry)
+        if content is None:
+            content = self._text_formatter.format(entry)
 
         # Extract PID from data if available
-        pid = entry.data.get("pid", entry.data.get("process_id", self._default_pid))
+        data = entry.data
+        pid = data.get("pid", data.get("process_id", self._default_pid))
 
-        # Build row
-        row = [
+        timestamp = entry.timestamp
+        return [
             self._line_id,
-            entry.timestamp.strftime("%b"),  # Month abbreviation
-            entry.timestamp.day,
-            entry.timestamp.strftime("%H:%M:%S"),
+            MONTH_ABBR[timestamp.month],
+            timestamp.day,
+            self._render_time(timestamp),
             self._component,
             pid,
             content,
@@ -154,10 +171,24 @@ class LoghubCSVFormatter(BaseFormatter):
             event_template,
         ]
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(row)
-        return output.getvalue().rstrip("\r\n")
+    def format(self, entry: LogEntry) -> str:
+        """
+        Format a single log entry as a CSV row.
+
+        Automatically increments the line ID counter. To write many rows,
+        LoghubCSVWriter streams them straight to the output instead.
+
+        Args:
+            entry: Log entry to format
+
+        Returns:
+            CSV row string
+        """
+        buffer = self._row_buffer
+        buffer.seek(0)
+        buffer.truncate()
+        self._row_writer.writerow(self.build_row(entry))
+        return buffer.getvalue().rstrip("\r\n")
 
     def format_batch(self, entries: list[LogEntry]) -> str:
         """
@@ -212,3 +243,121 @@ class LoghubCSVFormatter(BaseFormatter):
 
     def __repr__(self) -> str:
         return f"LoghubCSVFormatter(component={self._component!r}, templates={len(self._template_map)})"
+
+
+class SupportsWrite(Protocol):
+    """Anything with a write(str) method (files, output handlers)."""
+
+    def write(self, content: str, /) -> Any: ...
+
+
+class LoghubCSVWriter:
+    """
+    Streams loghub CSV rows to an output through one csv.writer.
+
+    Rows are written straight to the output as they are built, with
+    minimal quoting and no per-row buffer or writer objects.
+
+    Usage:
+        with FileOutputHandler("out_structured.csv", add_newline=False) as out:
+            writer = LoghubCSVWriter(LoghubCSVFormatter(), out)
+            writer.write_header()
+            writer.write_batch(entries)
+    """
+
+    def __init__(self, formatter: LoghubCSVFormatter, output: SupportsWrite) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            formatter: Formatter providing rows and line IDs
+            output: Destination; receives one write() per row, newline included
+        """
+        self._formatter = formatter
+        self._writer = csv.writer(output, lineterminator="\n")
+        self._build_row = formatter.build_row
+
+    def write_header(self) -> None:
+        """Write the CSV header row."""
+        self._writer.writerow(LOGHUB_CSV_COLUMNS)
+
+    def write(self, entry: LogEntry, content: str | None = None) -> None:
+        """
+        Write one entry as a CSV row.
+
+        Args:
+            entry: Log entry to write
+            content: Pre-rendered text line for the Content column
+        """
+        self._writer.writerow(self._build_row(entry, content))
+
+    def write_batch(self, entries: Iterable[LogEntry]) -> None:
+        """Write many entries as CSV rows."""
+        build_row = self._build_row
+        self._writer.writerows(build_row(entry) for entry in entries)
+
+    @property
+    def formatter(self) -> LoghubCSVFormatter:
+        """Get the formatter building the rows."""
+        return self._formatter
+
+    def __repr__(self) -> str:
+        return f"LoghubCSVWriter(formatter={self._formatter!r})"
+
+
+class LoghubEmitter:
+    """
+    Writes loghub .log and _structured.csv output in a single pass.
+
+    Each entry's text line is rendered once, then written both as the
+    .log line and as the Content column of the structured CSV row.
+
+    Usage:
+        emitter = LoghubEmitter(LoghubCSVFormatter(), log_out, structured_out)
+        emitter.write_header()
+        for entry in entries:
+            emitter.emit(entry)
+    """
+
+    def __init__(
+        self,
+        formatter: LoghubCSVFormatter,
+        log_output: SupportsWrite,
+        structured_output: SupportsWrite,
+    ) -> None:
+        """
+        Initialize the emitter.
+
+        Args:
+            formatter: Formatter providing text lines, rows and line IDs
+            log_output: Destination for .log lines (newline included)
+            structured_output: Destination for CSV rows (newline included)
+        """
+        self._render_text = formatter.text_formatter.format
+        self._write_log = log_output.write
+        self._csv = LoghubCSVWriter(formatter, structured_output)
+        self._count = 0
+
+    def write_header(self) -> None:
+        """Write the structured CSV header row."""
+        self._csv.write_header()
+
+    def emit(self, entry: LogEntry) -> None:
+        """Write one entry to both outputs."""
+        content = self._render_text(entry)
+        self._write_log(content + "\n")
+        self._csv.write(entry, content)
+        self._count += 1
+
+    def emit_batch(self, entries: Iterable[LogEntry]) -> None:
+        """Write many entries to both outputs."""
+        for entry in entries:
+            self.emit(entry)
+
+    @property
+    def count(self) -> int:
+        """Get the number of entries emitted."""
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"LoghubEmitter(count={self._count})"
@@ -0,0 +1,172 @@
+"""
+Pluggable JSON serializer backends.
+
+JSONFormatter encodes through one of:
+- orjson: fastest, used automatically when installed
+- msgspec: fast, used when orjson is missing (compact output only)
+- stdlib: the json module, always available
+
+Install a fast backend with: pip install orjson
+
+Every backend produces the same bytes: compact separators on single
+lines (JSON_SEPARATORS), ": " after keys when indented. Values a fast
+backend cannot encode (e.g. integers beyond 64 bits) fall back to the
+stdlib encoder for that document.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from agnolog.core.constants import (
+    DEFAULT_JSON_BACKEND,
+    JSON_BACKENDS,
+    JSON_INDENT,
+    JSON_SEPARATORS,
+)
+from agnolog.core.errors import InvalidConfigValueError
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    msgspec = None  # type: ignore
+    MSGSPEC_AVAILABLE = False
+
+# Encodes one JSON document to a string
+JSONEncodeFn = Callable[[Any], str]
+
+
+def _stdlib_encoder(indent: int | None, sort_keys: bool, ensure_ascii: bool) -> JSONEncodeFn:
+    """Build a reusable stdlib encoder (json.dumps builds one per call)."""
+    return json.JSONEncoder(
+        indent=indent,
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+        # Same bytes as orjson/msgspec, whichever backend is installed
+        separators=JSON_SEPARATORS if indent is None else (",", ": "),
+        default=str,  # Fallback for any unhandled types
+    ).encode
+
+
+def _orjson_encoder(indent: int | None, sort_keys: bool, ensure_ascii: bool) -> JSONEncodeFn | None:
+    """Build an orjson encoder, or None if the options are unsupported."""
+    if not ORJSON_AVAILABLE or ensure_ascii or indent not in (None, JSON_INDENT):
+        return None
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    dumps = orjson.dumps
+
+    def encode(obj: Any) -> str:
+        return dumps(obj, default=str, option=option).decode()
+
+    return encode
+
+
+def _msgspec_encoder(
+    indent: int | None, sort_keys: bool, ensure_ascii: bool
+) -> JSONEncodeFn | None:
+    """Build a msgspec encoder, or None if the options are unsupported."""
+    if not MSGSPEC_AVAILABLE or ensure_ascii or indent:
+        return None
+    try:
+        encoder = msgspec.json.Encoder(enc_hook=str, order="sorted" if sort_keys else None)
+    except TypeError:
+        # Older msgspec without key ordering
+        if sort_keys:
+            return None
+        encoder = msgspec.json.Encoder(enc_hook=str)
+    encode_bytes = encoder.encode
+
+    def encode(obj: Any) -> str:
+        return encode_bytes(obj).decode()
+
+    return encode
+
+
+_FAST_BACKENDS: dict[str, Callable[[int | None, bool, bool], JSONEncodeFn | None]] = {
+    "orjson": _orjson_encoder,
+    "msgspec": _msgspec_encoder,
+}
+
+
+def _with_fallback(encode: JSONEncodeFn, fallback: JSONEncodeFn) -> JSONEncodeFn:
+    """Retry documents a fast backend rejects with the stdlib encoder."""
+    errors: tuple[type[BaseException], ...] = (TypeError, ValueError, OverflowError)
+    if MSGSPEC_AVAILABLE:
+        errors += (msgspec.EncodeError,)
+
+    def encode_with_fallback(obj: Any) -> str:
+        try:
+            return encode(obj)
+        except errors:
+            return fallback(obj)
+
+    return encode_with_fallback
+
+
+def available_backends() -> list[str]:
+    """Get the installed JSON backends, fastest first."""
+    installed = {"orjson": ORJSON_AVAILABLE, "msgspec": MSGSPEC_AVAILABLE, "stdlib": True}
+    return [name for name, ok in installed.items() if ok]
+
+
+def get_json_encoder(
+    backend: str = DEFAULT_JSON_BACKEND,
+    indent: int | None = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = False,
+) -> tuple[str, JSONEncodeFn]:
+    """
+    Build a JSON encoder for the given options.
+
+    Args:
+        backend: "auto", "orjson", "msgspec" or "stdlib"
+        indent: Indentation (None for single-line output)
+        sort_keys: Whether to sort keys alphabetically
+        ensure_ascii: Whether to escape non-ASCII characters
+
+    Returns:
+        (backend name actually used, encode function)
+
+    Raises:
+        InvalidConfigValueError: If the backend is unknown, not installed,
+                                 or cannot honour the options
+    """
+    if backend not in JSON_BACKENDS:
+        raise InvalidConfigValueError("json_backend", backend, ", ".join(JSON_BACKENDS))
+
+    stdlib = _stdlib_encoder(indent, sort_keys, ensure_ascii)
+    if backend == "stdlib":
+        return "stdlib", stdlib
+
+    candidates = list(_FAST_BACKENDS) if backend == "auto" else [backend]
+    for name in candidates:
+        encode = _FAST_BACKENDS[name](indent, sort_keys, ensure_ascii)
+        if encode is not None:
+            return name, _with_fallback(encode, stdlib)
+
+    if backend == "auto":
+        return "stdlib", stdlib
+    if backend in available_backends():
+        hint = "It cannot honour these options (ensure_ascii, indent or sort_keys)"
+    else:
+        hint = f"Install it with: pip install {backend}"
+    raise InvalidConfigValueError(
+        "json_backend",
+        backend,
+        f"an installed backend supporting the options ({', '.join(available_backends())})",
+        hint=hint,
+    )
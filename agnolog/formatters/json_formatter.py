@@ -5,12 +5,49 @@ Produces machine-readable JSON output suitable for log
 aggregation systems, analysis tools, and APIs.
 """
 
-import json
 from datetime import datetime
+from json.encoder import encode_basestring, encode_basestring_ascii
 from typing import Any
 
+from agnolog.core.constants import DEFAULT_JSON_BACKEND, JSON_INDENT, JSON_SEPARATORS
 from agnolog.core.types import LogEntry
 from agnolog.formatters.base import BaseFormatter
+from agnolog.formatters.json_backends import get_json_encoder
+from agnolog.formatters.timestamps import timestamp_renderer
+
+# Values JSON encodes as-is; everything else goes through _serialize_value
+_JSON_PRIMITIVES = frozenset({str, int, float, bool, type(None)})
+
+# Top-level keys written by the formatter itself
+_ENTRY_KEYS = frozenset({"timestamp", "type", "severity", "category"})
+_METADATA_KEYS = frozenset({"server_id", "session_id"})
+
+
+class LineTemplate:
+    """
+    Pre-encoded constant parts of a JSON line for one log type.
+
+    Every entry of a type starts with the same keys and values, so
+    `{"timestamp":` and `,"type":"player.login","severity":"INFO",
+    "category":"PLAYER"` are encoded once; per entry only the timestamp
+    and the data fields are encoded and spliced in.
+    """
+
+    __slots__ = ("open", "head")
+
+    def __init__(self, open_: str, head: str) -> None:
+        """
+        Initialize the template.
+
+        Args:
+            open_: Text up to the timestamp value (e.g. '{"timestamp":')
+            head: Encoded type/severity/category items after the timestamp
+        """
+        self.open = open_
+        self.head = head
+
+    def __repr__(self) -> str:
+        return f"LineTemplate({self.open}...{self.head})"
 
 
 class JSONFormatter(BaseFormatter):
@@ -22,6 +59,7 @@ class JSONFormatter(BaseFormatter):
     - Configurable metadata inclusion
     - Proper datetime serialization
     - Handles nested objects and special types
+    - Pluggable serializer (orjson/msgspec when installed, stdlib fallback)
 
     Usage:
         formatter = JSONFormatter(pretty=True)
@@ -35,6 +73,7 @@ class JSONFormatter(BaseFormatter):
         sort_keys: bool = False,
         ensure_ascii: bool = False,
         date_format: str | None = None,
+        backend: str = DEFAULT_JSON_BACKEND,
     ) -> None:
         """
         Initialize JSON formatter.
@@ -45,13 +84,34 @@ class JSONFormatter(BaseFormatter):
             sort_keys: Whether to sort keys alphabetically
             ensure_ascii: Whether to escape non-ASCII characters
             date_format: Custom strftime format for dates (uses ISO if None)
+            backend: JSON serializer ("auto", "orjson", "msgspec", "stdlib")
+
+        Raises:
+            InvalidConfigValueError: If the backend is unavailable
         """
         self._pretty = pretty
         self._include_metadata = include_metadata
         self._sort_keys = sort_keys
         self._ensure_ascii = ensure_ascii
         self._date_format = date_format
-        self._indent = 2 if pretty else None
+        self._render_date = timestamp_renderer(date_format).render if date_format else None
+        self._indent = JSON_INDENT if pretty else None
+        self._backend, self._encode = get_json_encoder(
+            backend, self._indent, sort_keys, ensure_ascii
+        )
+        # NDJSON lines are never indented
+        _, self._encode_line = get_json_encoder(backend, None, sort_keys, ensure_ascii)
+
+        # Per-type line templates; sorted keys need the generic dict path
+        self._line_templates: dict[tuple[str, Any, str], LineTemplate] = {}
+        self._specialize = not sort_keys
+        self._quote = encode_basestring_ascii if ensure_ascii else encode_basestring
+        self._reserved_keys = _ENTRY_KEYS | _METADATA_KEYS if include_metadata else _ENTRY_KEYS
+        # The separators of every backend and of its stdlib fallback, so
+        # spliced parts never mix styles
+        self._item_sep, key_sep = JSON_SEPARATORS
+        self._server_id_key = f'{self._item_sep}"server_id"{key_sep}'
+        self._session_id_key = f'{self._item_sep}"session_id"{key_sep}'
 
     def _serialize_value(self, value: Any) -> Any:
         """
@@ -60,8 +120,8 @@ class JSONFormatter(BaseFormatter):
         Handles special types like datetime, enums, etc.
         """
         if isinstance(value, datetime):
-            if self._date_format:
-                return value.strftime(self._date_format)
+            if self._render_date:
+                return self._render_date(value)
             return value.isoformat()
         if hasattr(value, "name"):  # Enum
             return value.name
@@ -82,9 +142,13 @@ class JSONFormatter(BaseFormatter):
             "category": entry.category,  # Category is now a string
         }
 
-        # Add all data fields
-        for key, value in entry.data.items():
-            result[key] = self._serialize_value(value)
+        # Add all data fields; flat primitive values (the usual Lua result)
+        # are copied as-is, only the rest are serialized
+        data = entry.data
+        result.update(data)
+        for key, value in data.items():
+            if type(value) not in _JSON_PRIMITIVES:
+                result[key] = self._serialize_value(value)
 
         # Add optional metadata
         if self._include_metadata:
@@ -95,6 +159,50 @@ class JSONFormatter(BaseFormatter):
 
         return result
 
+    def _line_template(self, key: tuple[str, Any, str]) -> LineTemplate:
+        """Build and cache the line template for (log type, severity, category)."""
+        log_type, severity, category = key
+        sample = self._encode_line(
+            {"timestamp": "", "type": log_type, "severity": severity.name, "category": category}
+        )
+        split = sample.index('""')
+        template = LineTemplate(sample[:split], sample[split + 2 : -1])
+        self._line_templates[key] = template
+        return template
+
+    def _format_line(self, entry: LogEntry) -> str:
+        """
+        Encode an entry as a single JSON line.
+
+        Splices the timestamp and the encoded data fields into the
+        log type's pre-encoded template. Entries whose data reuses a
+        top-level key take the generic dict path, which handles shadowing.
+        """
+        data = entry.data
+        if not self._specialize or not data.keys().isdisjoint(self._reserved_keys):
+            return self._encode_line(self._entry_to_dict(entry))
+
+        key = (entry.log_type, entry.severity, entry.category)
+        template = self._line_templates.get(key) or self._line_template(key)
+
+        if not _JSON_PRIMITIVES.issuperset(map(type, data.values())):
+            serialize = self._serialize_value
+            data = {k: v if type(v) in _JSON_PRIMITIVES else serialize(v) for k, v in data.items()}
+
+        timestamp = entry.timestamp
+        render_date = self._render_date
+        stamp = render_date(timestamp) if render_date else timestamp.isoformat()
+        quote = self._quote
+        line = f"{template.open}{quote(stamp)}{template.head}"
+        if data:
+            line = f"{line}{self._item_sep}{self._encode_line(data)[1:-1]}"
+        if self._include_metadata:
+            if entry.server_id:
+                line = f"{line}{self._server_id_key}{quote(entry.server_id)}"
+            if entry.session_id:
+                line = f"{line}{self._session_id_key}{quote(entry.session_id)}"
+        return line + "}"
+
     def format(self, entry: LogEntry) -> str:
         """
         Format a single entry as JSON.
@@ -105,14 +213,9 @@ class JSONFormatter(BaseFormatter):
         Returns:
             JSON string representation
         """
-        data = self._entry_to_dict(entry)
-        return json.dumps(
-            data,
-            indent=self._indent,
-            sort_keys=self._sort_keys,
-            ensure_ascii=self._ensure_ascii,
-            default=str,  # Fallback for any unhandled types
-        )
+        if self._indent is None:
+            return self._format_line(entry)
+        return self._encode(self._entry_to_dict(entry))
 
     def format_batch(self, entries: list[LogEntry]) -> str:
         """
@@ -124,14 +227,7 @@ class JSONFormatter(BaseFormatter):
         Returns:
             JSON array string
         """
-        data = [self._entry_to_dict(entry) for entry in entries]
-        return json.dumps(
-            data,
-            indent=self._indent,
-            sort_keys=self._sort_keys,
-            ensure_ascii=self._ensure_ascii,
-            default=str,
-        )
+        return self._encode([self._entry_to_dict(entry) for entry in entries])
 
     def format_ndjson(self, entries: list[LogEntry]) -> str:
         """
@@ -146,19 +242,37 @@ class JSONFormatter(BaseFormatter):
         Returns:
             NDJSON string (one JSON object per line)
         """
-        lines = []
-        for entry in entries:
-            data = self._entry_to_dict(entry)
-            # NDJSON should not be pretty-printed
-            lines.append(
-                json.dumps(
-                    data,
-                    sort_keys=self._sort_keys,
-                    ensure_ascii=self._ensure_ascii,
-                    default=str,
-                )
-            )
-        return "\n".join(lines)
+        format_line = self._format_line
+        return "\n".join([format_line(entry) for entry in entries])
+
+    def format_lines(self, entries: list[LogEntry]) -> str:
+        """
+        Format entries as newline-terminated JSON documents in one buffer.
+
+        Single-line output is the NDJSON batch plus a final newline;
+        pretty output puts each indented document on its own lines.
+
+        Args:
+            entries: List of log entries to format
+
+        Returns:
+            Concatenated documents, each ending with a newline
+        """
+        if not entries:
+            return ""
+        if self._indent is None:
+            return self.format_ndjson(entries) + "\n"
+        encode = self._encode
+        entry_to_dict = self._entry_to_dict
+        return "\n".join([encode(entry_to_dict(entry)) for entry in entries]) + "\n"
+
+    @property
+    def backend(self) -> str:
+        """Get the name of the JSON backend in use."""
+        return self._backend
 
     def __repr__(self) -> str:
-        return f"JSONFormatter(pretty={self._pretty}, include_metadata={self._include_metadata})"
+        return (
+            f"JSONFormatter(pretty={self._pretty}, include_metadata={self._include_metadata}, "
+            f"backend={self._backend!r})"
+        )
@@ -0,0 +1,130 @@
+"""
+Syslog formatter: RFC 5424 or BSD (RFC 3164) headers around another format.
+
+Each entry becomes one syslog message whose body is the line of the
+wrapped formatter (text by default). The priority comes from the
+entry's severity and the configured facility; MSGID (RFC 5424) is the
+log type.
+"""
+
+import socket
+import time
+from datetime import datetime
+
+from agnolog.core.constants import (
+    SYSLOG_APP_NAME,
+    SYSLOG_FACILITY,
+    SYSLOG_FORMATS,
+    SYSLOG_SEVERITIES,
+)
+from agnolog.core.errors import InvalidConfigValueError
+from agnolog.core.types import LogEntry
+from agnolog.formatters.base import BaseFormatter
+from agnolog.formatters.text_formatter import TextFormatter
+from agnolog.formatters.timestamps import MONTH_ABBR, timestamp_renderer
+
+
+def _local_offset() -> str:
+    """Get the local UTC offset as +HH:MM."""
+    offset = time.strftime("%z") or "+0000"
+    return f"{offset[:3]}:{offset[3:]}"
+
+
+class SyslogFormatter(BaseFormatter):
+    """
+    Format log entries as syslog messages.
+
+    Naive timestamps are taken as local time; RFC 5424 timestamps get the
+    local UTC offset at formatter creation.
+
+    Usage:
+        formatter = SyslogFormatter()  # RFC 5424 around TextFormatter
+        formatter.format(entry)
+        # "<14>1 2024-01-15T12:30:45.123456+00:00 server-01 agnolog - player.login - ..."
+
+        formatter = SyslogFormatter(JSONFormatter(), rfc="3164", facility=16)
+    """
+
+    def __init__(
+        self,
+        formatter: BaseFormatter | None = None,
+        rfc: str = "5424",
+        facility: int = SYSLOG_FACILITY,
+        hostname: str | None = None,
+        app_name: str = SYSLOG_APP_NAME,
+    ) -> None:
+        """
+        Initialize the formatter.
+
+        Args:
+            formatter: Formatter of the message body (default TextFormatter())
+            rfc: "5424" or "3164"
+            facility: Syslog facility (0-23)
+            hostname: HOSTNAME field; an entry's server_id takes precedence
+                (default: this machine's host name)
+            app_name: APP-NAME (RFC 5424) or TAG (RFC 3164)
+
+        Raises:
+            InvalidConfigValueError: If the RFC or facility is invalid
+        """
+        if rfc not in SYSLOG_FORMATS:
+            raise InvalidConfigValueError("rfc", rfc, ", ".join(SYSLOG_FORMATS))
+        if not 0 <= facility <= 23:
+            raise InvalidConfigValueError("facility", facility, "0-23")
+        self._formatter = formatter or TextFormatter()
+        self._rfc = rfc
+        self._facility = facility
+        self._hostname = hostname or socket.gethostname() or "-"
+        self._app_name = app_name
+        # <PRI> prefixes by severity name
+        self._priorities = {
+            name: f"<{facility * 8 + code}>" for name, code in SYSLOG_SEVERITIES.items()
+        }
+        self._render_time = timestamp_renderer("%Y-%m-%dT%H:%M:%S.%f").render
+        self._offset = _local_offset()
+
+    def _timestamp(self, timestamp: datetime) -> str:
+        """Render the header timestamp."""
+        if self._rfc == "3164":
+            return (
+                f"{MONTH_ABBR[timestamp.month]} {timestamp.day:2d} "
+                f"{timestamp.hour:02d}:{timestamp.minute:02d}:{timestamp.second:02d}"
+            )
+        if timestamp.tzinfo is not None:
+            return timestamp.isoformat()
+        return self._render_time(timestamp) + self._offset
+
+    def format(self, entry: LogEntry) -> str:
+        """
+        Format an entry as one syslog message.
+
+        Args:
+            entry: The log entry to format
+
+        Returns:
+            Syslog message (without framing or trailing newline)
+        """
+        priority = self._priorities[entry.severity.name]
+        host = entry.server_id or self._hostname
+        body = self._formatter.format(entry).replace("\n", " ")
+        if self._rfc == "3164":
+            return f"{priority}{self._timestamp(entry.timestamp)} {host} {self._app_name}: {body}"
+        return (
+            f"{priority}1 {self._timestamp(entry.timestamp)} {host} {self._app_name} - "
+            f"{entry.log_type} - {body}"
+        )
+
+    def format_batch(self, entries: list[LogEntry]) -> str:
+        """
+        Format entries as newline-separated syslog messages.
+
+        Args:
+            entries: List of log entries to format
+
+        Returns:
+            Messages joined by newlines
+        """
+        return "\n".join(self.format(entry) for entry in entries)
+
+    def __repr__(self) -> str:
+        return f"SyslogFormatter(rfc={self._rfc!r}, facility={self._facility})"
@@ -5,14 +5,116 @@ Produces human-readable printf-style output suitable for
 console display and traditional log files.
 """
 
+from collections.abc import Callable
+from string import Formatter
 from typing import Any
 
 from agnolog.core.constants import SHORT_TIMESTAMP_FORMAT
 from agnolog.core.registry import LogTypeRegistry, get_registry
 from agnolog.core.types import LogEntry
 from agnolog.formatters.base import BaseFormatter
+from agnolog.formatters.timestamps import timestamp_renderer
 from agnolog.logutils import get_internal_logger
 
+# Resolves one template field for an entry; None when the field is missing
+FieldGetter = Callable[[LogEntry], str | None]
+
+_CONVERSIONS: dict[str, Callable[[Any], str]] = {"r": repr, "s": str, "a": ascii}
+
+
+class CompiledTemplate:
+    """
+    A text template parsed once into literal segments and field getters.
+
+    Rendering walks the segments and resolves only the fields the template
+    references, instead of building a dict of every field and calling
+    str.format per entry.
+
+    Usage:
+        compiled = CompiledTemplate.compile(template, formatter._field_getter)
+        text = compiled.render(entry)  # None if a field is missing
+    """
+
+    __slots__ = ("template", "_parts")
+
+    def __init__(
+        self,
+        template: str,
+        parts: list[tuple[str, FieldGetter | None, Callable[[str], str] | None]],
+    ) -> None:
+        """
+        Initialize a compiled template.
+
+        Args:
+            template: Source template string
+            parts: (literal, getter, converter) segments; the literal comes
+                   before the field, getter is None for a trailing literal
+        """
+        self.template = template
+        self._parts = parts
+
+    @classmethod
+    def compile(
+        cls, template: str, field_getter: Callable[[str], FieldGetter]
+    ) -> "CompiledTemplate | None":
+        """
+        Parse a template.
+
+        Args:
+            template: str.format-style template
+            field_getter: Builds the getter for a field name
+
+        Returns:
+            CompiledTemplate, or None when the template uses features that
+            need str.format (positional, attribute/index or nested fields)
+        """
+        parts: list[tuple[str, FieldGetter | None, Callable[[str], str] | None]] = []
+        try:
+            parsed = list(Formatter().parse(template))
+        except ValueError:
+            return None
+
+        for literal, name, spec, conversion in parsed:
+            if name is None:
+                parts.append((literal, None, None))
+                continue
+            if not name or name.isdigit() or any(c in name for c in ".[") or "{" in spec:
+                return None
+            parts.append((literal, field_getter(name), cls._converter(spec, conversion)))
+        return cls(template, parts)
+
+    @staticmethod
+    def _converter(spec: str, conversion: str | None) -> Callable[[str], str] | None:
+        """Build the converter applying a field's !conversion and :spec."""
+        convert = _CONVERSIONS.get(conversion) if conversion else None
+        if convert is None and not spec:
+            return None
+        if convert is None:
+            return lambda value: format(value, spec)
+        return lambda value: format(convert(value), spec)
+
+    def render(self, entry: LogEntry) -> str | None:
+        """
+        Render the template for an entry.
+
+        Returns:
+            Rendered text, or None if a referenced field is missing
+        """
+        out = []
+        append = out.append
+        for literal, getter, convert in self._parts:
+            append(literal)
+            if getter is None:
+                continue
+            value = getter(entry)
+            if value is None:
+                return None
+            append(convert(value) if convert else value)
+        return "".join(out)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.template!r})"
+
 
 class TextFormatter(BaseFormatter):
     """
@@ -51,10 +153,13 @@ class TextFormatter(BaseFormatter):
         """
         self._registry = registry or get_registry()
         self._timestamp_format = timestamp_format or SHORT_TIMESTAMP_FORMAT
+        self._render_timestamp = timestamp_renderer(self._timestamp_format).render
         self._include_severity = include_severity
         self._include_category = include_category
         self._color_enabled = color_enabled
         self._logger = get_internal_logger()
+        # Compiled renderers by template string (None: needs str.format)
+        self._compiled: dict[str, CompiledTemplate | None] = {}
 
     # ANSI color codes for severity levels
     SEVERITY_COLORS: dict[str, str] = {
@@ -90,7 +195,7 @@ class TextFormatter(BaseFormatter):
     def _build_format_dict(self, entry: LogEntry) -> dict[str, str]:
         """Build the format dictionary for template substitution."""
         format_dict: dict[str, str] = {
-            "timestamp": entry.timestamp.strftime(self._timestamp_format),
+            "timestamp": self._render_timestamp(entry.timestamp),
             "severity": entry.severity.name,
             "category": entry.category,  # Category is now a string
             "log_type": entry.log_type,
@@ -108,6 +213,66 @@ class TextFormatter(BaseFormatter):
 
         return format_dict
 
+    def _field_getter(self, name: str) -> FieldGetter:
+        """
+        Build the getter resolving a template field for an entry.
+
+        Mirrors the precedence of _build_format_dict: data fields shadow
+        the entry attributes, except server_id/session_id when set.
+        """
+        format_value = self._format_data_value
+
+        if name in ("server_id", "session_id"):
+
+            def get_meta(entry: LogEntry) -> str | None:
+                value = getattr(entry, name)
+                if value:
+                    return value
+                data = entry.data
+                if name not in data:
+                    return None
+                value = data[name]
+                return value if type(value) is str else format_value(value)
+
+            return get_meta
+
+        builtin: Callable[[LogEntry], str] | None = {
+            "timestamp": lambda entry: self._render_timestamp(entry.timestamp),
+            "severity": lambda entry: entry.severity.name,
+            "category": lambda entry: entry.category,
+            "log_type": lambda entry: entry.log_type,
+        }.get(name)
+
+        if builtin is not None:
+
+            def get_builtin(entry: LogEntry) -> str | None:
+                data = entry.data
+                if name not in data:
+                    return builtin(entry)
+                value = data[name]
+                return value if type(value) is str else format_value(value)
+
+            return get_builtin
+
+        def get_data(entry: LogEntry) -> str | None:
+            data = entry.data
+            if name not in data:
+                return None
+            value = data[name]
+            # Strings are the common case and format to themselves
+            return value if type(value) is str else format_value(value)
+
+        return get_data
+
+    def _compile(self, template: str) -> CompiledTemplate | None:
+        """Get the compiled renderer for a template, compiling it on first use."""
+        try:
+            return self._compiled[template]
+        except KeyError:
+            compiled = CompiledTemplate.compile(template, self._field_getter)
+            self._compiled[template] = compiled
+            return compiled
+
     def _format_with_template(
         self, entry: LogEntry, template: str, format_dict: dict[str, str]
     ) -> str:
@@ -157,15 +322,20 @@ class TextFormatter(BaseFormatter):
         Returns:
             Formatted text string
         """
-        format_dict = self._build_format_dict(entry)
-
         # Try to get template from registry
         metadata = self._registry.get_metadata(entry.log_type)
 
+        result = None
         if metadata and metadata.text_template:
-            result = self._format_with_template(entry, metadata.text_template, format_dict)
+            compiled = self._compile(metadata.text_template)
+            if compiled is not None:
+                result = compiled.render(entry)
+            if result is None:
+                # Missing field or uncompilable template: str.format path
+                format_dict = self._build_format_dict(entry)
+                result = self._format_with_template(entry, metadata.text_template, format_dict)
         else:
-            result = self._format_default(entry, format_dict)
+            result = self._format_default(entry, self._build_format_dict(entry))
 
         # Apply color if enabled
         return self._colorize(result, entry.severity.name)
@@ -0,0 +1,93 @@
+"""
+Shared timestamp rendering for formatters.
+
+Generated entries arrive in chronological order, many per simulated
+second, so consecutive timestamps usually render to the same text up
+to the second. A TimestampRenderer remembers the last second it
+rendered and only calls strftime when the second changes; sub-second
+fields (%f) are appended to the cached pieces.
+
+Renderers are shared per format string, so every formatter using the
+same format shares one memo:
+
+    render = timestamp_renderer("%Y-%m-%d %H:%M:%S").render
+    text = render(entry.timestamp)
+"""
+
+from datetime import datetime
+
+# Month abbreviations by month number (index 0 unused), as strftime("%b")
+MONTH_ABBR: tuple[str, ...] = ("",) + tuple(
+    datetime(2000, month, 1).strftime("%b") for month in range(1, 13)
+)
+
+
+class TimestampRenderer:
+    """
+    strftime with a last-second memo.
+
+    Usage:
+        renderer = TimestampRenderer("%Y-%m-%d %H:%M:%S.%f")
+        renderer.render(datetime(2024, 1, 15, 12, 30, 45, 5))
+        # "2024-01-15 12:30:45.000005"
+    """
+
+    __slots__ = ("format", "_pieces", "_last")
+
+    def __init__(self, fmt: str) -> None:
+        """
+        Initialize the renderer.
+
+        Args:
+            fmt: strftime format string
+        """
+        self.format = fmt
+        self._pieces: list[str] | None
+        if "%f" not in fmt:
+            self._pieces = [fmt]
+        elif "%%" in fmt:
+            # "%%f" is a literal; splitting on %f would break it
+            self._pieces = None
+        else:
+            # Render everything but %f once per second; join with microseconds
+            self._pieces = fmt.split("%f")
+        # (second key, rendered pieces) swapped as one tuple for thread safety
+        self._last: tuple[tuple | None, tuple[str, ...]] = (None, ())
+
+    def render(self, dt: datetime) -> str:
+        """Render a datetime with this renderer's format."""
+        pieces = self._pieces
+        if pieces is None:
+            return dt.strftime(self.format)
+
+        key = (dt.second, dt.minute, dt.hour, dt.day, dt.month, dt.year, dt.tzinfo)
+        last_key, parts = self._last
+        if key != last_key:
+            parts = tuple(dt.strftime(piece) for piece in pieces)
+            self._last = (key, parts)
+
+        if len(parts) == 1:
+            return parts[0]
+        return f"{dt.microsecond:06d}".join(parts)
+
+    def __repr__(self) -> str:
+        return f"TimestampRenderer({self.format!r})"
+
+
+_renderers: dict[str, TimestampRenderer] = {}
+
+
+def timestamp_renderer(fmt: str) -> TimestampRenderer:
+    """
+    Get the shared renderer for a format string.
+
+    Args:
+        fmt: strftime format string
+
+    Returns:
+        TimestampRenderer shared by all callers using this format
+    """
+    renderer = _renderers.get(fmt)
+    if renderer is None:
+        renderer = _renderers.setdefault(fmt, TimestampRenderer(fmt))
+    return renderer
@@ -5,6 +5,18 @@ Provides multiple output destinations:
 - StreamOutputHandler: Write to stdout/stderr
 - FileOutputHandler: Write to files
 - RotatingFileHandler: Write to files with rotation
+- SegmentedFileHandler: Write entries to files rotated by log time or line count
+- PartitionedFileHandler: Write entries into category=/date=/hour= directories
+- MmapFileHandler: Write a preallocated file through a memory-mapped window
+- ColumnarFileHandler: Write entries to Parquet/Arrow IPC files (optional pyarrow)
+- MergeGroupTableWriter: Write one CSV/NDJSON/Parquet table per merge group
+- SocketOutputHandler: Send lines over TCP, UDP or Unix sockets (syslog collectors)
+- HttpBulkHandler: Post entries to Elasticsearch _bulk, Loki push or Splunk HEC
+- LoghubFileHandler: Write entries as loghub .log/_structured.csv/_templates.csv files
+- TeeHandler: Write one entry stream to several sinks, each on its own thread
+- QueuedOutputHandler: Write through another handler on a background thread
+- CompressedWriter: gzip/zstd/lz4 file compression on a thread pool (used
+  by the file handlers' compression option)
 
 Usage:
     from agnolog.output import StreamOutputHandler, FileOutputHandler
@@ -15,12 +27,37 @@ Usage:
 """
 
 from agnolog.output.base import BaseOutputHandler
+from agnolog.output.columnar_handler import ColumnarFileHandler
+from agnolog.output.compression import CompressedWriter
 from agnolog.output.file_handler import FileOutputHandler, RotatingFileHandler
+from agnolog.output.http_handler import HttpBulkHandler, HttpStats
+from agnolog.output.loghub_handler import LoghubFileHandler
+from agnolog.output.mmap_handler import MmapFileHandler
+from agnolog.output.network_handler import NetworkStats, SocketOutputHandler
+from agnolog.output.partition_handler import PartitionedFileHandler
+from agnolog.output.queued_handler import QueuedOutputHandler, WriterStats
+from agnolog.output.segment_handler import SegmentedFileHandler
 from agnolog.output.stream_handler import StreamOutputHandler
+from agnolog.output.table_writer import MergeGroupTableWriter
+from agnolog.output.tee_handler import TeeHandler
 
 __all__ = [
     "BaseOutputHandler",
     "StreamOutputHandler",
     "FileOutputHandler",
     "RotatingFileHandler",
+    "SegmentedFileHandler",
+    "PartitionedFileHandler",
+    "MmapFileHandler",
+    "ColumnarFileHandler",
+    "MergeGroupTableWriter",
+    "SocketOutputHandler",
+    "NetworkStats",
+    "HttpBulkHandler",
+    "HttpStats",
+    "LoghubFileHandler",
+    "TeeHandler",
+    "QueuedOutputHandler",
+    "WriterStats",
+    "CompressedWriter",
 ]
@@ -0,0 +1,189 @@
+"""
+Columnar file output: Parquet or Arrow IPC (Feather v2).
+
+Writes the record batches of a ColumnarFormatter, one row group per
+batch. Requires the optional pyarrow package:
+
+    pip install agnolog[columnar]
+"""
+
+from pathlib import Path
+from typing import Any
+
+from agnolog.core.constants import COLUMNAR_COMPRESSION, COLUMNAR_FORMATS
+from agnolog.core.errors import (
+    DirectoryNotFoundError,
+    FileWriteError,
+    PermissionDeniedError,
+    UnsupportedFormatError,
+)
+from agnolog.core.types import LogEntry
+from agnolog.formatters.columnar_formatter import ColumnarFormatter
+from agnolog.logutils import get_internal_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ipc = pq = None  # type: ignore
+
+
+class ColumnarFileHandler:
+    """
+    Write log entries to a Parquet or Arrow IPC file.
+
+    Takes entries rather than formatted strings, so it is not a
+    BaseOutputHandler. The file is opened when the first row group is
+    ready, since the schema comes from the entries buffered until then.
+
+    Usage:
+        with ColumnarFileHandler("logs/events.parquet") as handler:
+            handler.write_entries(entries)
+
+        handler = ColumnarFileHandler("logs/events.arrow", file_format="arrow")
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file_format: str = "parquet",
+        formatter: ColumnarFormatter | None = None,
+        compression: str | None = COLUMNAR_COMPRESSION,
+        create_dirs: bool = True,
+    ) -> None:
+        """
+        Initialize columnar file handler.
+
+        Args:
+            path: Path to the output file (overwritten)
+            file_format: "parquet" or "arrow" (Arrow IPC file / Feather v2)
+            formatter: Record batch builder (default ColumnarFormatter())
+            compression: Codec ("zstd", "lz4", ...; None for uncompressed)
+            create_dirs: Whether to create parent directories if needed
+
+        Raises:
+            UnsupportedFormatError: If the format is unknown
+            MissingDependencyError: If pyarrow is not installed
+        """
+        if file_format not in COLUMNAR_FORMATS:
+            raise UnsupportedFormatError(file_format, list(COLUMNAR_FORMATS))
+
+        self._formatter = formatter or ColumnarFormatter()
+        self._path = Path(path)
+        self._format = file_format
+        self._compression = compression
+        self._writer: Any = None
+        self._closed = False
+        self._entry_count = 0
+        self._row_group_count = 0
+        self._logger = get_internal_logger()
+
+        if create_dirs:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+            except PermissionError:
+                raise PermissionDeniedError(str(self._path.parent), "create directory")
+            except OSError as e:
+                raise FileWriteError(str(self._path), f"Cannot create directory: {e}")
+        if not self._path.parent.exists():
+            raise DirectoryNotFoundError(str(self._path.parent))
+
+    def _open_writer(self) -> None:
+        """Open the file with the formatter's schema."""
+        schema = self._formatter.schema
+        try:
+            if self._format == "parquet":
+                self._writer = pq.ParquetWriter(
+                    str(self._path), schema, compression=self._compression or "none"
+                )
+            else:
+                # Dictionaries only grow, so later batches are written as deltas
+                options = ipc.IpcWriteOptions(
+                    compression=self._compression, emit_dictionary_deltas=True
+                )
+                self._writer = ipc.new_file(str(self._path), schema, options=options)
+        except PermissionError:
+            raise PermissionDeniedError(str(self._path), "write")
+        except (OSError, pa.ArrowException) as e:
+            raise FileWriteError(str(self._path), str(e))
+        self._logger.debug(f"Opened {self._format} file for writing: {self._path}")
+
+    def _write_batches(self, batches: list[Any]) -> None:
+        """Write ready record batches, one row group each."""
+        for batch in batches:
+            if self._writer is None:
+                self._open_writer()
+            try:
+                self._writer.write_batch(batch)
+            except (OSError, pa.ArrowException) as e:
+                raise FileWriteError(str(self._path), str(e))
+            self._row_group_count += 1
+
+    def write_entry(self, entry: LogEntry) -> None:
+        """
+        Buffer an entry, writing a row group when one is full.
+
+        Args:
+            entry: Log entry to write
+        """
+        if self._closed:
+            return
+        self._write_batches(self._formatter.add(entry))
+        self._entry_count += 1
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Buffer several entries, writing row groups as they fill.
+
+        Args:
+            entries: Log entries to write
+        """
+        if self._closed:
+            return
+        self._write_batches(self._formatter.add_batch(entries))
+        self._entry_count += len(entries)
+
+    def close(self) -> None:
+        """Write the buffered row groups and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_batches(self._formatter.drain())
+        if self._writer is None:
+            # No entries: still leave a valid, empty file
+            self._open_writer()
+        try:
+            self._writer.close()
+        except (OSError, pa.ArrowException) as e:
+            raise FileWriteError(str(self._path), str(e))
+        self._logger.debug(
+            f"Closed {self._format} file: {self._path} "
+            f"({self._entry_count} entries, {self._row_group_count} row groups)"
+        )
+
+    @property
+    def path(self) -> Path:
+        """Get the output file path."""
+        return self._path
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries written."""
+        return self._entry_count
+
+    @property
+    def row_group_count(self) -> int:
+        """Get the number of row groups written."""
+        return self._row_group_count
+
+    def __enter__(self) -> "ColumnarFileHandler":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ColumnarFileHandler(path={self._path!r}, format={self._format!r})"
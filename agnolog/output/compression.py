@@ -0,0 +1,293 @@
+"""
+Streaming compression for file output.
+
+CompressedWriter wraps a binary file and compresses what is written to
+it in independent blocks:
+- gzip: stdlib; one gzip member per block (a concatenation of members is
+  a valid gzip file, as written by pigz)
+- zstd: one frame per block (optional zstandard package)
+- lz4: one frame per block (optional lz4 package)
+
+Blocks are compressed on a small thread pool (zlib, zstd and lz4 release
+the GIL while compressing) and written in order, so compression does not
+hold back generation. Install the optional codecs with:
+
+    pip install agnolog[compression]
+"""
+
+import gzip
+import io
+import os
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO
+
+from agnolog.core.constants import (
+    COMPRESSION_BLOCK_SIZE,
+    COMPRESSION_CODECS,
+    COMPRESSION_EXTENSIONS,
+    COMPRESSION_LEVELS,
+    COMPRESSION_MAX_THREADS,
+)
+from agnolog.core.errors import InvalidConfigValueError, MissingDependencyError
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None  # type: ignore
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame as lz4_frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    lz4_frame = None  # type: ignore
+    LZ4_AVAILABLE = False
+
+# Compresses one block into a self-contained gzip member or frame
+CompressFn = Callable[[bytes], bytes]
+
+_PACKAGES = {"zstd": ("zstandard", ZSTD_AVAILABLE), "lz4": ("lz4", LZ4_AVAILABLE)}
+
+
+def check_codec(codec: str) -> None:
+    """
+    Check that a compression codec is known and installed.
+
+    Args:
+        codec: "gzip", "zstd" or "lz4"
+
+    Raises:
+        InvalidConfigValueError: If the codec is unknown
+        MissingDependencyError: If the codec's package is not installed
+    """
+    if codec not in COMPRESSION_CODECS:
+        raise InvalidConfigValueError("compression", codec, ", ".join(COMPRESSION_CODECS))
+    package, available = _PACKAGES.get(codec, ("", True))
+    if not available:
+        raise MissingDependencyError(package, f"{codec} compression", extra="compression")
+
+
+def get_compressor(codec: str, level: int | None = None) -> CompressFn:
+    """
+    Build a thread-safe block compressor.
+
+    Args:
+        codec: "gzip", "zstd" or "lz4"
+        level: Compression level (codec default if None)
+
+    Returns:
+        Function compressing one block
+
+    Raises:
+        InvalidConfigValueError: If the codec is unknown
+        MissingDependencyError: If the codec's package is not installed
+    """
+    check_codec(codec)
+    if level is None:
+        level = COMPRESSION_LEVELS[codec]
+
+    if codec == "gzip":
+
+        def compress(block: bytes) -> bytes:
+            # mtime=0 keeps output reproducible
+            return gzip.compress(block, compresslevel=level, mtime=0)
+
+    elif codec == "zstd":
+        # ZstdCompressor objects must not be shared between threads
+        local = threading.local()
+
+        def compress(block: bytes) -> bytes:
+            compressor = getattr(local, "compressor", None)
+            if compressor is None:
+                compressor = local.compressor = zstandard.ZstdCompressor(level=level)
+            return compressor.compress(block)
+
+    else:
+
+        def compress(block: bytes) -> bytes:
+            return lz4_frame.compress(block, compression_level=level)
+
+    return compress
+
+
+def compressed_path(path: str, codec: str | None) -> str:
+    """
+    Add a codec's file extension to a path that lacks it.
+
+    Args:
+        path: Output path
+        codec: Compression codec (None leaves the path unchanged)
+
+    Returns:
+        The path ending with the codec's extension
+    """
+    if codec is None:
+        return path
+    extension = COMPRESSION_EXTENSIONS[codec]
+    return path if path.endswith(extension) else path + extension
+
+
+def default_threads() -> int:
+    """Get the default number of compression threads."""
+    return max(1, min(COMPRESSION_MAX_THREADS, os.cpu_count() or 1))
+
+
+class CompressedWriter(io.BufferedIOBase):
+    """
+    Binary file object that compresses written bytes in independent blocks.
+
+    Written bytes are collected until block_size, then compressed on a
+    thread pool; results are written to the wrapped file in order, with
+    at most two blocks per thread in flight. flush() compresses the
+    partial block, so flushing often costs compression ratio.
+
+    Usage:
+        with CompressedWriter(open("logs/server.log.gz", "wb")) as f:
+            f.write(data)
+
+        # Text handlers write through a TextIOWrapper
+        text = io.TextIOWrapper(CompressedWriter(raw, codec="zstd"), encoding="utf-8")
+    """
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        codec: str = "gzip",
+        level: int | None = None,
+        threads: int | None = None,
+        block_size: int = COMPRESSION_BLOCK_SIZE,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            raw: Binary file receiving the compressed blocks (closed with this one)
+            codec: "gzip", "zstd" or "lz4"
+            level: Compression level (codec default if None)
+            threads: Compression threads (default: CPU count, at most
+                COMPRESSION_MAX_THREADS); 1 compresses on the calling thread
+            block_size: Uncompressed bytes per block
+
+        Raises:
+            InvalidConfigValueError: If the codec is unknown
+            MissingDependencyError: If the codec's package is not installed
+            ValueError: If threads or block_size is not positive
+        """
+        super().__init__()
+        threads = default_threads() if threads is None else threads
+        if threads < 1 or block_size < 1:
+            raise ValueError("Compression threads and block size must be positive")
+
+        self._compress = get_compressor(codec, level)
+        self._raw = raw
+        self._codec = codec
+        self._block_size = block_size
+        self._threads = threads
+        self._pending = bytearray()
+        self._inflight: deque[Future[bytes]] = deque()
+        self._pool = (
+            ThreadPoolExecutor(threads, thread_name_prefix="agnolog-compress")
+            if threads > 1
+            else None
+        )
+        self._blocks = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def writable(self) -> bool:
+        """Report that the file is writable."""
+        return True
+
+    def fileno(self) -> int:
+        """Get the file descriptor of the wrapped file (e.g. for fsync)."""
+        return self._raw.fileno()
+
+    def _write_block(self, compressed: bytes) -> None:
+        """Write a compressed block to the wrapped file."""
+        self._raw.write(compressed)
+        self._bytes_out += len(compressed)
+
+    def _submit(self, block: bytes) -> None:
+        """Compress a block, writing finished blocks in order."""
+        self._blocks += 1
+        if self._pool is None:
+            self._write_block(self._compress(block))
+            return
+
+        inflight = self._inflight
+        inflight.append(self._pool.submit(self._compress, block))
+        # Write what is done; wait for the oldest block when too many are queued
+        while inflight and (inflight[0].done() or len(inflight) > 2 * self._threads):
+            self._write_block(inflight.popleft().result())
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        """
+        Buffer bytes, compressing a block whenever one is full.
+
+        Args:
+            data: Uncompressed bytes
+
+        Returns:
+            Number of bytes accepted
+        """
+        if self.closed:
+            raise ValueError("write to closed file")
+        size = len(data)
+        self._pending += data
+        self._bytes_in += size
+        if len(self._pending) >= self._block_size:
+            self._submit(bytes(self._pending))
+            self._pending.clear()
+        return size
+
+    def flush(self) -> None:
+        """Compress the partial block and write every pending block."""
+        if self.closed:
+            return
+        if self._pending:
+            self._submit(bytes(self._pending))
+            self._pending.clear()
+        while self._inflight:
+            self._write_block(self._inflight.popleft().result())
+        self._raw.flush()
+
+    def close(self) -> None:
+        """Write the remaining blocks and close the wrapped file."""
+        if self.closed:
+            return
+        try:
+            if self._blocks == 0 and not self._pending:
+                # An empty gzip/zstd/lz4 file is not a valid archive
+                self._write_block(self._compress(b""))
+            super().close()  # flushes
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+            self._raw.close()
+
+    @property
+    def codec(self) -> str:
+        """Get the compression codec."""
+        return self._codec
+
+    @property
+    def bytes_in(self) -> int:
+        """Get the number of uncompressed bytes written."""
+        return self._bytes_in
+
+    @property
+    def bytes_out(self) -> int:
+        """Get the number of compressed bytes written to the file."""
+        return self._bytes_out
+
+    def __repr__(self) -> str:
+        return (
+            f"CompressedWriter(codec={self._codec!r}, threads={self._threads}, "
+            f"block_size={self._block_size})"
+        )
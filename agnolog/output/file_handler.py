@@ -1,15 +1,24 @@
 """
 File output handlers for writing logs to files.
 
-Supports both simple file output and rotating files.
+Supports both simple file output and rotating files, optionally
+compressed as they are written (gzip, zstd or lz4; see compression.py).
 """
 
+import io
 from pathlib import Path
-
-from agnolog.core.constants import FILE_ENCODING, FILE_ROTATION_COUNT, FILE_ROTATION_SIZE
+from typing import BinaryIO
+
+from agnolog.core.constants import (
+    COMPRESSION_EXTENSIONS,
+    FILE_ENCODING,
+    FILE_ROTATION_COUNT,
+    FILE_ROTATION_SIZE,
+)
 from agnolog.core.errors import DirectoryNotFoundError, FileWriteError, PermissionDeniedError
 from agnolog.logutils import get_internal_logger
 from agnolog.output.base import BaseOutputHandler
+from agnolog.output.compression import CompressedWriter, check_codec
 
 
 class FileOutputHandler(BaseOutputHandler):
@@ -20,6 +29,7 @@ class FileOutputHandler(BaseOutputHandler):
     - Automatic directory creation
     - Append or overwrite modes
     - Proper encoding support
+    - Optional streaming compression
     - Error handling with helpful messages
 
     Usage:
@@ -27,6 +37,9 @@ class FileOutputHandler(BaseOutputHandler):
         handler.write("log entry")
         handler.close()
 
+        # gzip members compressed on a thread pool (appending adds members)
+        handler = FileOutputHandler("logs/server.log.gz", compression="gzip")
+
         # Or with context manager:
         with FileOutputHandler("logs/server.log") as handler:
             handler.write("log entry")
@@ -39,6 +52,9 @@ class FileOutputHandler(BaseOutputHandler):
         encoding: str = FILE_ENCODING,
         add_newline: bool = True,
         create_dirs: bool = True,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        compression_threads: int | None = None,
     ) -> None:
         """
         Initialize file output handler.
@@ -49,12 +65,24 @@ class FileOutputHandler(BaseOutputHandler):
             encoding: File encoding (default: utf-8)
             add_newline: Whether to add newline after each write
             create_dirs: Whether to create parent directories if needed
+            compression: Codec ("gzip", "zstd", "lz4"; None for plain text)
+            compression_level: Codec level (codec default if None)
+            compression_threads: Compression threads (default: CPU count, capped)
+
+        Raises:
+            InvalidConfigValueError: If the codec is unknown
+            MissingDependencyError: If the codec's package is not installed
         """
+        if compression is not None:
+            check_codec(compression)
         self._path = Path(path)
         self._append = append
         self._encoding = encoding
         self._add_newline = add_newline
         self._create_dirs = create_dirs
+        self._compression = compression
+        self._compression_level = compression_level
+        self._compression_threads = compression_threads
         self._file = None
         self._logger = get_internal_logger()
         self._write_count = 0
@@ -79,7 +107,16 @@ class FileOutputHandler(BaseOutputHandler):
         # Open the file
         mode = "a" if self._append else "w"
         try:
-            self._file = open(self._path, mode, encoding=self._encoding)
+            if self._compression is None:
+                self._file = open(self._path, mode, encoding=self._encoding)
+            else:
+                writer = CompressedWriter(
+                    open(self._path, mode + "b"),
+                    codec=self._compression,
+                    level=self._compression_level,
+                    threads=self._compression_threads,
+                )
+                self._file = io.TextIOWrapper(writer, encoding=self._encoding)
             self._logger.debug(f"Opened file for writing: {self._path}")
         except PermissionError:
             raise PermissionDeniedError(str(self._path), "write")
@@ -133,7 +170,8 @@ class FileOutputHandler(BaseOutputHandler):
         return self._write_count
 
     def __repr__(self) -> str:
-        return f"FileOutputHandler(path={self._path!r}, append={self._append})"
+        compression = f", compression={self._compression!r}" if self._compression else ""
+        return f"FileOutputHandler(path={self._path!r}, append={self._append}{compression})"
 
 
 class RotatingFileHandler(BaseOutputHandler):
@@ -146,12 +184,22 @@ class RotatingFileHandler(BaseOutputHandler):
 
     Files are named: name.log, name.log.1, name.log.2, etc.
 
+    The file is written in binary mode: each write (or write_batch) is
+    encoded once and its byte length is what the size check counts. A
+    batch is never split across files, so rotation happens at batch
+    granularity and a file can exceed max_size by up to one batch.
+
+    With compression, max_size counts uncompressed bytes and backups keep
+    the codec extension last: name.log.gz, name.log.1.gz, ...
+
     Usage:
         handler = RotatingFileHandler(
             "logs/server.log",
             max_size=10*1024*1024,  # 10MB
             max_files=5
         )
+
+        handler = RotatingFileHandler("logs/server.log.zst", compression="zstd")
     """
 
     def __init__(
@@ -161,6 +209,9 @@ class RotatingFileHandler(BaseOutputHandler):
         max_files: int = FILE_ROTATION_COUNT,
         encoding: str = FILE_ENCODING,
         add_newline: bool = True,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        compression_threads: int | None = None,
     ) -> None:
         """
         Initialize rotating file handler.
@@ -171,7 +222,19 @@ class RotatingFileHandler(BaseOutputHandler):
             max_files: Maximum number of backup files to keep
             encoding: File encoding
             add_newline: Whether to add newline after each write
+            compression: Codec ("gzip", "zstd", "lz4"; None for plain text)
+            compression_level: Codec level (codec default if None)
+            compression_threads: Compression threads (default: CPU count, capped)
+
+        Raises:
+            InvalidConfigValueError: If the codec is unknown
+            MissingDependencyError: If the codec's package is not installed
         """
+        if compression is not None:
+            check_codec(compression)
+        self._compression = compression
+        self._compression_level = compression_level
+        self._compression_threads = compression_threads
         self._base_path = Path(path)
         self._max_size = max_size
         self._max_files = max_files
@@ -190,7 +253,27 @@ class RotatingFileHandler(BaseOutputHandler):
         if self._base_path.exists():
             self._current_size = self._base_path.stat().st_size
 
-        self._file = open(self._base_path, "a", encoding=self._encoding)
+        self._file = self._open("ab")
+
+    def _open(self, mode: str) -> BinaryIO:
+        """Open the base file, through a compressor if configured."""
+        raw = open(self._base_path, mode)
+        if self._compression is None:
+            return raw
+        return CompressedWriter(  # type: ignore[return-value]
+            raw,
+            codec=self._compression,
+            level=self._compression_level,
+            threads=self._compression_threads,
+        )
+
+    def _backup_path(self, index: int) -> Path:
+        """Get the path of a backup file (1 is the newest)."""
+        name = self._base_path.name
+        extension = COMPRESSION_EXTENSIONS.get(self._compression or "", "")
+        if extension and name.endswith(extension):
+            return self._base_path.with_name(f"{name[: -len(extension)]}.{index}{extension}")
+        return self._base_path.with_name(f"{name}.{index}")
 
     def _rotate(self) -> None:
         """Rotate log files."""
@@ -200,26 +283,38 @@ class RotatingFileHandler(BaseOutputHandler):
         self._file.close()
 
         # Delete oldest file if at max
-        oldest = self._base_path.with_suffix(f".log.{self._max_files}")
+        oldest = self._backup_path(self._max_files)
         if oldest.exists():
             oldest.unlink()
 
         # Rename existing backup files
         for i in range(self._max_files - 1, 0, -1):
-            old_path = self._base_path.with_suffix(f".log.{i}")
-            new_path = self._base_path.with_suffix(f".log.{i + 1}")
+            old_path = self._backup_path(i)
             if old_path.exists():
-                old_path.rename(new_path)
+                old_path.rename(self._backup_path(i + 1))
 
         # Rename current file to .1
-        backup_path = self._base_path.with_suffix(f"{self._base_path.suffix}.1")
-        self._base_path.rename(backup_path)
+        self._base_path.rename(self._backup_path(1))
 
         # Open new file
-        self._file = open(self._base_path, "w", encoding=self._encoding)
+        self._file = self._open("wb")
         self._current_size = 0
         self._rotation_count += 1
 
+    def _write_bytes(self, data: bytes, writes: int) -> None:
+        """Write encoded content, rotating first if it would not fit."""
+        if self._file is None:
+            return
+
+        size = len(data)
+        # An empty file is never rotated, even by a write larger than max_size
+        if self._current_size and self._current_size + size > self._max_size:
+            self._rotate()
+
+        self._file.write(data)
+        self._current_size += size
+        self._write_count += writes
+
     def write(self, content: str) -> None:
         """
         Write content to the file, rotating if needed.
@@ -229,16 +324,20 @@ class RotatingFileHandler(BaseOutputHandler):
         """
         if self._add_newline and not content.endswith("\n"):
             content = content + "\n"
+        self._write_bytes(content.encode(self._encoding), 1)
 
-        content_size = len(content.encode(self._encoding))
-
-        # Check if rotation is needed
-        if self._current_size + content_size > self._max_size:
-            self._rotate()
+    def write_batch(self, contents: list[str]) -> None:
+        """
+        Write several strings with one encode and one size check.
 
-        self._file.write(content)
-        self._current_size += content_size
-        self._write_count += 1
+        Args:
+            contents: List of formatted content strings
+        """
+        if not contents:
+            return
+        if self._add_newline:
+            contents = [c if c.endswith("\n") else c + "\n" for c in contents]
+        self._write_bytes("".join(contents).encode(self._encoding), len(contents))
 
     def close(self) -> None:
         """Close the file."""
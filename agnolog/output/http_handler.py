@@ -0,0 +1,435 @@
+"""
+HTTP bulk output for log ingestion APIs.
+
+HttpBulkHandler posts batches of entries in the request shape of:
+- elasticsearch: _bulk NDJSON (an index action line before each document)
+- loki: push API JSON, one stream per category/severity label set
+- splunk: HTTP Event Collector, one event object per entry
+
+Request bodies are built on the calling thread and posted by a pool of
+worker threads, each holding one keep-alive connection. The queue in
+front of the pool is as deep as the pool, so a slow ingestion tier
+blocks generation instead of growing memory. Bodies can be gzipped (on
+the workers; zlib releases the GIL), and connection errors and
+retryable statuses (429, 5xx) are retried with backoff, honouring
+Retry-After.
+"""
+
+import base64
+import gzip
+import http.client
+import json
+import queue
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from agnolog.core.constants import (
+    DEFAULT_JSON_BACKEND,
+    FILE_ENCODING,
+    HTTP_APIS,
+    HTTP_BATCH_ROWS,
+    HTTP_CONCURRENCY,
+    HTTP_ES_INDEX,
+    HTTP_GZIP_LEVEL,
+    HTTP_RETRY_ATTEMPTS,
+    HTTP_RETRY_DELAY,
+    HTTP_RETRY_STATUSES,
+    HTTP_TIMEOUT,
+    SYSLOG_APP_NAME,
+)
+from agnolog.core.errors import InvalidConfigValueError, NetworkSendError
+from agnolog.core.types import LogEntry
+from agnolog.formatters.base import BaseFormatter
+from agnolog.formatters.json_backends import get_json_encoder
+from agnolog.formatters.json_formatter import JSONFormatter
+from agnolog.logutils import get_internal_logger
+
+# Queue item telling a worker thread to stop
+_STOP = object()
+
+_CONTENT_TYPES = {
+    "elasticsearch": "application/x-ndjson",
+    "loki": "application/json",
+    "splunk": "application/json",
+}
+
+
+def _epoch_ns(entry: LogEntry) -> int:
+    """Get an entry's timestamp in nanoseconds since the epoch (naive = local time)."""
+    timestamp = entry.timestamp
+    seconds = int(timestamp.replace(microsecond=0).timestamp())
+    return seconds * 1_000_000_000 + timestamp.microsecond * 1000
+
+
+@dataclass(slots=True)
+class HttpStats:
+    """Counters of an HttpBulkHandler."""
+
+    requests: int = 0
+    entries: int = 0
+    bytes: int = 0
+    retries: int = 0
+    rejected: int = 0
+    request_seconds: float = 0.0
+
+
+class HttpBulkHandler:
+    """
+    Post log entries in batches to an Elasticsearch, Loki or Splunk HEC endpoint.
+
+    Takes entries rather than formatted strings (Loki and HEC carry
+    per-entry timestamps and labels), so it is not a BaseOutputHandler.
+    Errors from the workers are re-raised on the next write or close.
+
+    Usage:
+        with HttpBulkHandler("http://localhost:9200/_bulk") as handler:
+            handler.write_entries(entries)
+
+        handler = HttpBulkHandler(
+            "https://splunk:8088/services/collector/event", api="splunk",
+            headers={"Authorization": "Splunk <token>"}, compress=True,
+        )
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api: str = "elasticsearch",
+        formatter: BaseFormatter | None = None,
+        batch_rows: int = HTTP_BATCH_ROWS,
+        concurrency: int = HTTP_CONCURRENCY,
+        compress: bool = False,
+        headers: dict[str, str] | None = None,
+        index: str | None = HTTP_ES_INDEX,
+        app_name: str = SYSLOG_APP_NAME,
+        timeout: float = HTTP_TIMEOUT,
+        retry_attempts: int = HTTP_RETRY_ATTEMPTS,
+        json_backend: str = DEFAULT_JSON_BACKEND,
+    ) -> None:
+        """
+        Initialize the handler and start its worker threads.
+
+        Args:
+            url: Endpoint URL (http or https; user:password@ sends basic auth)
+            api: Request shape: "elasticsearch", "loki" or "splunk"
+            formatter: Formatter of each document or line (default JSONFormatter();
+                elasticsearch needs a JSONFormatter)
+            batch_rows: Entries per request
+            concurrency: Worker threads, each with one keep-alive connection
+            compress: Whether to gzip request bodies
+            headers: Extra request headers (e.g. Authorization)
+            index: Elasticsearch index of the action lines (None: from the URL)
+            app_name: Loki "job" label and Splunk "source" field
+            timeout: Request timeout in seconds
+            retry_attempts: Retries of a failed request
+            json_backend: JSON serializer of the Loki and Splunk envelopes
+
+        Raises:
+            InvalidConfigValueError: If the URL, API or formatter is invalid
+            ValueError: If batch_rows or concurrency is not positive
+        """
+        if api not in HTTP_APIS:
+            raise InvalidConfigValueError("api", api, ", ".join(HTTP_APIS))
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise InvalidConfigValueError("url", url, "http://HOST[:PORT]/PATH or https://...")
+        self._formatter = formatter or JSONFormatter(backend=json_backend)
+        if api == "elasticsearch" and not isinstance(self._formatter, JSONFormatter):
+            raise InvalidConfigValueError(
+                "formatter", type(self._formatter).__name__, "JSONFormatter (elasticsearch)"
+            )
+        if batch_rows < 1 or concurrency < 1:
+            raise ValueError("batch_rows and concurrency must be positive")
+
+        self._url = url
+        self._api = api
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path or "/"
+        if parts.query:
+            self._path += "?" + parts.query
+        self._batch_rows = batch_rows
+        self._compress = compress
+        self._app_name = app_name
+        self._timeout = timeout
+        self._retry_attempts = max(0, retry_attempts)
+        self._encode_json = get_json_encoder(json_backend)[1]
+        self._action = self._encode_json({"index": {"_index": index} if index else {}})
+        self._hostname = socket.gethostname()
+        self._logger = get_internal_logger()
+
+        self._headers = {"Content-Type": _CONTENT_TYPES[api]}
+        if compress:
+            self._headers["Content-Encoding"] = "gzip"
+        if parts.username:
+            credentials = f"{parts.username}:{parts.password or ''}".encode()
+            self._headers["Authorization"] = "Basic " + base64.b64encode(credentials).decode()
+        self._headers.update(headers or {})
+
+        self._pending: list[LogEntry] = []
+        self._entry_count = 0
+        self._stats = HttpStats()
+        self._stats_lock = threading.Lock()
+        self._error: BaseException | None = None
+        self._closed = False
+        # One body queued per worker: the rest of the pipeline waits
+        self._queue: queue.Queue = queue.Queue(maxsize=concurrency)
+        self._workers = [
+            threading.Thread(target=self._run, name=f"agnolog-http-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _encode(self, entries: list[LogEntry]) -> bytes:
+        """Build the request body of a batch."""
+        if self._api == "elasticsearch":
+            # NDJSON lines never contain raw newlines
+            head = self._action + "\n"
+            lines = self._formatter.format_ndjson(entries).split("\n")  # type: ignore[attr-defined]
+            body = head + ("\n" + head).join(lines) + "\n"
+        elif self._api == "loki":
+            streams: dict[tuple[str, str], list[list[str]]] = {}
+            format_entry = self._formatter.format
+            for entry in entries:
+                key = (entry.category, entry.severity.name)
+                values = streams.get(key)
+                if values is None:
+                    values = streams[key] = []
+                values.append([str(_epoch_ns(entry)), format_entry(entry)])
+            body = self._encode_json(
+                {
+                    "streams": [
+                        {
+                            "stream": {
+                                "job": self._app_name,
+                                "category": category,
+                                "severity": severity,
+                            },
+                            "values": values,
+                        }
+                        for (category, severity), values in streams.items()
+                    ]
+                }
+            )
+        else:
+            format_entry = self._formatter.format
+            encode_json = self._encode_json
+            body = "\n".join(
+                [
+                    encode_json(
+                        {
+                            "time": _epoch_ns(entry) / 1e9,
+                            "host": entry.server_id or self._hostname,
+                            "source": self._app_name,
+                            "sourcetype": entry.log_type,
+                            "event": format_entry(entry),
+                        }
+                    )
+                    for entry in entries
+                ]
+            )
+        return body.encode(FILE_ENCODING)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Open a keep-alive connection to the endpoint."""
+        if self._https:
+            connection = http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout)
+        else:
+            connection = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+        connection.connect()
+        # Small requests on a reused connection must not wait on Nagle's algorithm
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def _run(self) -> None:
+        """Worker thread: post queued batches over one persistent connection."""
+        connection: http.client.HTTPConnection | None = None
+        get = self._queue.get
+        done = self._queue.task_done
+        try:
+            while True:
+                item = get()
+                try:
+                    if item is _STOP:
+                        return
+                    if self._error is None:
+                        connection = self._post(connection, *item)
+                except BaseException as e:
+                    # Keep draining so the producer never blocks on dead workers
+                    self._error = e
+                finally:
+                    done()
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _post(
+        self, connection: http.client.HTTPConnection | None, body: bytes, rows: int
+    ) -> http.client.HTTPConnection | None:
+        """Post one body, retrying failures; returns the connection to reuse."""
+        if self._compress:
+            body = gzip.compress(body, compresslevel=HTTP_GZIP_LEVEL)
+        delay = HTTP_RETRY_DELAY
+        retries = 0
+        started = time.perf_counter()
+        for attempt in range(self._retry_attempts + 1):
+            retry_after = None
+            try:
+                if connection is None:
+                    connection = self._connection()
+                connection.request("POST", self._path, body, self._headers)
+                response = connection.getresponse()
+                payload = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                # Includes a keep-alive connection the server closed while idle
+                if connection is not None:
+                    connection.close()
+                connection = None
+                error = str(e) or type(e).__name__
+            else:
+                if response.will_close:
+                    connection.close()
+                    connection = None
+                if response.status < 300:
+                    rejected = self._rejected(payload)
+                    with self._stats_lock:
+                        stats = self._stats
+                        stats.requests += 1
+                        stats.entries += rows
+                        stats.bytes += len(body)
+                        stats.retries += retries
+                        stats.rejected += rejected
+                        stats.request_seconds += time.perf_counter() - started
+                    return connection
+                error = f"HTTP {response.status}: {payload[:200].decode(errors='replace')}"
+                if response.status not in HTTP_RETRY_STATUSES:
+                    raise NetworkSendError(self._url, error)
+                retry_after = response.getheader("Retry-After")
+
+            if attempt == self._retry_attempts:
+                break
+            retries += 1
+            wait = delay
+            if retry_after is not None and retry_after.isdigit():
+                wait = max(wait, float(retry_after))
+            self._logger.debug(f"Retrying {self._url} in {wait:.2f}s: {error}")
+            time.sleep(wait)
+            delay *= 2
+        raise NetworkSendError(self._url, f"{error} (after {retries} retries)")
+
+    def _rejected(self, payload: bytes) -> int:
+        """Count documents an Elasticsearch bulk response reports as failed."""
+        if self._api != "elasticsearch" or b'"errors":true' not in payload.replace(b" ", b""):
+            return 0
+        try:
+            items = json.loads(payload)["items"]
+        except (ValueError, KeyError, TypeError):
+            return 0
+        return sum(1 for item in items for result in item.values() if "error" in result)
+
+    def _raise_error(self) -> None:
+        """Re-raise a failure of a worker thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _send_pending(self) -> None:
+        """Encode the pending entries and queue them for the workers."""
+        if not self._pending:
+            return
+        entries = self._pending
+        self._pending = []
+        self._queue.put((self._encode(entries), len(entries)))
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Buffer entries, queueing a request for every batch_rows of them.
+
+        Args:
+            entries: Log entries to send
+        """
+        if self._closed:
+            return
+        self._raise_error()
+        pending = self._pending
+        batch_rows = self._batch_rows
+        start = 0
+        while start < len(entries):
+            room = batch_rows - len(pending)
+            pending.extend(entries[start : start + room])
+            start += room
+            if len(pending) >= batch_rows:
+                self._send_pending()
+                pending = self._pending
+        self._entry_count += len(entries)
+
+    def write_entry(self, entry: LogEntry) -> None:
+        """
+        Write a single entry.
+
+        Args:
+            entry: Log entry to send
+        """
+        self.write_entries([entry])
+
+    def flush(self) -> None:
+        """Send the pending entries and wait for every queued request."""
+        if self._closed:
+            return
+        self._send_pending()
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Send the pending entries, wait for the workers and stop them."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._error is None:
+                self._send_pending()
+        finally:
+            for _ in self._workers:
+                self._queue.put(_STOP)
+            for worker in self._workers:
+                worker.join()
+        self._raise_error()
+        stats = self._stats
+        self._logger.debug(
+            f"Closed {self._url}: {stats.entries} entries in {stats.requests} requests "
+            f"({stats.bytes} bytes, {stats.request_seconds:.3f}s), {stats.retries} retries, "
+            f"{stats.rejected} rejected"
+        )
+
+    @property
+    def stats(self) -> HttpStats:
+        """Get the request counters."""
+        return self._stats
+
+    @property
+    def url(self) -> str:
+        """Get the endpoint URL."""
+        return self._url
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries written."""
+        return self._entry_count
+
+    def __enter__(self) -> "HttpBulkHandler":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"HttpBulkHandler(url={self._url!r}, api={self._api!r}, workers={len(self._workers)})"
+        )
@@ -0,0 +1,139 @@
+"""
+Loghub file output: the three files of the loghub benchmark format.
+
+LoghubFileHandler writes PREFIX.log (raw text lines),
+PREFIX_structured.csv (one row per line, with its template) and, on
+close, PREFIX_templates.csv (the unique templates seen).
+"""
+
+from pathlib import Path
+
+from agnolog.core.types import LogEntry
+from agnolog.formatters.csv_formatter import LoghubCSVFormatter, LoghubEmitter
+from agnolog.logutils import get_internal_logger
+from agnolog.output.compression import compressed_path
+from agnolog.output.file_handler import FileOutputHandler
+
+
+class LoghubFileHandler:
+    """
+    Write log entries as loghub .log, _structured.csv and _templates.csv files.
+
+    Takes entries rather than formatted strings (each entry becomes a
+    .log line and a CSV row), so it is not a BaseOutputHandler.
+
+    Usage:
+        with LoghubFileHandler("out/server") as handler:
+            handler.write_entries(entries)
+        # out/server.log, out/server_structured.csv, out/server_templates.csv
+
+        handler = LoghubFileHandler("out/server", compression="gzip")
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        formatter: LoghubCSVFormatter | None = None,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        compression_threads: int | None = None,
+    ) -> None:
+        """
+        Initialize loghub output and write the structured CSV header.
+
+        Args:
+            prefix: Path prefix of the three files
+            formatter: Loghub formatter (default LoghubCSVFormatter())
+            compression: Codec ("gzip", "zstd", "lz4"; None for plain text),
+                whose extension is added to each file
+            compression_level: Codec level (codec default if None)
+            compression_threads: Compression threads per file (default: CPU count, capped)
+
+        Raises:
+            InvalidConfigValueError: If the codec is unknown
+            MissingDependencyError: If the codec's package is not installed
+        """
+        self._formatter = formatter or LoghubCSVFormatter()
+        self._log_path = Path(compressed_path(f"{prefix}.log", compression))
+        self._structured_path = Path(compressed_path(f"{prefix}_structured.csv", compression))
+        self._templates_path = Path(compressed_path(f"{prefix}_templates.csv", compression))
+        self._compression = {
+            "compression": compression,
+            "compression_level": compression_level,
+            "compression_threads": compression_threads,
+        }
+        self._logger = get_internal_logger()
+        self._closed = False
+
+        # The emitter supplies its own line endings
+        self._log_handler = FileOutputHandler(
+            str(self._log_path), append=False, add_newline=False, **self._compression
+        )
+        self._structured_handler = FileOutputHandler(
+            str(self._structured_path), append=False, add_newline=False, **self._compression
+        )
+        self._emitter = LoghubEmitter(self._formatter, self._log_handler, self._structured_handler)
+        self._emitter.write_header()
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Write entries as .log lines and structured CSV rows.
+
+        Each text line is rendered once, for both files.
+
+        Args:
+            entries: Log entries to write
+        """
+        if not self._closed:
+            self._emitter.emit_batch(entries)
+
+    def write_entry(self, entry: LogEntry) -> None:
+        """
+        Write a single entry.
+
+        Args:
+            entry: Log entry to write
+        """
+        self.write_entries([entry])
+
+    def close(self) -> None:
+        """Close the .log and structured files and write the templates file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._log_handler.close()
+        self._structured_handler.close()
+        with FileOutputHandler(
+            str(self._templates_path), append=False, add_newline=False, **self._compression
+        ) as templates_handler:
+            templates_handler.write(self._formatter.format_templates_csv() + "\n")
+        self._logger.debug(
+            f"Closed loghub output: {self._log_path} ({self.entry_count} entries, "
+            f"{self.template_count} templates)"
+        )
+
+    @property
+    def paths(self) -> list[Path]:
+        """Get the .log, structured CSV and templates CSV paths."""
+        return [self._log_path, self._structured_path, self._templates_path]
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries written."""
+        return self._emitter.count
+
+    @property
+    def template_count(self) -> int:
+        """Get the number of unique templates seen."""
+        return len(self._formatter.get_templates())
+
+    def __enter__(self) -> "LoghubFileHandler":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"LoghubFileHandler(log_path={self._log_path!r}, entries={self.entry_count})"
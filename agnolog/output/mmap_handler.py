@@ -0,0 +1,234 @@
+"""
+Memory-mapped output for large, fixed-size dataset builds.
+
+MmapFileHandler preallocates the output file from an estimate of its
+final size and copies writes into a memory-mapped window instead of
+issuing write() calls. The file is allocated in large extents
+(posix_fallocate where available, else ftruncate) and cut to the exact
+size written on close. Allocation failures such as a full disk are
+raised as FileWriteError rather than left to fault inside the mapping.
+"""
+
+import errno
+import mmap
+import os
+from pathlib import Path
+
+from agnolog.core.constants import FILE_ENCODING, MMAP_SIZE_MARGIN, MMAP_WINDOW_SIZE
+from agnolog.core.errors import DirectoryNotFoundError, FileWriteError, PermissionDeniedError
+from agnolog.logutils import get_internal_logger
+from agnolog.output.base import BaseOutputHandler
+
+# posix_fallocate errors meaning "not supported by this file system"; any
+# other (ENOSPC, EFBIG...) would only reappear as SIGBUS on a sparse file
+_FALLOCATE_UNSUPPORTED = frozenset({errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOSYS, errno.EINVAL})
+
+
+class MmapFileHandler(BaseOutputHandler):
+    """
+    Output handler that writes a file through a growing memory-mapped window.
+
+    With expected_lines, the first write's average line length gives the
+    size to preallocate (with MMAP_SIZE_MARGIN headroom); past the
+    estimate the file grows one window at a time. The file is always
+    overwritten.
+
+    Usage:
+        handler = MmapFileHandler("data/corpus.ndjson", expected_lines=50_000_000)
+        for chunk in chunks:
+            handler.write(formatter.format_lines(chunk))
+        handler.close()  # truncates to the bytes written
+    """
+
+    def __init__(
+        self,
+        path: str,
+        expected_lines: int | None = None,
+        window_size: int = MMAP_WINDOW_SIZE,
+        encoding: str = FILE_ENCODING,
+        add_newline: bool = True,
+        create_dirs: bool = True,
+    ) -> None:
+        """
+        Initialize memory-mapped file handler.
+
+        Args:
+            path: Path to the output file (overwritten)
+            expected_lines: Lines expected in total, to preallocate the file
+                (None: grow one window at a time)
+            window_size: Bytes mapped at once, rounded up to the mmap granularity
+            encoding: File encoding
+            add_newline: Whether to add newline after each write
+            create_dirs: Whether to create parent directories if needed
+
+        Raises:
+            ValueError: If window_size is not positive
+        """
+        if window_size < 1:
+            raise ValueError(f"Window size must be positive, got {window_size}")
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self._window_size = -(-window_size // granularity) * granularity
+        self._path = Path(path)
+        self._expected_lines = expected_lines
+        self._encoding = encoding
+        self._add_newline = add_newline
+        self._logger = get_internal_logger()
+
+        self._map: mmap.mmap | None = None
+        self._window_start = 0
+        self._window_end = 0
+        self._offset = 0
+        self._allocated = 0
+        self._remaps = 0
+        self._write_count = 0
+        self._closed = False
+
+        if create_dirs:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+            except PermissionError:
+                raise PermissionDeniedError(str(self._path.parent), "create directory")
+            except OSError as e:
+                raise FileWriteError(str(self._path), f"Cannot create directory: {e}")
+        if not self._path.parent.exists():
+            raise DirectoryNotFoundError(str(self._path.parent))
+
+        try:
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        except PermissionError:
+            raise PermissionDeniedError(str(self._path), "write")
+        except OSError as e:
+            raise FileWriteError(str(self._path), str(e))
+        self._logger.debug(f"Opened memory-mapped file for writing: {self._path}")
+
+    def _allocate(self, size: int) -> None:
+        """Grow the file to at least size bytes."""
+        if size <= self._allocated:
+            return
+        try:
+            if hasattr(os, "posix_fallocate"):
+                try:
+                    # Real extents: no sparse holes filled page by page
+                    os.posix_fallocate(self._fd, self._allocated, size - self._allocated)
+                except OSError as e:
+                    if e.errno not in _FALLOCATE_UNSUPPORTED:
+                        raise
+                    os.ftruncate(self._fd, size)
+            else:
+                os.ftruncate(self._fd, size)
+        except OSError as e:
+            raise FileWriteError(str(self._path), f"Cannot allocate {size} bytes: {e}")
+        self._allocated = size
+
+    def _map_window(self) -> None:
+        """Map the window starting at the current offset."""
+        if self._map is not None:
+            self._map.close()
+            self._remaps += 1
+        start = self._offset - self._offset % mmap.ALLOCATIONGRANULARITY
+        self._allocate(start + self._window_size)
+        try:
+            self._map = mmap.mmap(self._fd, self._window_size, offset=start)
+        except (OSError, ValueError) as e:
+            raise FileWriteError(str(self._path), f"Cannot map file: {e}")
+        self._window_start = start
+        self._window_end = start + self._window_size
+
+    def _reserve(self, data: bytes) -> None:
+        """Preallocate the file from the line length of the first write."""
+        lines = data.count(b"\n") or 1
+        estimate = int(len(data) / lines * self._expected_lines * MMAP_SIZE_MARGIN)  # type: ignore[operator]
+        self._allocate(estimate)
+        self._logger.debug(f"Preallocated {self._allocated} bytes for {self._path}")
+
+    def _write_bytes(self, data: bytes) -> None:
+        """Copy bytes into the mapped window, moving it forward as it fills."""
+        if self._map is None:
+            if self._expected_lines:
+                self._reserve(data)
+            self._map_window()
+        size = len(data)
+        end = self._offset + size
+        if end <= self._window_end:
+            position = self._offset - self._window_start
+            self._map[position : position + size] = data  # type: ignore[index]
+            self._offset = end
+            return
+
+        view = memoryview(data)
+        written = 0
+        while written < size:
+            if self._offset == self._window_end:
+                self._map_window()
+            position = self._offset - self._window_start
+            count = min(size - written, self._window_end - self._offset)
+            self._map[position : position + count] = view[written : written + count]  # type: ignore[index]
+            self._offset += count
+            written += count
+
+    def write(self, content: str) -> None:
+        """
+        Write content to the file.
+
+        Args:
+            content: The formatted content to write
+        """
+        if self._closed:
+            return
+
+        if self._add_newline and not content.endswith("\n"):
+            content = content + "\n"
+
+        self._write_bytes(content.encode(self._encoding))
+        self._write_count += 1
+
+    def flush(self) -> None:
+        """Flush the mapped window to the file."""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self) -> None:
+        """Unmap the window and truncate the file to the bytes written."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            try:
+                if self._map is not None:
+                    # Unmapping leaves dirty pages to normal writeback, like write()
+                    self._map.close()
+                    self._map = None
+            finally:
+                # Drop the preallocated tail whatever happened to the mapping
+                os.ftruncate(self._fd, self._offset)
+        except OSError as e:
+            raise FileWriteError(str(self._path), str(e))
+        finally:
+            os.close(self._fd)
+        self._logger.debug(
+            f"Closed memory-mapped file: {self._path} ({self._offset} bytes, "
+            f"{self._allocated} allocated, {self._remaps} remaps)"
+        )
+
+    @property
+    def path(self) -> Path:
+        """Get the file path."""
+        return self._path
+
+    @property
+    def bytes_written(self) -> int:
+        """Get the number of bytes written."""
+        return self._offset
+
+    @property
+    def allocated(self) -> int:
+        """Get the number of bytes allocated for the file so far."""
+        return self._allocated
+
+    @property
+    def write_count(self) -> int:
+        """Get the number of writes performed."""
+        return self._write_count
+
+    def __repr__(self) -> str:
+        return f"MmapFileHandler(path={self._path!r}, window_size={self._window_size})"
@@ -0,0 +1,327 @@
+"""
+Network output: TCP, UDP and Unix domain sockets, for load-testing collectors.
+
+SocketOutputHandler sends newline-terminated lines, one message each, so
+a message can never span lines (no pretty-printed JSON; the CLI rejects
+--pretty with --send):
+- Stream transports (tcp, unix) keep one connection open, collect
+  encoded data up to batch_bytes and send it with one sendmsg (writev)
+  call. Sends block while the receiver's window is full, which is the
+  backpressure on generation; the time spent blocked is in the stats. A
+  dropped connection is re-established and the batch resent.
+- Datagram transports (udp, unixgram) send one message per datagram;
+  messages the kernel refuses (no buffer space, nobody listening) are
+  counted as dropped, like any UDP sender.
+
+Syslog over a stream can use RFC 6587 octet counting ("LEN MSG") instead
+of newline framing. Addresses are URLs: tcp://host:port, udp://host:port,
+unix:///path/to.sock, unixgram:///dev/log.
+"""
+
+import errno
+import socket
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from agnolog.core.constants import (
+    FILE_ENCODING,
+    NETWORK_BATCH_BYTES,
+    NETWORK_RECONNECT_ATTEMPTS,
+    NETWORK_RECONNECT_DELAY,
+    NETWORK_TIMEOUT,
+    NETWORK_TRANSPORTS,
+)
+from agnolog.core.errors import InvalidConfigValueError, NetworkSendError
+from agnolog.logutils import get_internal_logger
+from agnolog.output.base import BaseOutputHandler
+
+# Framings of messages on stream transports
+FRAMINGS = ("newline", "octet")
+
+# Buffers per sendmsg call (IOV_MAX is 1024 on Linux)
+_MAX_BUFFERS = 1024
+
+# Datagram send errors meaning "message lost", not "destination broken"
+_DROPPED_ERRNOS = frozenset({errno.ENOBUFS, errno.EAGAIN, errno.ECONNREFUSED, errno.EMSGSIZE})
+
+
+def parse_address(url: str) -> tuple[str, str | tuple[str, int]]:
+    """
+    Parse a destination URL.
+
+    Args:
+        url: tcp://host:port, udp://host:port, unix:///path or unixgram:///path
+
+    Returns:
+        (transport, socket address)
+
+    Raises:
+        InvalidConfigValueError: If the URL is not a supported destination
+    """
+    expected = "tcp://HOST:PORT, udp://HOST:PORT, unix:///PATH or unixgram:///PATH"
+    parts = urlsplit(url)
+    if parts.scheme not in NETWORK_TRANSPORTS:
+        raise InvalidConfigValueError("address", url, expected)
+    if parts.scheme.startswith("unix"):
+        path = parts.path or parts.netloc
+        if not path:
+            raise InvalidConfigValueError("address", url, expected)
+        return parts.scheme, path
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if not parts.hostname or port is None:
+        raise InvalidConfigValueError("address", url, expected)
+    return parts.scheme, (parts.hostname, port)
+
+
+@dataclass(slots=True)
+class NetworkStats:
+    """Counters of a SocketOutputHandler."""
+
+    messages: int = 0
+    bytes: int = 0
+    sends: int = 0
+    reconnects: int = 0
+    dropped: int = 0
+    send_seconds: float = 0.0
+
+
+class SocketOutputHandler(BaseOutputHandler):
+    """
+    Output handler that sends lines over TCP, UDP or a Unix domain socket.
+
+    Each line of the written content is one message (the CLI writes whole
+    chunks of lines at once), so formatters must put each entry on a
+    single line.
+
+    Usage:
+        handler = SocketOutputHandler("tcp://127.0.0.1:5140")
+        handler.write(formatter.format_lines(chunk))
+        handler.close()
+
+        # Syslog to a collector, RFC 6587 octet counting
+        handler = SocketOutputHandler("tcp://collector:601", framing="octet")
+        handler = SocketOutputHandler("unixgram:///dev/log")
+    """
+
+    def __init__(
+        self,
+        address: str,
+        framing: str = "newline",
+        batch_bytes: int = NETWORK_BATCH_BYTES,
+        timeout: float | None = NETWORK_TIMEOUT,
+        reconnect_attempts: int = NETWORK_RECONNECT_ATTEMPTS,
+        encoding: str = FILE_ENCODING,
+        add_newline: bool = True,
+    ) -> None:
+        """
+        Initialize the handler and connect.
+
+        Args:
+            address: Destination URL (see parse_address)
+            framing: "newline" or "octet" (RFC 6587; stream transports only)
+            batch_bytes: Bytes collected before a stream send (0 sends every write)
+            timeout: Socket timeout in seconds (None blocks indefinitely)
+            reconnect_attempts: Reconnects tried when a stream connection drops
+            encoding: Message encoding
+            add_newline: Whether to add newline after each write
+
+        Raises:
+            InvalidConfigValueError: If the address or framing is invalid
+            NetworkSendError: If the destination cannot be reached
+        """
+        if framing not in FRAMINGS:
+            raise InvalidConfigValueError("framing", framing, ", ".join(FRAMINGS))
+        self._address = address
+        self._transport, self._sockaddr = parse_address(address)
+        self._stream = self._transport in ("tcp", "unix")
+        if framing == "octet" and not self._stream:
+            raise InvalidConfigValueError(
+                "framing", framing, "newline (datagrams carry one message each)"
+            )
+        self._octet = framing == "octet"
+        self._batch_bytes = max(0, batch_bytes)
+        self._timeout = timeout
+        self._reconnect_attempts = max(0, reconnect_attempts)
+        self._encoding = encoding
+        self._add_newline = add_newline
+        self._logger = get_internal_logger()
+
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._stats = NetworkStats()
+        self._closed = False
+        self._socket: socket.socket | None = None
+        self._connect()
+
+    def _connect(self) -> None:
+        """Open the socket (and connect it, for every transport)."""
+        family = socket.AF_UNIX if self._transport.startswith("unix") else socket.AF_INET
+        if family == socket.AF_INET and ":" in self._sockaddr[0]:  # type: ignore[index]
+            family = socket.AF_INET6
+        kind = socket.SOCK_STREAM if self._stream else socket.SOCK_DGRAM
+        sock = socket.socket(family, kind)
+        sock.settimeout(self._timeout)
+        try:
+            # Connected datagram sockets use send() and report refused ports
+            sock.connect(self._sockaddr)
+        except OSError as e:
+            sock.close()
+            raise NetworkSendError(self._address, f"Cannot connect: {e}")
+        if kind == socket.SOCK_STREAM and family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket = sock
+        self._logger.debug(f"Connected to {self._address}")
+
+    def _reconnect(self, error: OSError) -> None:
+        """Replace a dropped stream connection, backing off between attempts."""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        delay = NETWORK_RECONNECT_DELAY
+        for _ in range(self._reconnect_attempts):
+            time.sleep(delay)
+            delay *= 2
+            try:
+                self._connect()
+            except NetworkSendError:
+                continue
+            self._stats.reconnects += 1
+            self._logger.warning(f"Reconnected to {self._address} after: {error}")
+            return
+        raise NetworkSendError(self._address, f"Connection lost: {error}")
+
+    def _sendmsg(self, buffers: list[bytes]) -> None:
+        """Send buffers on the stream socket, resuming after partial sends."""
+        sock = self._socket
+        if not hasattr(sock, "sendmsg"):  # Windows: no scatter/gather
+            sock.sendall(b"".join(buffers))  # type: ignore[union-attr]
+            self._stats.sends += 1
+            return
+        views = [memoryview(buffer) for buffer in buffers]
+        while views:
+            sent = sock.sendmsg(views[:_MAX_BUFFERS])  # type: ignore[union-attr]
+            self._stats.sends += 1
+            # Drop what was sent, keeping the unsent tail of a partial buffer
+            while sent and views:
+                size = len(views[0])
+                if sent >= size:
+                    sent -= size
+                    views.pop(0)
+                else:
+                    views[0] = views[0][sent:]
+                    sent = 0
+
+    def _send_pending(self) -> None:
+        """Send the collected stream data, reconnecting once it fails."""
+        if not self._pending:
+            return
+        buffers = self._pending
+        self._pending = []
+        self._pending_size = 0
+        started = time.perf_counter()
+        try:
+            self._sendmsg(buffers)
+        except TimeoutError as e:
+            raise NetworkSendError(self._address, f"Send timed out: {e}")
+        except OSError as e:
+            # The whole batch is resent: the receiver may see part of it twice
+            self._reconnect(e)
+            try:
+                self._sendmsg(buffers)
+            except OSError as retry_error:
+                raise NetworkSendError(self._address, str(retry_error))
+        finally:
+            self._stats.send_seconds += time.perf_counter() - started
+
+    def _send_datagrams(self, messages: list[bytes]) -> None:
+        """Send one datagram per message."""
+        send = self._socket.send  # type: ignore[union-attr]
+        started = time.perf_counter()
+        for message in messages:
+            try:
+                send(message)
+            except OSError as e:
+                if e.errno not in _DROPPED_ERRNOS:
+                    raise NetworkSendError(self._address, str(e))
+                self._stats.dropped += 1
+        self._stats.sends += len(messages)
+        self._stats.send_seconds += time.perf_counter() - started
+
+    def write(self, content: str) -> None:
+        """
+        Send content, one message per line.
+
+        Args:
+            content: The formatted content to send; every newline ends a
+                message, so multi-line entries are split into fragments
+        """
+        if self._closed:
+            return
+
+        if self._add_newline and not content.endswith("\n"):
+            content = content + "\n"
+        data = content.encode(self._encoding)
+        stats = self._stats
+
+        if self._stream and not self._octet:
+            # Newline framing: the content is already the wire format
+            stats.messages += content.count("\n")
+            stats.bytes += len(data)
+            self._pending.append(data)
+            self._pending_size += len(data)
+        else:
+            messages = data.split(b"\n")
+            messages.pop()  # after the final newline
+            stats.messages += len(messages)
+            if not self._stream:
+                stats.bytes += sum(map(len, messages))
+                self._send_datagrams(messages)
+                return
+            framed = b"".join([b"%d %s" % (len(message), message) for message in messages])
+            self._pending.append(framed)
+            self._pending_size += len(framed)
+            stats.bytes += len(framed)
+
+        if self._pending_size >= self._batch_bytes:
+            self._send_pending()
+
+    def flush(self) -> None:
+        """Send the collected stream data."""
+        if not self._closed:
+            self._send_pending()
+
+    def close(self) -> None:
+        """Send what is left and close the socket."""
+        if self._closed:
+            return
+        try:
+            self._send_pending()
+        finally:
+            self._closed = True
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+        stats = self._stats
+        self._logger.debug(
+            f"Closed {self._address}: {stats.messages} messages, {stats.bytes} bytes in "
+            f"{stats.sends} sends ({stats.send_seconds:.3f}s), {stats.dropped} dropped, "
+            f"{stats.reconnects} reconnects"
+        )
+
+    @property
+    def stats(self) -> NetworkStats:
+        """Get the send counters."""
+        return self._stats
+
+    @property
+    def address(self) -> str:
+        """Get the destination URL."""
+        return self._address
+
+    def __repr__(self) -> str:
+        framing = "octet" if self._octet else "newline"
+        return f"SocketOutputHandler(address={self._address!r}, framing={framing!r})"
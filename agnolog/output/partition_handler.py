@@ -0,0 +1,360 @@
+"""
+Partitioned directory output for data lakes.
+
+Entries are written under Hive-style partition directories taken from
+their category and simulated timestamp:
+
+    out/category=AUTH/date=2026-01-01/hour=13/part-00000.ndjson
+
+Rows are buffered per partition and written with one formatted write;
+a bounded LRU keeps the most recently used part files open. On close a
+manifest (_manifest.json) lists every part file with its row count, and
+the row count of each partition, so loaders can plan without scanning.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import quote
+
+from agnolog.core.constants import (
+    COMPRESSION_EXTENSIONS,
+    FILE_ENCODING,
+    PARTITION_BUFFER_ROWS,
+    PARTITION_MANIFEST,
+    PARTITION_MAX_BUFFERED_ROWS,
+    PARTITION_MAX_OPEN_FILES,
+)
+from agnolog.core.errors import FileWriteError, PermissionDeniedError
+from agnolog.core.types import LogEntry
+from agnolog.formatters.base import BaseFormatter
+from agnolog.formatters.json_formatter import JSONFormatter
+from agnolog.logutils import get_internal_logger
+from agnolog.output.compression import CompressedWriter, check_codec
+
+
+@dataclass(slots=True)
+class Partition:
+    """One category/date/hour partition and its part files."""
+
+    category: str
+    date: str
+    hour: int
+    directory: Path
+    buffer: list[LogEntry] = field(default_factory=list)
+    rows: int = 0
+    # Row counts of the part files, in order; the last one is being written
+    parts: list[int] = field(default_factory=lambda: [0])
+
+    @property
+    def values(self) -> dict[str, str]:
+        """Get the partition column values."""
+        return {"category": self.category, "date": self.date, "hour": f"{self.hour:02d}"}
+
+
+class PartitionedFileHandler:
+    """
+    Write log entries into category=/date=/hour= partition directories.
+
+    Takes entries rather than formatted strings, so it is not a
+    BaseOutputHandler. Part files are overwritten on first use, so a
+    directory reused between runs only mixes in files this run does not
+    write (the manifest lists only this run's files).
+
+    Usage:
+        with PartitionedFileHandler("lake/events") as handler:
+            handler.write_entries(entries)
+
+        handler = PartitionedFileHandler(
+            "lake/events", formatter=TextFormatter(), extension=".log",
+            max_rows_per_file=1_000_000, compression="zstd",
+        )
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        formatter: BaseFormatter | None = None,
+        extension: str = ".ndjson",
+        max_rows_per_file: int | None = None,
+        max_open_files: int = PARTITION_MAX_OPEN_FILES,
+        buffer_rows: int = PARTITION_BUFFER_ROWS,
+        max_buffered_rows: int = PARTITION_MAX_BUFFERED_ROWS,
+        encoding: str = FILE_ENCODING,
+        compression: str | None = None,
+        compression_level: int | None = None,
+    ) -> None:
+        """
+        Initialize partitioned output.
+
+        Args:
+            directory: Root directory of the partitions (created if needed)
+            formatter: Formatter rendering the lines (default JSONFormatter())
+            extension: Part file extension (the codec's is appended)
+            max_rows_per_file: Rows per part file before part-N+1 (None: no limit)
+            max_open_files: Part files kept open; the least recently used is closed
+            buffer_rows: Rows buffered per partition before a write
+            max_buffered_rows: Rows buffered across partitions before the
+                largest buffer is written early
+            encoding: File encoding
+            compression: Codec ("gzip", "zstd", "lz4"; None for plain text)
+            compression_level: Codec level (codec default if None)
+
+        Raises:
+            InvalidConfigValueError: If the codec is unknown
+            MissingDependencyError: If the codec's package is not installed
+            ValueError: If a limit is not positive
+        """
+        limits = (max_open_files, buffer_rows, max_buffered_rows, max_rows_per_file or 1)
+        if min(limits) < 1:
+            raise ValueError("Partition file and buffer limits must be positive")
+        if compression is not None:
+            check_codec(compression)
+
+        self._directory = Path(directory)
+        self._formatter = formatter or JSONFormatter()
+        self._extension = extension + COMPRESSION_EXTENSIONS.get(compression or "", "")
+        self._max_rows_per_file = max_rows_per_file
+        self._max_open_files = max_open_files
+        self._buffer_rows = buffer_rows
+        self._max_buffered_rows = max_buffered_rows
+        self._encoding = encoding
+        self._compression = compression
+        self._compression_level = compression_level
+        self._logger = get_internal_logger()
+
+        # (category, year, month, day, hour) -> partition
+        self._partitions: dict[tuple[str, int, int, int, int], Partition] = {}
+        self._buffered = 0
+        self._open: OrderedDict[Path, BinaryIO] = OrderedDict()
+        self._created: set[Path] = set()
+        self._entry_count = 0
+        self._closed = False
+
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        except PermissionError:
+            raise PermissionDeniedError(str(self._directory), "create directory")
+        except OSError as e:
+            raise FileWriteError(str(self._directory), f"Cannot create directory: {e}")
+
+    def _partition(self, entry: LogEntry) -> Partition:
+        """Get (or create) the partition of an entry."""
+        ts = entry.timestamp
+        key = (entry.category, ts.year, ts.month, ts.day, ts.hour)
+        partition = self._partitions.get(key)
+        if partition is None:
+            date = f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d}"
+            # Hive escaping: partition values may not contain path separators
+            directory = (
+                self._directory
+                / f"category={quote(entry.category, safe='')}"
+                / f"date={date}"
+                / f"hour={ts.hour:02d}"
+            )
+            partition = self._partitions[key] = Partition(entry.category, date, ts.hour, directory)
+        return partition
+
+    def part_path(self, partition: Partition, part: int) -> Path:
+        """
+        Get the path of a partition's part file.
+
+        Args:
+            partition: Partition
+            part: Part number (0-based)
+
+        Returns:
+            Path of the part file
+        """
+        return partition.directory / f"part-{part:05d}{self._extension}"
+
+    def _file(self, path: Path) -> BinaryIO:
+        """Get an open part file, evicting the least recently used one."""
+        file = self._open.get(path)
+        if file is not None:
+            self._open.move_to_end(path)
+            return file
+
+        # First use truncates (a rerun must not append); reopening appends
+        mode = "ab" if path in self._created else "wb"
+        try:
+            if mode == "wb":
+                path.parent.mkdir(parents=True, exist_ok=True)
+            raw = open(path, mode)
+        except PermissionError:
+            raise PermissionDeniedError(str(path), "write")
+        except OSError as e:
+            raise FileWriteError(str(path), str(e))
+        self._created.add(path)
+        if self._compression is None:
+            file = raw
+        else:
+            # One thread per file: many part files may be open at once
+            file = CompressedWriter(  # type: ignore[assignment]
+                raw, codec=self._compression, level=self._compression_level, threads=1
+            )
+
+        self._open[path] = file
+        if len(self._open) > self._max_open_files:
+            self._close_file(next(iter(self._open)))
+        return file
+
+    def _close_file(self, path: Path) -> None:
+        """Close an open part file."""
+        file = self._open.pop(path)
+        try:
+            file.close()
+        except OSError as e:
+            raise FileWriteError(str(path), str(e))
+
+    def _flush_partition(self, partition: Partition) -> None:
+        """Write a partition's buffered rows, starting new parts as they fill."""
+        entries = partition.buffer
+        if not entries:
+            return
+        partition.buffer = []
+        self._buffered -= len(entries)
+
+        limit = self._max_rows_per_file
+        start = 0
+        while start < len(entries):
+            if limit is not None and partition.parts[-1] >= limit:
+                path = self.part_path(partition, len(partition.parts) - 1)
+                if path in self._open:
+                    self._close_file(path)
+                partition.parts.append(0)
+            room = len(entries) - start
+            if limit is not None:
+                room = min(room, limit - partition.parts[-1])
+            chunk = entries[start : start + room]
+            path = self.part_path(partition, len(partition.parts) - 1)
+            data = self._formatter.format_lines(chunk).encode(self._encoding)
+            try:
+                self._file(path).write(data)
+            except OSError as e:
+                raise FileWriteError(str(path), str(e))
+            partition.parts[-1] += len(chunk)
+            partition.rows += len(chunk)
+            start += room
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Buffer entries into their partitions, writing full buffers.
+
+        Args:
+            entries: Log entries to write
+        """
+        if self._closed:
+            return
+        buffer_rows = self._buffer_rows
+        for entry in entries:
+            partition = self._partition(entry)
+            partition.buffer.append(entry)
+            self._buffered += 1
+            if len(partition.buffer) >= buffer_rows:
+                self._flush_partition(partition)
+        self._entry_count += len(entries)
+
+        while self._buffered > self._max_buffered_rows:
+            largest = max(self._partitions.values(), key=lambda p: len(p.buffer))
+            self._flush_partition(largest)
+
+    def write_entry(self, entry: LogEntry) -> None:
+        """
+        Write a single entry.
+
+        Args:
+            entry: Log entry to write
+        """
+        self.write_entries([entry])
+
+    def manifest(self) -> dict[str, object]:
+        """
+        Describe the written partitions and part files.
+
+        Returns:
+            Manifest with total rows, per-partition rows and per-file rows
+            (paths relative to the root directory)
+        """
+        partitions = []
+        for partition in sorted(
+            self._partitions.values(), key=lambda p: (p.category, p.date, p.hour)
+        ):
+            if not partition.rows:
+                continue
+            files = [
+                {
+                    "path": self.part_path(partition, part).relative_to(self._directory).as_posix(),
+                    "rows": rows,
+                }
+                for part, rows in enumerate(partition.parts)
+                if rows
+            ]
+            partitions.append({**partition.values, "rows": partition.rows, "files": files})
+        return {
+            "format": self._extension.lstrip("."),
+            "partition_columns": ["category", "date", "hour"],
+            "rows": sum(partition["rows"] for partition in partitions),  # type: ignore[misc]
+            "partitions": partitions,
+        }
+
+    def _write_manifest(self) -> None:
+        """Write the manifest atomically at the root directory."""
+        path = self._directory / PARTITION_MANIFEST
+        temp = path.with_name(path.name + ".tmp")
+        try:
+            with open(temp, "w", encoding=FILE_ENCODING) as f:
+                json.dump(self.manifest(), f, indent=2)
+                f.write("\n")
+            os.replace(temp, path)
+        except PermissionError:
+            raise PermissionDeniedError(str(path), "write")
+        except OSError as e:
+            raise FileWriteError(str(path), str(e))
+
+    def close(self) -> None:
+        """Write the buffered rows, close every part file and write the manifest."""
+        if self._closed:
+            return
+        self._closed = True
+        for partition in self._partitions.values():
+            self._flush_partition(partition)
+        while self._open:
+            self._close_file(next(iter(self._open)))
+        self._write_manifest()
+        self._logger.debug(
+            f"Closed partitioned output: {self._directory} "
+            f"({self._entry_count} entries, {len(self._created)} files)"
+        )
+
+    @property
+    def directory(self) -> Path:
+        """Get the root directory."""
+        return self._directory
+
+    @property
+    def paths(self) -> list[Path]:
+        """Get the part files written."""
+        return sorted(self._created)
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries written."""
+        return self._entry_count
+
+    def __enter__(self) -> "PartitionedFileHandler":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"PartitionedFileHandler(directory={self._directory!r}, "
+            f"partitions={len(self._partitions)}, open_files={len(self._open)})"
+        )
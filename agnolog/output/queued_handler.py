@@ -0,0 +1,165 @@
+"""
+Background writer thread for output handlers.
+
+QueuedOutputHandler puts formatted chunks on a bounded queue that a
+writer thread drains into another handler. File and pipe writes release
+the GIL, so they overlap with generation and formatting on the main
+thread; the bound keeps memory flat when the destination is slower.
+
+Queue metrics (WriterStats) show whether the output stage keeps up:
+the high-water mark is the deepest the queue got, and stalls count the
+writes that had to wait for room.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+from agnolog.core.constants import WRITER_QUEUE_CHUNKS
+from agnolog.output.base import BaseOutputHandler
+
+# Queue item telling the writer thread to stop
+_STOP = object()
+
+
+@dataclass(slots=True)
+class WriterStats:
+    """Metrics of a QueuedOutputHandler queue."""
+
+    capacity: int
+    chunks: int = 0
+    high_water_mark: int = 0
+    stalls: int = 0
+    stall_seconds: float = 0.0
+
+
+class QueuedOutputHandler(BaseOutputHandler):
+    """
+    Output handler that writes through another handler on a background thread.
+
+    Errors raised by the wrapped handler are re-raised on the next
+    write, flush or close.
+
+    Usage:
+        handler = QueuedOutputHandler(FileOutputHandler("logs/server.log"))
+        handler.write(formatter.format_lines(chunk))
+        handler.close()  # drains the queue, then closes the file
+        handler.stats.high_water_mark
+    """
+
+    def __init__(self, handler: BaseOutputHandler, max_chunks: int = WRITER_QUEUE_CHUNKS) -> None:
+        """
+        Initialize the handler and start its writer thread.
+
+        Args:
+            handler: Handler receiving the writes (closed with this one)
+            max_chunks: Queue capacity in writes; writers block when it is full
+        """
+        if max_chunks < 1:
+            raise ValueError(f"Queue capacity must be positive, got {max_chunks}")
+        self._handler = handler
+        self._queue: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self._stats = WriterStats(capacity=max_chunks)
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="agnolog-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Writer thread: drain the queue into the wrapped handler."""
+        get = self._queue.get
+        done = self._queue.task_done
+        while True:
+            item = get()
+            try:
+                if item is _STOP:
+                    return
+                if self._error is None:
+                    if isinstance(item, list):
+                        self._handler.write_batch(item)
+                    else:
+                        self._handler.write(item)
+            except BaseException as e:
+                # Keep draining so producers never block on a dead writer
+                self._error = e
+            finally:
+                done()
+
+    def _raise_error(self) -> None:
+        """Re-raise a failure of the writer thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _put(self, item: object) -> None:
+        """Queue an item, recording the depth and any wait for room."""
+        self._raise_error()
+        stats = self._stats
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            started = time.perf_counter()
+            self._queue.put(item)
+            stats.stalls += 1
+            stats.stall_seconds += time.perf_counter() - started
+        stats.chunks += 1
+        depth = self._queue.qsize()
+        if depth > stats.high_water_mark:
+            stats.high_water_mark = depth
+
+    def write(self, content: str) -> None:
+        """
+        Queue content for the writer thread.
+
+        Args:
+            content: The formatted content to write
+        """
+        if not self._closed:
+            self._put(content)
+
+    def write_batch(self, contents: list[str]) -> None:
+        """
+        Queue several strings as one item.
+
+        Args:
+            contents: List of formatted content strings
+        """
+        if not self._closed and contents:
+            self._put(list(contents))
+
+    def flush(self) -> None:
+        """Wait until every queued write has been handed to the wrapped handler."""
+        if self._closed:
+            return
+        self._queue.join()
+        self._raise_error()
+        flush = getattr(self._handler, "flush", None)
+        if flush is not None:
+            flush()
+
+    def close(self) -> None:
+        """Drain the queue, stop the writer thread and close the wrapped handler."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._handler.close()
+        self._raise_error()
+
+    @property
+    def stats(self) -> WriterStats:
+        """Get the queue metrics."""
+        return self._stats
+
+    @property
+    def handler(self) -> BaseOutputHandler:
+        """Get the wrapped handler."""
+        return self._handler
+
+    def __repr__(self) -> str:
+        return (
+            f"QueuedOutputHandler({self._handler!r}, "
+            f"high_water_mark={self._stats.high_water_mark}/{self._stats.capacity})"
+        )
@@ -0,0 +1,368 @@
+"""
+Segmented file output: one file per time period and/or line count.
+
+Segments are named after the log time of their entries, like the hourly
+or daily files real servers produce, and are never renamed:
+
+    logs/server.log -> logs/server-2026-01-01_13.log   (interval="hour")
+                       logs/server-2026-01-01_13-0002.log  (+ max_lines)
+
+A closed segment is finished (final compression block, fsync, close) on
+a background thread while the next one is written, and retention
+deletes the oldest segment instead of shifting a numbered chain.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from agnolog.core.constants import COMPRESSION_EXTENSIONS, FILE_ENCODING, ROTATION_INTERVALS
+from agnolog.core.errors import (
+    DirectoryNotFoundError,
+    FileWriteError,
+    InvalidConfigValueError,
+    PermissionDeniedError,
+)
+from agnolog.core.types import LogEntry
+from agnolog.formatters.base import BaseFormatter
+from agnolog.formatters.text_formatter import TextFormatter
+from agnolog.logutils import get_internal_logger
+from agnolog.output.compression import CompressedWriter, check_codec
+
+_INTERVAL_LENGTHS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+def period_start(timestamp: datetime, interval: str) -> datetime:
+    """
+    Get the start of the rotation period containing a timestamp.
+
+    Args:
+        timestamp: Log timestamp
+        interval: "minute", "hour" or "day"
+
+    Returns:
+        The timestamp truncated to the interval
+    """
+    start = timestamp.replace(second=0, microsecond=0)
+    if interval != "minute":
+        start = start.replace(minute=0)
+    if interval == "day":
+        start = start.replace(hour=0)
+    return start
+
+
+class SegmentedFileHandler:
+    """
+    Write log entries to segment files rotated by log time and/or line count.
+
+    Takes entries rather than formatted strings (the period comes from
+    each entry's timestamp), so it is not a BaseOutputHandler. Entries
+    are expected in time order; an entry from an earlier period reopens
+    that period (appending to its file, or a new part with max_lines).
+
+    Usage:
+        with SegmentedFileHandler("logs/server.log", interval="hour") as handler:
+            handler.write_entries(entries)
+
+        handler = SegmentedFileHandler(
+            "logs/server.log.gz", interval=None, max_lines=100_000,
+            compression="gzip", max_files=24,
+        )
+    """
+
+    def __init__(
+        self,
+        path: str,
+        formatter: BaseFormatter | None = None,
+        interval: str | None = "hour",
+        max_lines: int | None = None,
+        max_files: int | None = None,
+        encoding: str = FILE_ENCODING,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        compression_threads: int | None = None,
+        fsync: bool = False,
+        create_dirs: bool = True,
+    ) -> None:
+        """
+        Initialize segmented file handler.
+
+        Args:
+            path: Base path; segment names insert the period and part
+                before its extension
+            formatter: Formatter rendering the lines (default TextFormatter())
+            interval: Time rotation: "minute", "hour", "day" or None
+            max_lines: Lines per segment before a new part starts (None: no limit)
+            max_files: Segments kept on disk; older ones are deleted (None: all)
+            encoding: File encoding
+            compression: Codec ("gzip", "zstd", "lz4"; None for plain text)
+            compression_level: Codec level (codec default if None)
+            compression_threads: Compression threads per segment (default: CPU count, capped)
+            fsync: Whether to fsync each segment when it is closed
+            create_dirs: Whether to create the parent directory if needed
+
+        Raises:
+            InvalidConfigValueError: If the interval or codec is unknown
+            MissingDependencyError: If the codec's package is not installed
+            ValueError: If neither interval nor max_lines is set, or a limit
+                is not positive
+        """
+        if interval is not None and interval not in ROTATION_INTERVALS:
+            raise InvalidConfigValueError("interval", interval, ", ".join(ROTATION_INTERVALS))
+        if interval is None and max_lines is None:
+            raise ValueError("Segments need an interval, max_lines or both")
+        if (max_lines is not None and max_lines < 1) or (max_files is not None and max_files < 1):
+            raise ValueError("max_lines and max_files must be positive")
+        if compression is not None:
+            check_codec(compression)
+
+        self._path = Path(path)
+        self._formatter = formatter or TextFormatter()
+        self._interval = interval
+        self._max_lines = max_lines
+        self._max_files = max_files
+        self._encoding = encoding
+        self._compression = compression
+        self._compression_level = compression_level
+        self._compression_threads = compression_threads
+        self._fsync = fsync
+        self._logger = get_internal_logger()
+
+        # Segment names: <stem>-<period>-<part><suffix>, suffix keeps the codec extension
+        name = self._path.name
+        extension = COMPRESSION_EXTENSIONS.get(compression or "", "")
+        if extension and name.endswith(extension):
+            name = name[: -len(extension)]
+        self._stem = Path(name).stem
+        self._suffix = Path(name).suffix + extension
+
+        self._file: BinaryIO | None = None
+        self._segment_path: Path | None = None
+        self._period: datetime | None = None
+        self._period_end: datetime | None = None
+        self._lines = 0
+        self._parts: dict[datetime | None, int] = {}
+        self._segments: deque[Path] = deque()
+        self._paths: list[Path] = []
+        self._opened: set[Path] = set()
+        self._entry_count = 0
+        self._closed = False
+
+        # One worker finishes closed segments in order
+        self._finisher = ThreadPoolExecutor(1, thread_name_prefix="agnolog-segment")
+        self._finishing: deque[Future[None]] = deque()
+
+        if create_dirs:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+            except PermissionError:
+                raise PermissionDeniedError(str(self._path.parent), "create directory")
+            except OSError as e:
+                raise FileWriteError(str(self._path), f"Cannot create directory: {e}")
+        if not self._path.parent.exists():
+            raise DirectoryNotFoundError(str(self._path.parent))
+
+    def segment_path(self, period: datetime | None, part: int) -> Path:
+        """
+        Get the file path of a segment.
+
+        Args:
+            period: Start of the segment's time period (None without interval)
+            part: Part number within the period (1-based)
+
+        Returns:
+            Path of the segment file
+        """
+        fields = [self._stem]
+        if period is not None and self._interval is not None:
+            fields.append(period.strftime(ROTATION_INTERVALS[self._interval]))
+        if self._max_lines is not None:
+            fields.append(f"{part:04d}")
+        return self._path.with_name("-".join(fields) + self._suffix)
+
+    def _open_segment(self, period: datetime | None) -> None:
+        """Close the current segment and open the next one."""
+        self._close_segment()
+
+        part = self._parts.get(period, 0) + 1
+        self._parts[period] = part
+        path = self.segment_path(period, part)
+        if path in self._opened:
+            # Reopened period: its previous handle must be closed first
+            self._wait_finishing()
+        try:
+            raw = open(path, "ab")
+        except PermissionError:
+            raise PermissionDeniedError(str(path), "write")
+        except OSError as e:
+            raise FileWriteError(str(path), str(e))
+        if self._compression is None:
+            self._file = raw
+        else:
+            self._file = CompressedWriter(  # type: ignore[assignment]
+                raw,
+                codec=self._compression,
+                level=self._compression_level,
+                threads=self._compression_threads,
+            )
+
+        self._segment_path = path
+        self._period = period
+        self._period_end = (
+            period + _INTERVAL_LENGTHS[self._interval]
+            if period is not None and self._interval is not None
+            else None
+        )
+        self._lines = 0
+        if path not in self._opened:
+            self._opened.add(path)
+            self._paths.append(path)
+            self._segments.append(path)
+        self._logger.debug(f"Opened segment: {path}")
+
+        # Retention: drop the oldest segments once they are finished
+        while self._max_files is not None and len(self._segments) > self._max_files:
+            self._finishing.append(self._finisher.submit(self._remove, self._segments.popleft()))
+
+    def _close_segment(self) -> None:
+        """Hand the current segment to the background finisher."""
+        if self._file is None:
+            return
+        self._finishing.append(
+            self._finisher.submit(self._finish, self._file, self._segment_path, self._lines)
+        )
+        self._file = None
+        # Collect finished work so errors surface and the deque stays short
+        while self._finishing and self._finishing[0].done():
+            self._finishing.popleft().result()
+
+    def _wait_finishing(self) -> None:
+        """Wait for all background finishing, re-raising its errors."""
+        while self._finishing:
+            self._finishing.popleft().result()
+
+    def _finish(self, file: BinaryIO, path: Path, lines: int) -> None:
+        """Finisher thread: flush, optionally fsync, and close a segment."""
+        try:
+            file.flush()
+            if self._fsync:
+                os.fsync(file.fileno())
+            file.close()
+        except OSError as e:
+            raise FileWriteError(str(path), str(e))
+        self._logger.debug(f"Closed segment: {path} ({lines} lines)")
+
+    def _remove(self, path: Path) -> None:
+        """Finisher thread: delete a segment past the retention limit."""
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            self._logger.warning(f"Cannot remove old segment {path}: {e}")
+
+    def _write(self, entries: list[LogEntry]) -> None:
+        """Format a run of entries for the current segment and write it once."""
+        data = self._formatter.format_lines(entries).encode(self._encoding)
+        try:
+            self._file.write(data)  # type: ignore[union-attr]
+        except OSError as e:
+            raise FileWriteError(str(self._segment_path), str(e))
+        self._lines += len(entries)
+        self._entry_count += len(entries)
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Write entries, starting new segments at period and line limits.
+
+        Consecutive entries of one segment are formatted and written together.
+
+        Args:
+            entries: Log entries in time order
+        """
+        if self._closed:
+            return
+        interval = self._interval
+        max_lines = self._max_lines
+        start = 0
+        count = len(entries)
+        while start < count:
+            entry = entries[start]
+            timestamp = entry.timestamp
+            if self._file is None or (
+                interval is not None and not self._period <= timestamp < self._period_end  # type: ignore[operator]
+            ):
+                period = period_start(timestamp, interval) if interval is not None else None
+                self._open_segment(period)
+            elif max_lines is not None and self._lines >= max_lines:
+                self._open_segment(self._period)
+
+            # Extend the run while entries stay in this segment
+            end = start + 1
+            limit = count if max_lines is None else min(count, start + max_lines - self._lines)
+            if interval is None:
+                end = limit
+            else:
+                period, period_end = self._period, self._period_end
+                while end < limit and period <= entries[end].timestamp < period_end:  # type: ignore
+                    end += 1
+            self._write(entries[start:end])
+            start = end
+
+    def write_entry(self, entry: LogEntry) -> None:
+        """
+        Write a single entry.
+
+        Args:
+            entry: Log entry to write
+        """
+        self.write_entries([entry])
+
+    def close(self) -> None:
+        """Close the open segment and wait for background finishing."""
+        if self._closed:
+            return
+        self._closed = True
+        self._close_segment()
+        try:
+            self._wait_finishing()
+        finally:
+            self._finisher.shutdown(wait=True)
+        self._logger.debug(
+            f"Closed segmented output: {self._path} "
+            f"({self._entry_count} entries, {len(self._paths)} segments)"
+        )
+
+    @property
+    def path(self) -> Path:
+        """Get the base file path."""
+        return self._path
+
+    @property
+    def paths(self) -> list[Path]:
+        """Get the segment files written, in order (including removed ones)."""
+        return list(self._paths)
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries written."""
+        return self._entry_count
+
+    def __enter__(self) -> "SegmentedFileHandler":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"SegmentedFileHandler(path={self._path!r}, interval={self._interval!r}, "
+            f"max_lines={self._max_lines})"
+        )
@@ -5,8 +5,10 @@ Useful for console output and piping to other tools.
 """
 
 import sys
+import time
 from typing import TextIO
 
+from agnolog.core.constants import FILE_ENCODING
 from agnolog.output.base import BaseOutputHandler
 
 
@@ -18,11 +20,18 @@ class StreamOutputHandler(BaseOutputHandler):
     - Configurable stream (stdout by default)
     - Optional line ending control
     - Flush control for real-time output
+    - Buffered mode for piping: writes collected up to a size, flushed by
+      size or time interval, optionally as pre-encoded bytes
 
     Usage:
         handler = StreamOutputHandler()  # stdout
         handler = StreamOutputHandler(sys.stderr)  # stderr
         handler.write("log entry")
+
+        # High-throughput stdout for pipes
+        handler = StreamOutputHandler(
+            auto_flush=False, buffer_size=65536, flush_interval=1.0, binary=True
+        )
     """
 
     def __init__(
@@ -30,6 +39,9 @@ class StreamOutputHandler(BaseOutputHandler):
         stream: TextIO | None = None,
         add_newline: bool = True,
         auto_flush: bool = True,
+        buffer_size: int = 0,
+        flush_interval: float | None = None,
+        binary: bool = False,
     ) -> None:
         """
         Initialize stream output handler.
@@ -38,11 +50,44 @@ class StreamOutputHandler(BaseOutputHandler):
             stream: Output stream (defaults to stdout)
             add_newline: Whether to add newline after each write
             auto_flush: Whether to flush after each write
+            buffer_size: Characters collected before writing them to the
+                stream in one call (0 writes through on every write)
+            flush_interval: Seconds after which pending content is written
+                and the stream flushed, checked on each write (None: by
+                size only)
+            binary: Write bytes encoded with the stream's encoding to its
+                binary buffer (e.g. sys.stdout.buffer) when it has one
         """
         self._stream = stream or sys.stdout
         self._add_newline = add_newline
         self._auto_flush = auto_flush
+        self._buffer_size = max(0, buffer_size)
+        self._flush_interval = flush_interval
         self._closed = False
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._last_flush = time.monotonic()
+
+        self._binary = getattr(self._stream, "buffer", None) if binary else None
+        self._encoding = getattr(self._stream, "encoding", None) or FILE_ENCODING
+        self._errors = getattr(self._stream, "errors", None) or "strict"
+        if self._binary is not None:
+            # Text already written to the stream must come out first
+            self._stream.flush()
+
+    def _emit(self, content: str) -> None:
+        """Hand content to the stream (or its binary buffer)."""
+        if self._binary is not None:
+            self._binary.write(content.encode(self._encoding, self._errors))
+        else:
+            self._stream.write(content)
+
+    def _drain(self) -> None:
+        """Write the pending content in one call."""
+        if self._pending:
+            self._emit("".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
 
     def write(self, content: str) -> None:
         """
@@ -57,10 +102,21 @@ class StreamOutputHandler(BaseOutputHandler):
         if self._add_newline and not content.endswith("\n"):
             content = content + "\n"
 
-        self._stream.write(content)
+        if self._buffer_size:
+            self._pending.append(content)
+            self._pending_size += len(content)
+            if self._pending_size >= self._buffer_size:
+                self._drain()
+        else:
+            self._emit(content)
 
         if self._auto_flush:
-            self._stream.flush()
+            self.flush()
+        elif (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
 
     def close(self) -> None:
         """
@@ -70,13 +126,18 @@ class StreamOutputHandler(BaseOutputHandler):
         should not be closed).
         """
         if not self._closed:
-            self._stream.flush()
+            self.flush()
             self._closed = True
 
     def flush(self) -> None:
-        """Flush the stream."""
+        """Write pending content and flush the stream."""
         if not self._closed:
-            self._stream.flush()
+            self._drain()
+            if self._binary is not None:
+                self._binary.flush()
+            else:
+                self._stream.flush()
+            self._last_flush = time.monotonic()
 
     def __repr__(self) -> str:
         stream_name = getattr(self._stream, "name", str(self._stream))
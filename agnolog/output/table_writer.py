@@ -0,0 +1,472 @@
+"""
+Merge-group tables: one output table per merge group.
+
+A generator's `merge_groups` name the tables its entries could share
+(see --show-merge-groups). MergeGroupTableWriter routes every entry to
+the table of each of its merge groups, while ungrouped log types get a
+table of their own. Each table is written to its own file under one
+directory, as CSV, NDJSON or Parquet, ready for bulk loading.
+
+Table columns are fixed up front from sample entries of the member log
+types:
+- timestamp, type, severity, category, server_id, session_id
+- the union of the members' data fields
+- extra: JSON object of fields outside that schema
+
+Rows are buffered per table and written in bulk.
+"""
+
+import csv
+import json
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from agnolog.core.constants import (
+    DEFAULT_JSON_BACKEND,
+    FILE_ENCODING,
+    TABLE_BUFFER_ROWS,
+    TABLE_FORMATS,
+    TABLE_SCHEMA_SAMPLES,
+    THEME_NAMESPACE_SEPARATOR,
+)
+from agnolog.core.errors import (
+    DirectoryNotFoundError,
+    FileWriteError,
+    PermissionDeniedError,
+    UnsupportedFormatError,
+)
+from agnolog.core.factory import LogFactory
+from agnolog.core.registry import LogTypeRegistry, get_registry
+from agnolog.core.types import LogEntry
+from agnolog.formatters.columnar_formatter import (
+    ENTRY_COLUMNS,
+    EXTRA_COLUMN,
+    ColumnarFormatter,
+    data_columns,
+    value_to_text,
+)
+from agnolog.formatters.json_backends import get_json_encoder
+from agnolog.logutils import get_internal_logger
+from agnolog.output.columnar_handler import ColumnarFileHandler
+
+# Characters kept in table file names
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Data values CSV and JSON write as-is; others become text
+_CSV_NATIVE = frozenset({str, int, float, bool, type(None)})
+_JSON_NATIVE = _CSV_NATIVE | {list, dict}
+
+
+class EntrySink(Protocol):
+    """Anything taking log entries in bulk (table sinks, ColumnarFileHandler)."""
+
+    def write_entries(self, entries: list[LogEntry], /) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def sample_entries(
+    factory: LogFactory,
+    log_types: Iterable[str],
+    count: int = TABLE_SCHEMA_SAMPLES,
+    timestamp: datetime | None = None,
+) -> dict[str, list[LogEntry]]:
+    """
+    Generate example entries of each log type, to fix table columns.
+
+    Args:
+        factory: Factory generating the entries
+        log_types: Log types to sample
+        count: Entries per log type (optional fields may be missing in some)
+        timestamp: Timestamp for the samples (now if None)
+
+    Returns:
+        Sample entries by log type
+    """
+    timestamp = timestamp or datetime.now()
+    samples: dict[str, list[LogEntry]] = {}
+    for log_type in log_types:
+        entries = (factory.create(log_type, timestamp=timestamp) for _ in range(count))
+        samples[log_type] = [entry for entry in entries if entry is not None]
+    return samples
+
+
+class RowTableSink(ABC):
+    """
+    Buffered table file with a fixed column list.
+
+    Subclasses write rows of a format; rows are kept as Python values
+    until `buffer_rows` of them are ready, then written in one call.
+    """
+
+    extension = ""
+
+    def __init__(
+        self,
+        path: Path,
+        samples: list[LogEntry],
+        buffer_rows: int = TABLE_BUFFER_ROWS,
+    ) -> None:
+        """
+        Initialize the sink and open its file.
+
+        Args:
+            path: Output file path (overwritten)
+            samples: Entries whose data fields become columns
+            buffer_rows: Rows buffered before a write
+
+        Raises:
+            PermissionDeniedError: If the file cannot be written
+            FileWriteError: If the file cannot be opened
+        """
+        keys = dict.fromkeys(key for entry in samples for key in entry.data)
+        columns = data_columns(keys)
+        self._path = path
+        self._keys = [key for _, key in columns]
+        self._known = frozenset(self._keys)
+        self.columns = [*ENTRY_COLUMNS, *(name for name, _ in columns), EXTRA_COLUMN]
+        self._buffer_rows = max(1, buffer_rows)
+        self._rows: list[list[Any]] = []
+        self.row_count = 0
+        try:
+            self._file = open(path, "w", encoding=FILE_ENCODING, newline="")
+        except PermissionError:
+            raise PermissionDeniedError(str(path), "write")
+        except OSError as e:
+            raise FileWriteError(str(path), str(e))
+
+    def _row(self, entry: LogEntry) -> list[Any]:
+        """Get the column values of an entry (extra as a dict or None)."""
+        data = entry.data
+        row = [
+            entry.timestamp.isoformat(),
+            entry.log_type,
+            entry.severity.name,
+            entry.category,
+            entry.server_id or None,
+            entry.session_id or None,
+        ]
+        row.extend([data.get(key) for key in self._keys])
+        if data.keys() <= self._known:
+            row.append(None)
+        else:
+            row.append({key: value for key, value in data.items() if key not in self._known})
+        return row
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Buffer entries as rows, writing when the buffer is full.
+
+        Args:
+            entries: Log entries of this table
+        """
+        self._rows.extend([self._row(entry) for entry in entries])
+        if len(self._rows) >= self._buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows."""
+        if not self._rows:
+            return
+        try:
+            self._write_rows(self._rows)
+        except OSError as e:
+            raise FileWriteError(str(self._path), str(e))
+        self.row_count += len(self._rows)
+        self._rows = []
+
+    @abstractmethod
+    def _write_rows(self, rows: list[list[Any]]) -> None:
+        """Write rows to the file."""
+        pass
+
+    def close(self) -> None:
+        """Write the buffered rows and close the file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={str(self._path)!r})"
+
+
+class CSVTableSink(RowTableSink):
+    """
+    Table written as CSV with a header row.
+
+    Usage:
+        sink = CSVTableSink(Path("tables/server_state.csv"), samples)
+        sink.write_entries(entries)
+        sink.close()
+    """
+
+    extension = ".csv"
+
+    def __init__(
+        self, path: Path, samples: list[LogEntry], buffer_rows: int = TABLE_BUFFER_ROWS
+    ) -> None:
+        """Open the file and write the header (arguments as RowTableSink)."""
+        super().__init__(path, samples, buffer_rows)
+        self._writer = csv.writer(self._file, lineterminator="\n")
+        self._writer.writerow(self.columns)
+
+    def _write_rows(self, rows: list[list[Any]]) -> None:
+        """Write rows through the csv writer, as text cells."""
+        first = len(ENTRY_COLUMNS)
+        for row in rows:
+            if not _CSV_NATIVE.issuperset(map(type, row[first:-1])):
+                row[first:-1] = [
+                    value if type(value) in _CSV_NATIVE else value_to_text(value)
+                    for value in row[first:-1]
+                ]
+            if row[-1] is not None:
+                row[-1] = json.dumps(row[-1], default=str, ensure_ascii=False)
+        self._writer.writerows(rows)
+
+
+class NDJSONTableSink(RowTableSink):
+    """
+    Table written as NDJSON, every object carrying every column.
+
+    Usage:
+        sink = NDJSONTableSink(Path("tables/server_state.ndjson"), samples)
+        sink.write_entries(entries)
+        sink.close()
+    """
+
+    extension = ".ndjson"
+
+    def __init__(
+        self,
+        path: Path,
+        samples: list[LogEntry],
+        buffer_rows: int = TABLE_BUFFER_ROWS,
+        json_backend: str = DEFAULT_JSON_BACKEND,
+    ) -> None:
+        """
+        Open the file.
+
+        Args:
+            path: Output file path (overwritten)
+            samples: Entries whose data fields become columns
+            buffer_rows: Rows buffered before a write
+            json_backend: JSON serializer ("auto", "orjson", "msgspec", "stdlib")
+        """
+        super().__init__(path, samples, buffer_rows)
+        _, self._encode = get_json_encoder(json_backend)
+
+    def _write_rows(self, rows: list[list[Any]]) -> None:
+        """Write rows as one pre-joined block of JSON lines."""
+        columns = self.columns
+        encode = self._encode
+        lines = []
+        first = len(ENTRY_COLUMNS)
+        for row in rows:
+            if not _JSON_NATIVE.issuperset(map(type, row[first:-1])):
+                row[first:-1] = [
+                    value if type(value) in _JSON_NATIVE else value_to_text(value)
+                    for value in row[first:-1]
+                ]
+            lines.append(encode(dict(zip(columns, row))))
+        lines.append("")
+        self._file.write("\n".join(lines))
+
+
+class MergeGroupTableWriter:
+    """
+    Route entries to one table per merge group.
+
+    Usage:
+        samples = sample_entries(factory, scheduler.get_enabled_types())
+        with MergeGroupTableWriter("tables", "parquet", samples=samples) as writer:
+            writer.write_entries(entries)
+        writer.paths  # {"server_state": Path("tables/server_state.parquet"), ...}
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        table_format: str = "csv",
+        registry: LogTypeRegistry | None = None,
+        samples: dict[str, list[LogEntry]] | None = None,
+        buffer_rows: int = TABLE_BUFFER_ROWS,
+        json_backend: str = DEFAULT_JSON_BACKEND,
+    ) -> None:
+        """
+        Initialize the writer and create its directory.
+
+        Args:
+            directory: Directory receiving one file per table
+            table_format: "csv", "ndjson" or "parquet"
+            registry: Log type registry for merge groups (uses singleton if None)
+            samples: Sample entries by log type, fixing each table's columns
+            buffer_rows: Rows buffered per CSV/NDJSON table before a write
+            json_backend: JSON serializer for NDJSON tables
+
+        Raises:
+            UnsupportedFormatError: If the format is unknown
+            ConfigurationError: If the format or JSON backend is unavailable
+        """
+        if table_format not in TABLE_FORMATS:
+            raise UnsupportedFormatError(table_format, list(TABLE_FORMATS))
+        if table_format == "parquet":
+            # Fail before generating anything when pyarrow is missing
+            ColumnarFormatter(registry)
+        else:
+            get_json_encoder(json_backend)
+
+        self._directory = Path(directory)
+        self._format = table_format
+        self._registry = registry or get_registry()
+        self._samples = samples or {}
+        self._buffer_rows = buffer_rows
+        self._json_backend = json_backend
+        self._tables: dict[str, tuple[str, ...]] = {}
+        self._sinks: dict[str, EntrySink] = {}
+        self._paths: dict[str, Path] = {}
+        self._names: set[str] = set()
+        self._entry_count = 0
+        self._closed = False
+        self._logger = get_internal_logger()
+
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        except PermissionError:
+            raise PermissionDeniedError(str(self._directory), "create directory")
+        except OSError as e:
+            raise FileWriteError(str(self._directory), f"Cannot create directory: {e}")
+        if not self._directory.is_dir():
+            raise DirectoryNotFoundError(str(self._directory))
+
+    def tables_for(self, log_type: str) -> tuple[str, ...]:
+        """
+        Get the tables an entry of a log type goes to.
+
+        Args:
+            log_type: Log type name
+
+        Returns:
+            Its merge groups (namespaced like the log type), or the log type itself
+        """
+        tables = self._tables.get(log_type)
+        if tables is None:
+            metadata = self._registry.get_metadata(log_type)
+            groups = metadata.merge_groups if metadata else ()
+            if not groups:
+                tables = (log_type,)
+            else:
+                namespace, separator, _ = log_type.rpartition(THEME_NAMESPACE_SEPARATOR)
+                tables = tuple(f"{namespace}{separator}{group}" for group in groups)
+            self._tables[log_type] = tables
+        return tables
+
+    def _file_name(self, table: str) -> str:
+        """Get a file name for a table, distinct from every other table's."""
+        base = _UNSAFE_NAME.sub("_", table)
+        name = base
+        # Sanitising maps e.g. "a:b" and "a_b" to one name; case-insensitive
+        # file systems also merge names differing only in case
+        suffix = 1
+        while name.lower() in self._names:
+            suffix += 1
+            name = f"{base}-{suffix}"
+        self._names.add(name.lower())
+        return name
+
+    def _open_sink(self, table: str) -> EntrySink:
+        """Create the sink of a table from its members' samples."""
+        samples = [
+            entry
+            for log_type, entries in self._samples.items()
+            if table in self.tables_for(log_type)
+            for entry in entries
+        ]
+        name = self._file_name(table)
+        if self._format == "parquet":
+            path = self._directory / f"{name}.parquet"
+            # Row groups keep their own (larger) size
+            formatter = ColumnarFormatter(self._registry, sample=samples)
+            sink: EntrySink = ColumnarFileHandler(str(path), "parquet", formatter=formatter)
+        elif self._format == "ndjson":
+            path = self._directory / f"{name}{NDJSONTableSink.extension}"
+            sink = NDJSONTableSink(path, samples, self._buffer_rows, self._json_backend)
+        else:
+            path = self._directory / f"{name}{CSVTableSink.extension}"
+            sink = CSVTableSink(path, samples, self._buffer_rows)
+        self._sinks[table] = sink
+        self._paths[table] = path
+        self._logger.debug(f"Opened table {table}: {path}")
+        return sink
+
+    def write(self, entry: LogEntry) -> None:
+        """
+        Route one entry to its tables.
+
+        Args:
+            entry: Log entry to write
+        """
+        self.write_entries([entry])
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Route entries to their tables, one bulk call per table.
+
+        Args:
+            entries: Log entries to write
+        """
+        if self._closed:
+            return
+        routed: dict[str, list[LogEntry]] = {}
+        for entry in entries:
+            for table in self.tables_for(entry.log_type):
+                rows = routed.get(table)
+                if rows is None:
+                    rows = routed[table] = []
+                rows.append(entry)
+        for table, rows in routed.items():
+            sink = self._sinks.get(table) or self._open_sink(table)
+            sink.write_entries(rows)
+        self._entry_count += len(entries)
+
+    def close(self) -> None:
+        """Flush and close every table, then re-raise the first failure."""
+        if self._closed:
+            return
+        self._closed = True
+        first_error: Exception | None = None
+        for sink in self._sinks.values():
+            try:
+                sink.close()
+            except Exception as e:
+                first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+
+    @property
+    def paths(self) -> dict[str, Path]:
+        """Get the file of each table written so far."""
+        return dict(self._paths)
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries routed."""
+        return self._entry_count
+
+    def __enter__(self) -> "MergeGroupTableWriter":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"MergeGroupTableWriter(directory={str(self._directory)!r}, "
+            f"format={self._format!r}, tables={len(self._sinks)})"
+        )
@@ -0,0 +1,221 @@
+"""
+Fan-out of one generated entry stream to several sinks.
+
+TeeHandler hands each chunk of entries to every sink's worker thread
+through its own bounded queue, so entries are generated once however
+many outputs they go to. A sink is either:
+- a (formatter, handler) pair: the worker formats the chunk and writes
+  it with one handler.write(), or
+- an entry-based handler (with write_entries, e.g. ColumnarFileHandler,
+  LoghubFileHandler, HttpBulkHandler), given the chunk as is.
+
+A slow sink fills its queue and blocks the producer, so memory stays
+bounded; WriterStats per sink show which one holds the stream back.
+Sinks only read the entries they share.
+"""
+
+import queue
+import threading
+import time
+from typing import Any
+
+from agnolog.core.constants import WRITER_QUEUE_CHUNKS
+from agnolog.core.types import LogEntry
+from agnolog.formatters.base import BaseFormatter
+from agnolog.output.queued_handler import WriterStats
+
+# Queue item telling a worker thread to stop
+_STOP = object()
+
+
+class _SinkWorker:
+    """One sink of a TeeHandler: its queue, worker thread and metrics."""
+
+    def __init__(self, formatter: BaseFormatter | None, handler: Any, max_chunks: int) -> None:
+        if formatter is None and not hasattr(handler, "write_entries"):
+            raise ValueError(f"{handler!r} takes formatted strings: pair it with a formatter")
+        self.formatter = formatter
+        self.handler = handler
+        self.queue: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self.stats = WriterStats(capacity=max_chunks)
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(target=self._run, name="agnolog-tee", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        """Worker thread: format and write queued chunks."""
+        get = self.queue.get
+        done = self.queue.task_done
+        if self.formatter is None:
+            write = self.handler.write_entries
+        else:
+            format_lines = self.formatter.format_lines
+            write_content = self.handler.write
+
+            def write(entries: list[LogEntry]) -> None:
+                write_content(format_lines(entries))
+
+        while True:
+            chunk = get()
+            try:
+                if chunk is _STOP:
+                    return
+                if self.error is None:
+                    write(chunk)
+            except BaseException as e:
+                # Keep draining so the producer never blocks on a dead sink
+                self.error = e
+            finally:
+                done()
+
+    def put(self, chunk: object) -> None:
+        """Queue a chunk, recording the depth and any wait for room."""
+        stats = self.stats
+        try:
+            self.queue.put_nowait(chunk)
+        except queue.Full:
+            started = time.perf_counter()
+            self.queue.put(chunk)
+            stats.stalls += 1
+            stats.stall_seconds += time.perf_counter() - started
+        stats.chunks += 1
+        depth = self.queue.qsize()
+        if depth > stats.high_water_mark:
+            stats.high_water_mark = depth
+
+
+class TeeHandler:
+    """
+    Write one stream of log entries to several sinks, each on its own thread.
+
+    Takes entries rather than formatted strings (every sink formats its
+    own way), so it is not a BaseOutputHandler. Errors raised by a sink
+    are re-raised on the next write or close; the other sinks keep going
+    until then.
+
+    Usage:
+        with TeeHandler([
+            (JSONFormatter(), FileOutputHandler("out/events.ndjson")),
+            (TextFormatter(), StreamOutputHandler()),
+            LoghubFileHandler("out/server"),
+        ]) as tee:
+            for chunk in scheduler.generate_chunks(start, end):
+                tee.write_entries(chunk)
+    """
+
+    def __init__(
+        self,
+        sinks: list[Any],
+        max_chunks: int = WRITER_QUEUE_CHUNKS,
+    ) -> None:
+        """
+        Initialize the tee and start one worker thread per sink.
+
+        Args:
+            sinks: (formatter, handler) pairs and/or entry-based handlers;
+                every handler is closed with the tee
+            max_chunks: Queue capacity per sink in chunks; writes block
+                while a sink's queue is full
+
+        Raises:
+            ValueError: If there are no sinks, max_chunks is not positive,
+                or a string handler has no formatter
+        """
+        if not sinks:
+            raise ValueError("A tee needs at least one sink")
+        if max_chunks < 1:
+            raise ValueError(f"Queue capacity must be positive, got {max_chunks}")
+        self._workers: list[_SinkWorker] = []
+        for sink in sinks:
+            formatter, handler = sink if isinstance(sink, tuple) else (None, sink)
+            self._workers.append(_SinkWorker(formatter, handler, max_chunks))
+        self._entry_count = 0
+        self._closed = False
+
+    def _raise_error(self) -> None:
+        """Re-raise the first failure of a sink."""
+        for worker in self._workers:
+            if worker.error is not None:
+                error, worker.error = worker.error, None
+                raise error
+
+    def write_entries(self, entries: list[LogEntry]) -> None:
+        """
+        Queue entries for every sink.
+
+        Args:
+            entries: Log entries to write (shared by the sinks, not copied per sink)
+        """
+        if self._closed or not entries:
+            return
+        self._raise_error()
+        # One snapshot: the caller may reuse its list
+        chunk = list(entries)
+        for worker in self._workers:
+            worker.put(chunk)
+        self._entry_count += len(chunk)
+
+    def write_entry(self, entry: LogEntry) -> None:
+        """
+        Write a single entry.
+
+        Args:
+            entry: Log entry to write
+        """
+        self.write_entries([entry])
+
+    def flush(self) -> None:
+        """Wait until every sink has written its queued chunks."""
+        if self._closed:
+            return
+        for worker in self._workers:
+            worker.queue.join()
+        self._raise_error()
+        for worker in self._workers:
+            flush = getattr(worker.handler, "flush", None)
+            if flush is not None:
+                flush()
+
+    def close(self) -> None:
+        """Drain every queue, stop the workers and close every sink."""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.queue.put(_STOP)
+        first_error: BaseException | None = None
+        for worker in self._workers:
+            worker.thread.join()
+            try:
+                worker.handler.close()
+            except Exception as e:
+                first_error = first_error or e
+        self._raise_error()
+        if first_error is not None:
+            raise first_error
+
+    @property
+    def stats(self) -> list[WriterStats]:
+        """Get the queue metrics of each sink, in sink order."""
+        return [worker.stats for worker in self._workers]
+
+    @property
+    def handlers(self) -> list[Any]:
+        """Get the handler of each sink, in sink order."""
+        return [worker.handler for worker in self._workers]
+
+    @property
+    def entry_count(self) -> int:
+        """Get the number of entries written."""
+        return self._entry_count
+
+    def __enter__(self) -> "TeeHandler":
+        """Support context manager protocol."""
+        return self
+
+    def __exit__(self, exc_type: object, exc_val: object, exc_tb: object) -> None:
+        """Ensure close is called on context exit."""
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"TeeHandler(sinks={len(self._workers)}, entries={self._entry_count})"
@@ -10,7 +10,9 @@ import random
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
 
+from agnolog.core.constants import DEFAULT_BATCH_SIZE
 from agnolog.core.factory import LogFactory
 from agnolog.core.registry import LogTypeRegistry, get_registry
 from agnolog.core.types import LogEntry, RecurrencePattern
@@ -217,6 +219,35 @@ class LogScheduler(InternalLoggerMixin):
 
         yield from self.generate_range(start_time, end_time, max_logs=count)
 
+    def generate_chunks(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        max_logs: int | None = None,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[list[LogEntry]]:
+        """
+        Generate logs within a time range in chunks.
+
+        Lets callers format and write a whole chunk at once instead of
+        paying per-entry overhead.
+
+        Args:
+            start_time: Start of time range
+            end_time: End of time range
+            max_logs: Maximum number of logs to generate
+            chunk_size: Maximum entries per chunk
+
+        Yields:
+            Non-empty lists of LogEntry objects in chronological order
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+
+        entries = self.generate_range(start_time, end_time, max_logs=max_logs)
+        while chunk := list(islice(entries, chunk_size)):
+            yield chunk
+
     def generate_one(
         self,
         log_type: str | None = None,
@@ -53,11 +53,12 @@ return {
             end
         end
 
-        -- Use built-in generators for names
-        local username = args.username or ctx.gen.player_name()
-        local char_name = args.char_name or ctx.gen.character_name()
-        local ip = args.ip or ctx.gen.ip_address()
-        local session_id = args.session_id or ctx.gen.session_id()
+        -- Open a session for a pooled player (identities repeat across the run)
+        local session = ctx.entities.login()
+        local username = args.username or session.player.name
+        local char_name = args.char_name or session.player.character_name
+        local ip = args.ip or session.ip
+        local session_id = args.session_id or session.session_id
 
         -- Generate level based on constants
         local max_level = 60
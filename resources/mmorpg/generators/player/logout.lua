@@ -28,14 +28,16 @@ return {
             max_duration = ctx.data.constants.server.session.max_duration_seconds or 28800
         end
 
-        local username = args.username or ctx.gen.player_name()
-        local char_name = args.char_name or ctx.gen.character_name()
+        -- Close one of the sessions opened by player.login
+        local session = ctx.entities.logout()
+        local username = args.username or session.player.name
+        local char_name = args.char_name or session.player.character_name
 
         return {
             username = username,
             char_name = char_name,
             reason = ctx.random.choice(reasons),
-            session_id = args.session_id or ctx.gen.session_id(),
+            session_id = args.session_id or session.session_id,
             session_duration = ctx.random.int(min_duration, max_duration),
             xp_gained = ctx.random.int(0, 50000),
             gold_gained = ctx.random.int(0, 10000),
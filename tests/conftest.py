@@ -45,6 +45,23 @@ def reset_registry():
     LogTypeRegistry.reset()
 
 
+@pytest.fixture
+def isolated_registries():
+    """Give a test fresh log type and Lua registries, restoring the defaults after.
+
+    Needed by tests that load extra themes, which would otherwise leak
+    their generators into the shared registry used by other tests.
+    """
+    from agnolog.core.lua_adapter import LuaGeneratorRegistry
+
+    LogTypeRegistry.reset()
+    LuaGeneratorRegistry.reset()
+    yield LogTypeRegistry()
+    LogTypeRegistry.reset()
+    LuaGeneratorRegistry.reset()
+    _ensure_generators_registered()
+
+
 @pytest.fixture
 def empty_registry(reset_registry):
     """Provide a fresh empty registry."""
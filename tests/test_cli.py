@@ -4,18 +4,32 @@ Tests for agnolog.cli module.
 Tests the command-line interface.
 """
 
+import gzip
 from io import StringIO
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from agnolog.cli import main, parse_categories
+from agnolog.cli import main, parse_cardinality, parse_categories
+from agnolog.scheduling import LogScheduler
 
 # Resources path for testing
 TEST_RESOURCES = str(Path(__file__).parent.parent / "resources" / "mmorpg")
 
 
+def failing_after_first_chunk():
+    """Patch the scheduler so generation raises after its first chunk."""
+    generate_chunks = LogScheduler.generate_chunks
+
+    def fail(self, *args, **kwargs):
+        chunks = generate_chunks(self, *args, **kwargs)
+        yield next(chunks)
+        raise RuntimeError("generation failed")
+
+    return patch.object(LogScheduler, "generate_chunks", fail)
+
+
 class TestParseCategories:
     """Tests for parse_categories function."""
 
@@ -175,6 +189,30 @@ class TestCLIMain:
         result = main(["--resources", TEST_RESOURCES, "-n", "5", "--start-time", "invalid"])
         assert result == 1
 
+    def test_invalid_start_time_keeps_loghub_files(self, populated_registry, tmp_path):
+        """A bad --start-time should fail before an existing loghub corpus is truncated."""
+        prefix = tmp_path / "server"
+        (tmp_path / "server.log").write_text("existing\n")
+
+        with patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                ["--resources", TEST_RESOURCES, "--loghub", str(prefix), "--start-time", "bogus"]
+            )
+
+        assert result == 1
+        assert (tmp_path / "server.log").read_text() == "existing\n"
+        assert not (tmp_path / "server_structured.csv").exists()
+
+    def test_line_buffered(self, populated_registry):
+        """--line-buffered should still write every entry."""
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5", "-f", "ndjson", "--line-buffered"]
+            )
+
+        assert result == 0
+        assert len(mock_stdout.getvalue().splitlines()) == 5
+
     def test_quiet_mode(self, populated_registry, tmp_path):
         """--quiet should suppress non-log output."""
         output_file = tmp_path / "test.log"
@@ -212,6 +250,46 @@ class TestCLIOutputFile:
         content = output_file.read_text()
         assert len(content) > 0
 
+    def test_output_file_mmap(self, populated_registry, tmp_path):
+        """--mmap should write the same lines as a regular file."""
+        output_file = tmp_path / "test.log"
+
+        result = main(["--resources", TEST_RESOURCES, "-n", "30", "-o", str(output_file), "--mmap"])
+
+        assert result == 0
+        assert len(output_file.read_text().splitlines()) == 30
+
+    @pytest.mark.parametrize(
+        "options",
+        [["--rotate", "hour"], ["--rotate-lines", "10"], ["--partitions", "parts"]],
+    )
+    def test_mmap_rejects_other_outputs(self, populated_registry, tmp_path, options):
+        """--mmap should not be silently ignored by segment or partition output."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5", "-o", str(tmp_path / "out.log")]
+                + ["--mmap", *options]
+            )
+
+        assert result == 1
+        assert "--mmap" in mock_stderr.getvalue()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_output_file_mmap_aborted(self, populated_registry, tmp_path):
+        """An aborted --mmap run should truncate the file to the lines written."""
+        output_file = tmp_path / "test.log"
+
+        with failing_after_first_chunk(), patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "100000", "-f", "ndjson"]
+                + ["-o", str(output_file), "--mmap"]
+            )
+
+        assert result == 1
+        content = output_file.read_bytes()
+        assert b"\0" not in content
+        assert len(content.splitlines()) == 1000
+
     def test_output_file_json(self, populated_registry, tmp_path):
         """Should write valid JSON to file."""
         import json
@@ -231,6 +309,395 @@ class TestCLIOutputFile:
                 json.loads(line)  # Should not raise
 
 
+class TestCLIColumnar:
+    """Tests for Parquet/Arrow output."""
+
+    def test_parquet_output(self, populated_registry, tmp_path):
+        """-f parquet should write a Parquet file."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output_file = tmp_path / "logs.parquet"
+
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "50", "-f", "parquet", "-o", str(output_file)]
+        )
+
+        assert result == 0
+        assert pq.read_table(output_file).num_rows == 50
+
+    def test_requires_output_file(self, populated_registry):
+        """Columnar formats cannot be written to stdout."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(["--resources", TEST_RESOURCES, "-n", "5", "-f", "arrow"])
+
+        assert result == 1
+        assert "-o" in mock_stderr.getvalue()
+
+    def test_invalid_start_time_opens_nothing(self, populated_registry, tmp_path):
+        """A bad --start-time should fail before the output file is created."""
+        output_file = tmp_path / "logs.parquet"
+
+        with patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                [
+                    "--resources",
+                    TEST_RESOURCES,
+                    "-f",
+                    "parquet",
+                    "-o",
+                    str(output_file),
+                    "--start-time",
+                    "bogus",
+                ]
+            )
+
+        assert result == 1
+        assert not output_file.exists()
+
+    def test_aborted_run_closes_file(self, populated_registry, tmp_path):
+        """An error during generation should still leave a readable file."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output_file = tmp_path / "logs.parquet"
+
+        with failing_after_first_chunk(), patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                [
+                    "--resources",
+                    TEST_RESOURCES,
+                    "-n",
+                    "5000",
+                    "-f",
+                    "parquet",
+                    "-o",
+                    str(output_file),
+                ]
+            )
+
+        assert result == 1
+        assert 0 < pq.read_table(output_file).num_rows < 5000
+
+
+class TestCLITables:
+    """Tests for --tables."""
+
+    def test_tables_per_merge_group(self, populated_registry, tmp_path):
+        """Should write one CSV per merge group, covering every entry."""
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "200", "--tables", str(tmp_path), "--quiet"]
+        )
+
+        assert result == 0
+        tables = list(tmp_path.glob("*.csv"))
+        assert tables
+        rows = sum(len(path.read_text().splitlines()) - 1 for path in tables)
+        assert rows >= 200
+
+    def test_sampling_does_not_change_entries(self, populated_registry, tmp_path):
+        """Schema samples should not advance the seeded run."""
+        import json
+
+        args = ["--resources", TEST_RESOURCES, "-n", "100", "--seed", "3", "--quiet"]
+        args += ["--start-time", "2024-01-01T00:00:00", "-f", "ndjson"]
+        main(args + ["-o", str(tmp_path / "plain.ndjson")])
+        main(args + ["--tables", str(tmp_path / "tables"), "--table-format", "ndjson"])
+
+        plain = {json.loads(line)["timestamp"] for line in open(tmp_path / "plain.ndjson")}
+        tables = {
+            json.loads(line)["timestamp"]
+            for path in (tmp_path / "tables").glob("*.ndjson")
+            for line in open(path)
+        }
+        assert tables == plain
+
+
+class TestCLICompression:
+    """Tests for --compress."""
+
+    def test_gzip_output_file(self, populated_registry, tmp_path):
+        """-o with --compress gzip should write a gzip file with the .gz extension."""
+        import gzip
+
+        output_file = tmp_path / "test.log"
+
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "20", "-o", str(output_file)]
+            + ["--compress", "gzip", "--quiet"]
+        )
+
+        assert result == 0
+        assert not output_file.exists()
+        lines = gzip.decompress((tmp_path / "test.log.gz").read_bytes()).decode().splitlines()
+        assert len(lines) == 20
+
+    def test_gzip_loghub(self, populated_registry, tmp_path):
+        """--loghub with --compress should compress all three files."""
+        import gzip
+
+        prefix = tmp_path / "run"
+
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "20", "--loghub", str(prefix)]
+            + ["--compress", "gzip", "--quiet"]
+        )
+
+        assert result == 0
+        for name in ("run.log.gz", "run_structured.csv.gz", "run_templates.csv.gz"):
+            assert gzip.decompress((tmp_path / name).read_bytes())
+
+    def test_requires_output_file(self, populated_registry):
+        """stdout output cannot be compressed."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(["--resources", TEST_RESOURCES, "-n", "5", "--compress", "gzip"])
+
+        assert result == 1
+        assert "--compress" in mock_stderr.getvalue()
+
+
+class TestCLIRotation:
+    """Tests for --rotate and --rotate-lines."""
+
+    def test_rotate_lines(self, populated_registry, tmp_path):
+        """--rotate-lines should split -o into numbered parts."""
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "25", "-f", "ndjson"]
+            + ["-o", str(tmp_path / "out.log"), "--rotate-lines", "10", "--quiet"]
+        )
+
+        assert result == 0
+        parts = sorted(tmp_path.glob("out-*.log"))
+        assert [len(path.read_text().splitlines()) for path in parts] == [10, 10, 5]
+
+    def test_rotate_requires_output_file(self, populated_registry):
+        """Rotation needs -o."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(["--resources", TEST_RESOURCES, "-n", "5", "--rotate", "hour"])
+
+        assert result == 1
+        assert "-o" in mock_stderr.getvalue()
+
+    def test_aborted_run_finishes_segment(self, populated_registry, tmp_path):
+        """An error during generation should still finish the open compressed segment."""
+        with failing_after_first_chunk(), patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5000", "-f", "ndjson", "--compress", "gzip"]
+                + ["-o", str(tmp_path / "out.log"), "--rotate-lines", "600"]
+            )
+
+        assert result == 1
+        parts = sorted(tmp_path.glob("out-*.log.gz"))
+        lines = sum(len(gzip.decompress(path.read_bytes()).splitlines()) for path in parts)
+        assert lines == 1000
+
+
+class TestCLIPartitions:
+    """Tests for --partitions."""
+
+    def test_partitions_with_manifest(self, populated_registry, tmp_path):
+        """Should write partition directories and a manifest covering every entry."""
+        import json
+
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "50", "--partitions", str(tmp_path), "--quiet"]
+        )
+
+        assert result == 0
+        manifest = json.loads((tmp_path / "_manifest.json").read_text())
+        assert manifest["rows"] == 50
+        parts = list(tmp_path.glob("category=*/date=*/hour=*/part-*.ndjson"))
+        assert sum(len(path.read_text().splitlines()) for path in parts) == 50
+
+    def test_aborted_run_writes_manifest(self, populated_registry, tmp_path):
+        """An error during generation should still flush partitions and write the manifest."""
+        import json
+
+        with failing_after_first_chunk(), patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5000", "--partitions", str(tmp_path)]
+            )
+
+        assert result == 1
+        manifest = json.loads((tmp_path / "_manifest.json").read_text())
+        assert manifest["rows"] == 1000
+        parts = list(tmp_path.glob("category=*/date=*/hour=*/part-*.ndjson"))
+        assert sum(len(path.read_text().splitlines()) for path in parts) == 1000
+
+
+class TestCLISend:
+    """Tests for --send and --syslog."""
+
+    def test_send_syslog_over_tcp(self, populated_registry):
+        """--send with --syslog should deliver octet-counted RFC 5424 messages."""
+        import socket
+        import threading
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        received = []
+
+        def serve():
+            conn, _ = server.accept()
+            with conn:
+                while data := conn.recv(65536):
+                    received.append(data)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        url = f"tcp://127.0.0.1:{server.getsockname()[1]}"
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "20", "--send", url, "--syslog", "5424"]
+            + ["--quiet"]
+        )
+        thread.join(5)
+        server.close()
+
+        assert result == 0
+        data = b"".join(received)
+        messages = 0
+        while data:
+            length, _, rest = data.partition(b" ")
+            assert rest.startswith(b"<")
+            data = rest[int(length) :]
+            messages += 1
+        assert messages == 20
+
+    def test_send_http_elasticsearch(self, populated_registry):
+        """--send with an http:// URL should post _bulk batches."""
+        import gzip
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        bodies = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                bodies.append(gzip.decompress(self.rfile.read(int(self.headers["Content-Length"]))))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/_bulk"
+        try:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "30", "--send", url, "--http-gzip"]
+                + ["--http-header", "Authorization: ApiKey abc", "--quiet"]
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert result == 0
+        assert sum(len(body.splitlines()) for body in bodies) == 60
+
+    def test_send_rejects_output_file(self, populated_registry, tmp_path):
+        """--send replaces file output."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5", "-o", str(tmp_path / "out.log")]
+                + ["--send", "udp://127.0.0.1:514"]
+            )
+
+        assert result == 1
+        assert "--send" in mock_stderr.getvalue()
+
+    def test_send_rejects_pretty(self, populated_registry):
+        """Indented JSON would be sent as one fragment per line."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "2", "-f", "json", "--pretty"]
+                + ["--send", "udp://127.0.0.1:514"]
+            )
+
+        assert result == 1
+        assert "--pretty" in mock_stderr.getvalue()
+
+    def test_send_unreachable(self, populated_registry):
+        """An invalid destination should be reported, not raised."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(["--resources", TEST_RESOURCES, "-n", "5", "--send", "ftp://x:21"])
+
+        assert result == 1
+        assert "address" in mock_stderr.getvalue()
+
+
+class TestCLITee:
+    """Tests for --tee."""
+
+    def test_tee_to_several_formats(self, populated_registry, tmp_path):
+        """One generated stream should be written in every requested format."""
+        import csv
+        import json
+
+        result = main(
+            ["--resources", TEST_RESOURCES, "-n", "40", "--seed", "7", "--quiet"]
+            + ["--tee", f"ndjson:{tmp_path / 'out.ndjson'}"]
+            + ["--tee", f"text:{tmp_path / 'out.log'}"]
+            + ["--tee", f"loghub:{tmp_path / 'hub'}"]
+        )
+
+        assert result == 0
+        documents = [
+            json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()
+        ]
+        text_lines = (tmp_path / "out.log").read_text().splitlines()
+        rows = list(csv.DictReader((tmp_path / "hub_structured.csv").open()))
+        assert len(documents) == len(text_lines) == len(rows) == 40
+        # Same entries: the text sink and loghub's Content column render identically
+        assert text_lines == (tmp_path / "hub.log").read_text().splitlines()
+        assert (tmp_path / "hub_templates.csv").exists()
+
+    def test_tee_aborted_run_closes_sinks(self, populated_registry, tmp_path):
+        """An error during generation should still drain and close every sink."""
+        with failing_after_first_chunk(), patch("sys.stderr", new_callable=StringIO):
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5000"]
+                + ["--tee", f"ndjson:{tmp_path / 'out.ndjson'}"]
+                + ["--tee", f"loghub:{tmp_path / 'hub'}"]
+            )
+
+        assert result == 1
+        assert len((tmp_path / "out.ndjson").read_text().splitlines()) == 1000
+        assert (tmp_path / "hub_templates.csv").exists()
+
+    def test_tee_invalid_spec(self, populated_registry):
+        """Unknown formats and missing destinations should be reported."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(["--resources", TEST_RESOURCES, "-n", "5", "--tee", "xml:out.xml"])
+
+        assert result == 1
+        assert "FORMAT:DEST" in mock_stderr.getvalue()
+
+    def test_tee_rejects_shared_destination(self, populated_registry, tmp_path):
+        """Two sinks may not write the same file (loghub writes PREFIX.log)."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5"]
+                + ["--tee", f"text:{tmp_path / 'out.log'}", "--tee", f"loghub:{tmp_path / 'out'}"]
+            )
+
+        assert result == 1
+        assert "destination" in mock_stderr.getvalue()
+
+    def test_tee_rejects_output_file(self, populated_registry, tmp_path):
+        """--tee replaces -o."""
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            result = main(
+                ["--resources", TEST_RESOURCES, "-n", "5", "-o", str(tmp_path / "out.log")]
+                + ["--tee", "text:-"]
+            )
+
+        assert result == 1
+        assert "--tee" in mock_stderr.getvalue()
+
+
 class TestCLIPrettyPrint:
     """Tests for pretty print option."""
 
@@ -299,3 +766,95 @@ class TestCLITimeOptions:
         """--time-scale should affect timing."""
         result = main(["--resources", TEST_RESOURCES, "-n", "5", "--time-scale", "2.0"])
         assert result == 0
+
+
+class TestCLIMixedThemes:
+    """Tests for mixing several themes into one stream."""
+
+    RESOURCES_ROOT = Path(__file__).parent.parent / "resources"
+
+    def test_repeated_resources_interleave_themes(self, isolated_registries):
+        """Repeated --resources should emit namespaced types from every theme."""
+        import json
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            result = main(
+                [
+                    "--resources",
+                    str(self.RESOURCES_ROOT / "mmorpg"),
+                    "--resources",
+                    str(self.RESOURCES_ROOT / "windows11"),
+                    "-n",
+                    "200",
+                    "-f",
+                    "ndjson",
+                    "--seed",
+                    "7",
+                ]
+            )
+
+        assert result == 0
+        entries = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        # Some generators emit their own "type" data field, which shadows the log type
+        namespaces = {entry["type"].split(":", 1)[0] for entry in entries if ":" in entry["type"]}
+        assert namespaces == {"mmorpg", "windows11"}
+        timestamps = [entry["timestamp"] for entry in entries]
+        assert timestamps == sorted(timestamps)
+
+    def test_duplicate_theme_rejected(self, isolated_registries):
+        """The same theme twice should be an error."""
+        with patch("sys.stderr", new_callable=StringIO):
+            result = main(["--resources", TEST_RESOURCES, "--resources", TEST_RESOURCES])
+
+        assert result == 1
+
+
+class TestCLICardinality:
+    """Tests for --cardinality."""
+
+    def test_parse_size_and_exponent(self):
+        """Should parse FIELD=SIZE:ZIPF_S."""
+        assert parse_cardinality(["ip_address=500:1.2"]) == {"ip_address": (500, 1.2)}
+
+    def test_parse_default_exponent(self):
+        """Exponent should be optional."""
+        field, (size, _) = next(iter(parse_cardinality(["session_id=20"]).items()))
+        assert (field, size) == ("session_id", 20)
+
+    def test_parse_invalid_raises(self):
+        """Malformed specs should raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_cardinality(["ip_address"])
+        with pytest.raises(ValueError):
+            parse_cardinality(["ip_address=many"])
+
+    def test_bounds_generated_values(self, isolated_registries):
+        """Generated IPs should be limited to the requested cardinality."""
+        import json
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            result = main(
+                [
+                    "--resources",
+                    TEST_RESOURCES,
+                    "-n",
+                    "200",
+                    "-f",
+                    "ndjson",
+                    "--types",
+                    "player.login",
+                    "--cardinality",
+                    "ip_address=3",
+                ]
+            )
+
+        assert result == 0
+        ips = {json.loads(line)["ip"] for line in mock_stdout.getvalue().splitlines()}
+        assert len(ips) <= 3
+
+    def test_unknown_field_fails(self, isolated_registries):
+        """Unknown fields should be an error."""
+        with patch("sys.stderr", new_callable=StringIO):
+            result = main(["--resources", TEST_RESOURCES, "-n", "1", "--cardinality", "nope=5"])
+
+        assert result == 1
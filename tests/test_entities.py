@@ -0,0 +1,154 @@
+"""
+Tests for agnolog.core.entities module.
+
+Tests Zipf sampling and the player/host/session entity pools.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from agnolog.core.entities import CardinalityPool, EntityPool, ZipfSampler
+from agnolog.core.lua_runtime import LuaGeneratorError, LuaGeneratorUtils
+
+
+@pytest.fixture
+def pool():
+    """Small entity pool backed by generic (data-less) generator utilities."""
+    random.seed(1234)
+    return EntityPool(
+        LuaGeneratorUtils({}),
+        {"players": {"size": 50}, "hosts": {"size": 5}, "sessions": {"max_active": 10}},
+    )
+
+
+class TestZipfSampler:
+    """Tests for ZipfSampler."""
+
+    def test_draws_within_range(self):
+        """Should only draw valid indices."""
+        sampler = ZipfSampler(10, 1.2)
+        assert all(0 <= i < 10 for i in sampler.draw_many(1000))
+
+    def test_skewed_towards_low_ranks(self):
+        """Rank 0 should be drawn far more often than the last rank."""
+        random.seed(42)
+        counts = Counter(ZipfSampler(100, 1.1).draw_many(20000))
+        assert counts[0] > 10 * counts[99]
+
+    def test_zero_exponent_is_uniform(self):
+        """s=0 should give roughly uniform draws."""
+        random.seed(42)
+        counts = Counter(ZipfSampler(4, 0.0).draw_many(20000))
+        assert all(4000 < counts[i] < 6000 for i in range(4))
+
+    def test_invalid_size_raises(self):
+        """Size must be positive."""
+        with pytest.raises(ValueError):
+            ZipfSampler(0)
+
+    def test_negative_exponent_raises(self):
+        """Exponent must not be negative."""
+        with pytest.raises(ValueError):
+            ZipfSampler(10, -1.0)
+
+
+class TestEntityPool:
+    """Tests for EntityPool."""
+
+    def test_player_cardinality_is_bounded(self, pool):
+        """Player draws should never exceed the pool size."""
+        names = {pool.player().name for _ in range(2000)}
+        assert len(names) <= 50
+
+    def test_player_is_stable(self, pool):
+        """The same pooled player should always carry the same identity."""
+        player = pool.player()
+        same = [p for p in (pool.player() for _ in range(500)) if p.index == player.index]
+        assert all(p.name == player.name and p.ip == player.ip for p in same)
+
+    def test_hosts_use_prefix(self):
+        """Host names should use the configured prefix."""
+        pool = EntityPool(LuaGeneratorUtils({}), {"hosts": {"size": 3, "prefix": "web"}})
+        assert pool.host().hostname.startswith("web-")
+
+    def test_login_logout_lifecycle(self, pool):
+        """Logout should close a session opened by login."""
+        session = pool.login()
+        assert pool.active_count == 1
+
+        closed = pool.logout()
+
+        assert closed is session
+        assert pool.active_count == 0
+
+    def test_session_reuses_active_session(self, pool):
+        """Actions should happen in already open sessions."""
+        opened = {pool.login().session_id for _ in range(5)}
+        for _ in range(50):
+            assert pool.session().session_id in opened
+
+    def test_max_active_sessions(self, pool):
+        """Open sessions should be capped at max_active."""
+        for _ in range(100):
+            pool.login()
+        assert pool.active_count <= 10
+
+    def test_logout_without_sessions(self, pool):
+        """Logout with nobody online should still return a session."""
+        session = pool.logout()
+        assert session.session_id.startswith("sess_")
+        assert pool.active_count == 0
+
+    def test_seed_reproducibility(self):
+        """Same seed should build the same pool."""
+        names = []
+        for _ in range(2):
+            random.seed(99)
+            pool = EntityPool(LuaGeneratorUtils({}), {"players": {"size": 20}})
+            names.append([pool.player().name for _ in range(10)])
+        assert names[0] == names[1]
+
+
+class TestCardinalityPool:
+    """Tests for CardinalityPool and LuaGeneratorUtils cardinality control."""
+
+    def test_values_bounded_by_size(self):
+        """Draws should come from at most `size` distinct values."""
+        gen = LuaGeneratorUtils({})
+        pool = CardinalityPool(gen.uuid, ZipfSampler(25, 1.0))
+        assert len({pool() for _ in range(5000)}) <= 25
+
+    def test_table_per_argument_combination(self):
+        """Different arguments should get their own value table."""
+        gen = LuaGeneratorUtils({})
+        pool = CardinalityPool(gen.ip_address, ZipfSampler(10, 1.0))
+        internal = {pool(True) for _ in range(500)}
+        assert all(ip.split(".")[0] in ("10", "172", "192") for ip in internal)
+
+    def test_small_value_space(self):
+        """A value space smaller than the size should not loop forever."""
+        pool = CardinalityPool(lambda: "only", ZipfSampler(100, 1.0))
+        assert {pool() for _ in range(100)} == {"only"}
+
+    def test_configure_cardinality(self):
+        """configure_cardinality should bound a ctx.gen helper."""
+        gen = LuaGeneratorUtils({})
+        gen.configure_cardinality("session_id", 5, 1.2)
+        assert len({gen.session_id() for _ in range(1000)}) <= 5
+
+    def test_cardinality_from_data(self):
+        """constants.cardinality data should configure helpers."""
+        gen = LuaGeneratorUtils({"constants": {"cardinality": {"uuid": {"size": 3}}}})
+        assert len({gen.uuid() for _ in range(1000)}) <= 3
+
+    def test_unknown_field_raises(self):
+        """Unknown helpers should be rejected."""
+        with pytest.raises(LuaGeneratorError):
+            LuaGeneratorUtils({}).configure_cardinality("not_a_helper", 10)
+
+    def test_invalid_size_raises(self):
+        """Non-positive sizes should be rejected."""
+        with pytest.raises(LuaGeneratorError):
+            LuaGeneratorUtils({}).configure_cardinality("uuid", 0)
@@ -29,7 +29,9 @@ from agnolog.core.errors import (
     InvalidPatternError,
     LogTypeNotFoundError,
     MissingConfigError,
+    MissingDependencyError,
     MissingFieldError,
+    NetworkSendError,
     # Output
     OutputError,
     PermissionDeniedError,
@@ -104,6 +106,12 @@ class TestConfigurationErrors:
         assert error.key == "timeout"
         assert error.value == -1
 
+    def test_missing_dependency_error(self):
+        error = MissingDependencyError("pyarrow", "Parquet output", extra="columnar")
+        assert isinstance(error, ConfigurationError)
+        assert "pip install agnolog[columnar]" in str(error)
+        assert error.package == "pyarrow"
+
     def test_config_file_error(self):
         error = ConfigFileError("/path/to/config", "File not found")
         assert "/path/to/config" in str(error)
@@ -242,6 +250,12 @@ class TestOutputErrors:
         error = DirectoryNotFoundError("/path/to/dir")
         assert "/path/to/dir" in str(error)
 
+    def test_network_send_error(self):
+        error = NetworkSendError("tcp://collector:514", "Connection refused")
+        assert isinstance(error, OutputError)
+        assert "tcp://collector:514" in str(error)
+        assert error.reason == "Connection refused"
+
 
 class TestSchedulingErrors:
     """Tests for scheduling exceptions."""
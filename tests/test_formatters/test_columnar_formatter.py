@@ -0,0 +1,140 @@
+"""
+Tests for agnolog.formatters.columnar_formatter module.
+
+Tests the ColumnarFormatter record batch builder.
+"""
+
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from agnolog.core.types import LogEntry, LogSeverity  # noqa: E402
+from agnolog.formatters.columnar_formatter import ColumnarFormatter  # noqa: E402
+
+
+class StubRegistry:
+    """Registry stub answering merge groups by log type."""
+
+    def __init__(self, metadata):
+        self._metadata = metadata
+        self._groups = {"server.cpu": ("server_metrics",), "server.memory": ("server_metrics",)}
+
+    def get_metadata(self, name):
+        return replace(self._metadata, name=name, merge_groups=self._groups.get(name, ()))
+
+
+def make_entry(timestamp, log_type="player.login", **data):
+    """Build an entry with the given data fields."""
+    return LogEntry(
+        log_type=log_type,
+        timestamp=timestamp,
+        severity=LogSeverity.INFO,
+        category="PLAYER",
+        data=data,
+        server_id="server-01",
+    )
+
+
+@pytest.fixture
+def formatter(sample_metadata):
+    """Formatter with small row groups."""
+    return ColumnarFormatter(registry=StubRegistry(sample_metadata), row_group_size=3)
+
+
+class TestColumnarFormatter:
+    """Tests for ColumnarFormatter."""
+
+    def test_partition_follows_merge_groups(self, formatter):
+        """Types in a merge group should share a partition."""
+        assert formatter.partition("server.cpu") == "server_metrics"
+        assert formatter.partition("server.memory") == "server_metrics"
+        assert formatter.partition("player.login") == "player.login"
+
+    def test_full_partition_emits_batch(self, formatter, sample_timestamp):
+        """A batch should be emitted once a partition reaches the row group size."""
+        entries = [make_entry(sample_timestamp, user=f"u{i}") for i in range(3)]
+
+        assert formatter.add_batch(entries[:2]) == []
+        batches = formatter.add_batch(entries[2:])
+
+        assert len(batches) == 1
+        assert batches[0].num_rows == 3
+        assert formatter.buffered == 0
+
+    def test_row_groups_hold_one_partition(self, formatter, sample_timestamp):
+        """Each drained batch should contain a single partition."""
+        formatter.add(make_entry(sample_timestamp, "server.cpu", value=1.5))
+        formatter.add(make_entry(sample_timestamp, "server.memory", value=2))
+        formatter.add(make_entry(sample_timestamp, "player.login", user="a"))
+
+        batches = formatter.drain()
+
+        assert sorted(batch.num_rows for batch in batches) == [1, 2]
+        types = [set(batch.column("type").to_pylist()) for batch in batches]
+        assert {"server.cpu", "server.memory"} in types
+
+    def test_schema_types_and_dictionaries(self, formatter, sample_timestamp):
+        """Data columns should be typed and low-cardinality columns dictionary-encoded."""
+        formatter.add(make_entry(sample_timestamp, level=3, ratio=0.5, ok=True, user="a"))
+        schema = formatter.schema
+
+        assert schema.field("level").type == pa.int64()
+        assert schema.field("ratio").type == pa.float64()
+        assert schema.field("ok").type == pa.bool_()
+        assert schema.field("user").type == pa.string()
+        assert pa.types.is_dictionary(schema.field("severity").type)
+        assert pa.types.is_dictionary(schema.field("type").type)
+
+    def test_values_round_trip(self, formatter, sample_timestamp):
+        """Entry and data values should come back unchanged."""
+        entry = make_entry(sample_timestamp, level=3, tags=["a", "b"], type="shadow")
+        formatter.add(entry)
+
+        row = pa.Table.from_batches(formatter.drain()).to_pylist()[0]
+
+        assert row["timestamp"] == sample_timestamp
+        assert row["type"] == "player.login"
+        assert row["severity"] == "INFO"
+        assert row["server_id"] == "server-01"
+        assert row["level"] == 3
+        assert row["tags"] == '["a", "b"]'
+        assert row["data_type"] == "shadow"
+
+    def test_late_fields_go_to_extra(self, formatter, sample_timestamp):
+        """Fields unknown to the fixed schema, or of another type, should land in extra."""
+        formatter.add_batch([make_entry(sample_timestamp, level=i) for i in range(3)])
+        later = make_entry(sample_timestamp + timedelta(seconds=1), level="high", zone="x")
+        formatter.add(later)
+
+        rows = pa.Table.from_batches(formatter.drain()).to_pylist()
+
+        assert rows[0]["level"] is None
+        assert rows[0]["extra"] == '{"level": "high", "zone": "x"}'
+
+    def test_dictionaries_only_grow(self, formatter, sample_timestamp):
+        """Later batches should extend the dictionaries of earlier ones."""
+        first = formatter.add_batch([make_entry(sample_timestamp, "a.one")] * 3)[0]
+        second = formatter.add_batch([make_entry(sample_timestamp, "b.two")] * 3)[0]
+
+        first_values = first.column("type").dictionary.to_pylist()
+        second_values = second.column("type").dictionary.to_pylist()
+        assert second_values[: len(first_values)] == first_values
+
+    def test_sample_fixes_schema(self, sample_metadata, sample_timestamp):
+        """Sample entries should contribute columns without being written."""
+        sample = [make_entry(sample_timestamp, level=1, zone="x")]
+        formatter = ColumnarFormatter(registry=StubRegistry(sample_metadata), sample=sample)
+        formatter.add(make_entry(sample_timestamp, level=2))
+
+        batch = formatter.drain()[0]
+
+        assert batch.num_rows == 1
+        assert batch.schema.field("zone").type == pa.string()
+
+    def test_invalid_row_group_size(self, sample_metadata):
+        """Row group size must be positive."""
+        with pytest.raises(ValueError):
+            ColumnarFormatter(registry=StubRegistry(sample_metadata), row_group_size=0)
@@ -18,7 +18,12 @@ from agnolog.core.types import (
     LogTypeMetadata,
     RecurrencePattern,
 )
-from agnolog.formatters.csv_formatter import LoghubCSVFormatter, template_to_loghub
+from agnolog.formatters.csv_formatter import (
+    LoghubCSVFormatter,
+    LoghubCSVWriter,
+    LoghubEmitter,
+    template_to_loghub,
+)
 from agnolog.generators.base import BaseLogGenerator
 
 
@@ -440,3 +445,68 @@ class TestLoghubCSVFormatterMergeGroups:
 
         assert login_row["MergeGroups"] == "session_events,auth_events"
         assert logout_row["MergeGroups"] == "session_events"
+
+
+class TestLoghubCSVWriter:
+    """Tests for streaming CSV rows."""
+
+    def _entries(self):
+        return [
+            LogEntry(
+                log_type="test.login",
+                timestamp=datetime(2024, 1, 15, 12, 30, 45),
+                severity=LogSeverity.INFO,
+                category="PLAYER",
+                data={"username": f"user,{i}", "ip": "10.0.0.1"},
+            )
+            for i in range(3)
+        ]
+
+    def test_matches_format(self, csv_formatter_registry):
+        """Streamed rows should equal format() rows, one line each."""
+        expected = LoghubCSVFormatter(registry=csv_formatter_registry)
+        formatter = LoghubCSVFormatter(registry=csv_formatter_registry)
+        output = io.StringIO()
+        writer = LoghubCSVWriter(formatter, output)
+
+        writer.write_header()
+        writer.write_batch(self._entries())
+
+        lines = output.getvalue().split("\n")
+        assert lines[0] == expected.format_header()
+        assert lines[1:-1] == [expected.format(e) for e in self._entries()]
+        assert lines[-1] == ""
+
+    def test_prerendered_content(self, formatter):
+        """A supplied Content value should be used as is."""
+        output = io.StringIO()
+        LoghubCSVWriter(formatter, output).write(self._entries()[0], content="pre-rendered")
+
+        row = next(csv.reader(io.StringIO(output.getvalue())))
+        assert row[6] == "pre-rendered"
+        assert row[0] == "1"
+
+
+class TestLoghubEmitter:
+    """Tests for single-pass loghub output."""
+
+    def test_log_line_matches_content_column(self, formatter):
+        """The .log line and the CSV Content should be the same rendering."""
+        log_out, csv_out = io.StringIO(), io.StringIO()
+        emitter = LoghubEmitter(formatter, log_out, csv_out)
+        entry = LogEntry(
+            log_type="test.login",
+            timestamp=datetime(2024, 1, 15, 12, 30, 45),
+            severity=LogSeverity.INFO,
+            category="PLAYER",
+            data={"username": "Ann", "ip": "10.0.0.1"},
+        )
+
+        emitter.write_header()
+        emitter.emit_batch([entry, entry])
+
+        log_lines = log_out.getvalue().splitlines()
+        rows = list(csv.reader(io.StringIO(csv_out.getvalue())))
+        assert log_lines == ["[2024-01-15 12:30:45] LOGIN: Ann from 10.0.0.1"] * 2
+        assert [row[6] for row in rows[1:]] == log_lines
+        assert emitter.count == 2
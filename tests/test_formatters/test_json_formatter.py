@@ -9,7 +9,9 @@ from datetime import datetime
 
 import pytest
 
+from agnolog.core.errors import InvalidConfigValueError
 from agnolog.core.types import LogEntry, LogSeverity
+from agnolog.formatters.json_backends import available_backends, get_json_encoder
 from agnolog.formatters.json_formatter import JSONFormatter
 
 
@@ -133,6 +135,22 @@ class TestJSONFormatterNDJSON:
             # Line should not have indentation
             assert not line.startswith(" ")
 
+    def test_format_lines(self, formatter, sample_log_entries):
+        """Should be the NDJSON batch with a trailing newline."""
+        result = formatter.format_lines(sample_log_entries)
+
+        assert result == "".join(formatter.format(e) + "\n" for e in sample_log_entries)
+
+    def test_format_lines_pretty(self, pretty_formatter, sample_log_entries):
+        """Pretty documents should each end with a newline."""
+        result = pretty_formatter.format_lines(sample_log_entries)
+
+        assert result == "".join(pretty_formatter.format(e) + "\n" for e in sample_log_entries)
+
+    def test_format_lines_empty(self, formatter):
+        """An empty chunk should render nothing."""
+        assert formatter.format_lines([]) == ""
+
 
 class TestJSONFormatterSerialization:
     """Tests for value serialization."""
@@ -250,3 +268,120 @@ class TestJSONFormatterOptions:
         assert "JSONFormatter" in repr(formatter)
         assert "pretty=False" in repr(formatter)
         assert "pretty=True" in repr(pretty_formatter)
+
+
+class TestJSONBackends:
+    """Tests for pluggable JSON serializers."""
+
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_backends_agree(self, backend, sample_log_entry):
+        """Every installed backend should produce the same bytes."""
+        sample_log_entry.data["tags"] = ("a", "b")
+        sample_log_entry.data["when"] = sample_log_entry.timestamp
+
+        for pretty in (False, True):
+            result = JSONFormatter(pretty=pretty, backend=backend).format(sample_log_entry)
+            expected = JSONFormatter(pretty=pretty, backend="stdlib").format(sample_log_entry)
+
+            assert result == expected
+
+    def test_stdlib_output_compact(self, sample_log_entry):
+        """The stdlib backend should write compact separators."""
+        formatter = JSONFormatter(backend="stdlib")
+        expected = json.dumps(
+            formatter._entry_to_dict(sample_log_entry), ensure_ascii=False, separators=(",", ":")
+        )
+
+        assert formatter.format(sample_log_entry) == expected
+
+    def test_auto_falls_back_for_ensure_ascii(self):
+        """ensure_ascii is only supported by the stdlib backend."""
+        assert JSONFormatter(ensure_ascii=True).backend == "stdlib"
+
+    def test_unknown_backend_raises(self):
+        """Unknown backends should be rejected."""
+        with pytest.raises(InvalidConfigValueError):
+            JSONFormatter(backend="simdjson")
+
+    def test_fast_backend_falls_back_on_unencodable_values(self):
+        """Documents a fast backend rejects should be encoded by the stdlib."""
+        _, encode = get_json_encoder("auto")
+        assert json.loads(encode({"big": 1 << 70})) == {"big": 1 << 70}
+
+    def test_flat_values_skip_serialization(self, sample_log_entry, monkeypatch):
+        """Primitive data values should not go through _serialize_value."""
+        formatter = JSONFormatter()
+        calls = []
+        original = formatter._serialize_value
+        monkeypatch.setattr(
+            formatter, "_serialize_value", lambda value: calls.append(value) or original(value)
+        )
+
+        formatter.format(sample_log_entry)
+
+        # Line encoding renders the timestamp itself, so nothing is serialized
+        assert calls == []
+
+
+class TestJSONLineTemplates:
+    """Tests for per-type pre-encoded JSON lines."""
+
+    @pytest.mark.parametrize("backend", available_backends())
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"date_format": "%d/%m/%Y %H:%M"},
+            {"include_metadata": False},
+            {"ensure_ascii": True},
+        ],
+    )
+    def test_matches_dict_encoding(self, backend, options, sample_log_entries):
+        """Spliced lines should be byte-identical to encoding the full dict."""
+        if options.get("ensure_ascii") and backend != "stdlib":
+            pytest.skip("ensure_ascii needs the stdlib backend")
+        formatter = JSONFormatter(backend=backend, **options)
+        for entry in sample_log_entries:
+            entry.data["name"] = "Zoë"
+            entry.data["tags"] = ["a", "b"]
+            entry.data["when"] = entry.timestamp
+            entry.server_id = "srv-1"
+            expected = formatter._encode_line(formatter._entry_to_dict(entry))
+            assert formatter.format(entry) == expected
+
+    @pytest.mark.parametrize("backend", available_backends())
+    def test_fallback_data_keeps_separators(self, backend, sample_log_entry):
+        """Data a fast backend rejects should be spliced with the same separators."""
+        formatter = JSONFormatter(backend=backend)
+        sample_log_entry.data["big"] = 1 << 70
+        sample_log_entry.server_id = "srv-1"
+
+        line = formatter.format(sample_log_entry)
+
+        assert line == JSONFormatter(backend="stdlib").format(sample_log_entry)
+        assert ", " not in line and '": ' not in line
+
+    def test_shadowing_data_key_uses_dict_path(self, formatter, sample_log_entry):
+        """A data field named like a top-level key should still win."""
+        sample_log_entry.data["type"] = "custom"
+
+        assert json.loads(formatter.format(sample_log_entry))["type"] == "custom"
+
+    def test_empty_data(self, formatter, sample_timestamp):
+        """Entries without data should still be valid JSON."""
+        entry = LogEntry(
+            timestamp=sample_timestamp,
+            log_type="server.start",
+            category="SERVER",
+            severity=LogSeverity.INFO,
+            data={},
+        )
+
+        assert json.loads(formatter.format(entry))["category"] == "SERVER"
+
+    def test_templates_cached_per_type(self, formatter, sample_log_entry):
+        """Each (type, severity, category) should be encoded once."""
+        formatter.format(sample_log_entry)
+        formatter.format(sample_log_entry)
+
+        assert len(formatter._line_templates) == 1
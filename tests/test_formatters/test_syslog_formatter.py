@@ -0,0 +1,78 @@
+"""
+Tests for agnolog.formatters.syslog_formatter module.
+
+Tests the SyslogFormatter class.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from agnolog.core.errors import InvalidConfigValueError
+from agnolog.core.types import LogEntry, LogSeverity
+from agnolog.formatters import JSONFormatter, SyslogFormatter
+
+
+@pytest.fixture
+def entry():
+    """Warning entry with a server id."""
+    return LogEntry(
+        log_type="player.login",
+        timestamp=datetime(2024, 1, 5, 12, 30, 45, 123456, tzinfo=timezone.utc),
+        severity=LogSeverity.WARNING,
+        category="PLAYER",
+        data={"username": "TestPlayer"},
+        server_id="srv-1",
+    )
+
+
+class TestSyslogFormatter:
+    """Tests for SyslogFormatter."""
+
+    def test_rfc5424(self, entry):
+        """Should add PRI, version, timestamp, host, app and MSGID headers."""
+        formatter = SyslogFormatter(JSONFormatter())
+
+        message = formatter.format(entry)
+
+        header = "<12>1 2024-01-05T12:30:45.123456+00:00 srv-1 agnolog - player.login - "
+        assert message.startswith(header)
+        assert '"username":"TestPlayer"' in message[len(header) :]
+
+    def test_rfc3164(self, entry):
+        """Should use the BSD header with a space-padded day."""
+        formatter = SyslogFormatter(JSONFormatter(), rfc="3164", facility=16)
+
+        message = formatter.format(entry)
+
+        assert message.startswith("<132>Jan  5 12:30:45 srv-1 agnolog: {")
+
+    def test_hostname_without_server_id(self, entry):
+        """The configured hostname should be used when the entry has no server id."""
+        entry.server_id = None
+        formatter = SyslogFormatter(JSONFormatter(), hostname="game-host")
+
+        assert " game-host agnolog " in formatter.format(entry)
+
+    def test_severity_priorities(self, entry):
+        """PRI should combine the facility with the entry's severity."""
+        formatter = SyslogFormatter(JSONFormatter(), facility=0)
+
+        entry.severity = LogSeverity.CRITICAL
+        assert formatter.format(entry).startswith("<2>")
+        entry.severity = LogSeverity.DEBUG
+        assert formatter.format(entry).startswith("<7>")
+
+    def test_one_line_per_entry(self, entry):
+        """Multi-line bodies should be flattened and batches newline-separated."""
+        formatter = SyslogFormatter(JSONFormatter(pretty=True))
+
+        output = formatter.format_lines([entry, entry])
+
+        assert len(output.splitlines()) == 2
+
+    @pytest.mark.parametrize("kwargs", [{"rfc": "1234"}, {"facility": 24}])
+    def test_invalid_options(self, kwargs):
+        """Should reject unknown RFCs and facilities."""
+        with pytest.raises(InvalidConfigValueError):
+            SyslogFormatter(**kwargs)
@@ -15,7 +15,7 @@ from agnolog.core.types import (
     LogTypeMetadata,
     RecurrencePattern,
 )
-from agnolog.formatters.text_formatter import ColorTextFormatter, TextFormatter
+from agnolog.formatters.text_formatter import ColorTextFormatter, CompiledTemplate, TextFormatter
 from agnolog.generators.base import BaseLogGenerator
 
 
@@ -230,6 +230,18 @@ class TestTextFormatterBatch:
         result = formatter.format_batch([])
         assert result == ""
 
+    def test_format_lines(self, formatter, sample_log_entries):
+        """Should render newline-terminated lines in one buffer."""
+        result = formatter.format_lines(sample_log_entries)
+
+        assert result == "".join(formatter.format(e) + "\n" for e in sample_log_entries)
+
+    def test_format_lines_keeps_trailing_newline(self, formatter, sample_log_entries, monkeypatch):
+        """Lines already ending with a newline should not get another."""
+        monkeypatch.setattr(formatter, "format", lambda entry: f"{entry.log_type}\n")
+
+        assert formatter.format_lines(sample_log_entries[:2]) == "test.type0\ntest.type1\n"
+
 
 class TestColorTextFormatter:
     """Tests for ColorTextFormatter."""
@@ -293,3 +305,56 @@ class TestTextFormatterRepr:
 
         assert "TextFormatter" in result
         assert "timestamp_format" in result
+
+
+class TestCompiledTemplate:
+    """Tests for compiled template rendering."""
+
+    @pytest.fixture
+    def entry(self):
+        return LogEntry(
+            log_type="test.formatted",
+            timestamp=datetime(2024, 1, 15, 12, 30, 45),
+            severity=LogSeverity.INFO,
+            category="PLAYER",
+            data={"username": "Ann", "level": 7, "ratio": 0.5, "online": True},
+            server_id="srv-1",
+        )
+
+    def _render(self, template, entry):
+        formatter = TextFormatter(registry=LogTypeRegistry())
+        compiled = CompiledTemplate.compile(template, formatter._field_getter)
+        assert compiled is not None
+        return compiled.render(entry)
+
+    def test_matches_str_format(self, reset_registry, entry):
+        """Rendering should equal str.format over the full format dict."""
+        formatter = TextFormatter(registry=LogTypeRegistry())
+        template = "[{timestamp}] {severity} {username!r} lvl={level:>3} r={ratio} {online} {{x}}"
+
+        expected = template.format(**formatter._build_format_dict(entry))
+        assert self._render(template, entry) == expected
+
+    def test_data_fields_shadow_entry_attributes(self, reset_registry, entry):
+        """Data fields should win over builtins, except set server/session IDs."""
+        entry.data["severity"] = "custom"
+        entry.data["server_id"] = "from-data"
+
+        assert self._render("{severity} {server_id}", entry) == "custom srv-1"
+
+    def test_missing_field_renders_none(self, reset_registry, entry):
+        """A missing field should signal the str.format fallback."""
+        assert self._render("{nope}", entry) is None
+
+    def test_uncompilable_templates(self, reset_registry):
+        """Positional, attribute and nested fields should not compile."""
+        getter = TextFormatter(registry=LogTypeRegistry())._field_getter
+        for template in ("{}", "{0}", "{user.name}", "{items[0]}", "{level:{width}}"):
+            assert CompiledTemplate.compile(template, getter) is None
+
+    def test_template_compiled_once(self, formatter, entry):
+        """Each template should be parsed once and reused."""
+        formatter.format(entry)
+        formatter.format(entry)
+
+        assert len(formatter._compiled) == 1
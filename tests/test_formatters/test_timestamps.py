@@ -0,0 +1,54 @@
+"""
+Tests for agnolog.formatters.timestamps module.
+
+Tests the shared, memoized timestamp renderers.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agnolog.formatters.timestamps import MONTH_ABBR, TimestampRenderer, timestamp_renderer
+
+START = datetime(2024, 1, 15, 12, 30, 45, 123456)
+
+
+class TestTimestampRenderer:
+    """Tests for TimestampRenderer."""
+
+    @pytest.mark.parametrize(
+        "fmt",
+        [
+            "%Y-%m-%d %H:%M:%S",
+            "%Y-%m-%d %H:%M:%S.%f",
+            "%f|%H:%M:%S|%f",
+            "100%% at %H:%M:%S.%f",
+            "%b %d %H:%M:%S",
+        ],
+    )
+    def test_matches_strftime(self, fmt):
+        """Output should equal strftime across second boundaries."""
+        renderer = TimestampRenderer(fmt)
+        for step in range(200):
+            dt = START + timedelta(milliseconds=137 * step)
+            assert renderer.render(dt) == dt.strftime(fmt)
+
+    def test_timezone_is_part_of_the_key(self):
+        """The same wall time in another zone should not reuse the memo."""
+        renderer = TimestampRenderer("%H:%M:%S %z")
+        utc = START.replace(tzinfo=timezone.utc)
+        cet = START.replace(tzinfo=timezone(timedelta(hours=1)))
+
+        assert renderer.render(utc).endswith("+0000")
+        assert renderer.render(cet).endswith("+0100")
+
+    def test_shared_per_format(self):
+        """Renderers should be shared by format string."""
+        assert timestamp_renderer("%H:%M") is timestamp_renderer("%H:%M")
+        assert timestamp_renderer("%H:%M") is not timestamp_renderer("%H:%M:%S")
+
+    def test_month_abbreviations(self):
+        """Month table should match strftime('%b')."""
+        assert [MONTH_ABBR[m] for m in range(1, 13)] == [
+            datetime(2024, m, 1).strftime("%b") for m in range(1, 13)
+        ]
@@ -0,0 +1,218 @@
+"""
+Tests for agnolog.core.lua_runtime module.
+
+Tests the theme-driven generator utilities exposed to Lua as ctx.gen.
+"""
+
+import ipaddress
+import random
+import re
+import uuid
+
+import pytest
+
+from agnolog.core.addresses import AddressPool, AddressRange, format_ipv4
+from agnolog.core.id_pool import CharStream, IdPool
+from agnolog.core.lua_runtime import LuaGeneratorError, LuaGeneratorUtils
+
+THEME_DATA = {
+    "items": {
+        "item_prefixes": {"Common": ["Worn"], "Rare": ["Blessed"]},
+        "item_suffixes": {"weapon": ["of Power"]},
+        "weapon_types": ["Sword"],
+        "armor_types": ["Helm"],
+    },
+    "monsters": {
+        "monster_types": {
+            "types": ["Beast", "Undead"],
+            "prefixes": {"Beast": ["Wild"]},
+            "names": {"Beast": ["Wolf"], "Undead": ["Ghoul"]},
+        },
+        "dungeon_bosses": {"Deadmines": ["Sneed"], "Stockades": ["Hogger"]},
+    },
+    "classes": {
+        "skills": {
+            "mage": ["Fireball", "Frostbolt"],
+            "priest": {"healing": ["Heal"], "shadow": ["Mind Blast"]},
+        }
+    },
+}
+
+
+@pytest.fixture
+def gen():
+    """Generator utilities over a small theme."""
+    return LuaGeneratorUtils(THEME_DATA)
+
+
+class TestNameTables:
+    """Tests for the precompiled name tables."""
+
+    def test_item_name_uses_all_parts(self, gen):
+        """Item names should combine prefix, base item and suffix."""
+        names = {gen.item_name() for _ in range(200)}
+        assert names <= {
+            f"{p} {b} of Power" for p in ("Worn", "Blessed") for b in ("Sword", "Helm")
+        }
+        assert len(names) == 4
+
+    def test_item_name_fallback(self):
+        """Themes without items should get a placeholder name."""
+        assert LuaGeneratorUtils({}).item_name().startswith("Item_")
+
+    def test_monster_name(self, gen):
+        """Monster names should use per-type prefixes and names."""
+        names = {gen.monster_name() for _ in range(200)}
+        assert names == {"Wild Wolf", "Ghoul"}
+
+    def test_boss_name_from_dungeons(self, gen):
+        """Dungeon bosses should be flattened across dungeons."""
+        assert {gen.boss_name() for _ in range(200)} == {"Sneed", "Hogger"}
+
+    def test_skill_name_by_class(self, gen):
+        """Class skills should be used for list and grouped data."""
+        assert {gen.skill_name("Mage") for _ in range(100)} == {"Fireball", "Frostbolt"}
+        assert {gen.skill_name("priest") for _ in range(100)} == {"Heal", "Mind Blast"}
+
+    def test_skill_name_any_class(self, gen):
+        """Unknown classes should pick from all skills."""
+        skills = {gen.skill_name("bard") for _ in range(300)}
+        assert skills == {"Fireball", "Frostbolt", "Heal", "Mind Blast"}
+
+    def test_tables_are_tuples(self, gen):
+        """Compiled tables should be flat tuples."""
+        assert gen._item_prefixes == ("Worn", "Blessed")
+        assert gen._all_skills == ("Fireball", "Frostbolt", "Heal", "Mind Blast")
+
+
+class TestIdPool:
+    """Tests for block-generated identifiers."""
+
+    UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+
+    def test_uuid_format_and_uniqueness(self):
+        """UUIDs should be valid version-4 strings and unique across refills."""
+        pool = IdPool(block_size=8)
+        uuids = [pool.uuid() for _ in range(50)]
+
+        assert all(self.UUID_RE.match(u) for u in uuids)
+        assert uuid.UUID(uuids[0]).version == 4
+        assert len(set(uuids)) == 50
+
+    def test_guid_format(self, gen):
+        """GUIDs should be uppercase UUIDs in braces."""
+        guid = gen.guid()
+        assert guid.startswith("{") and guid.endswith("}")
+        assert guid == guid.upper()
+        assert self.UUID_RE.match(guid[1:-1].lower())
+
+    def test_sid_format(self, gen):
+        """SIDs should follow the S-1-5-21 domain layout."""
+        assert re.match(r"^S-1-5-21-\d{10}-\d{10}-\d{10}-\d{4}$", gen.sid())
+
+    def test_variable_length_ids(self, gen):
+        """hex_string and session_id should honour the requested length."""
+        assert re.match(r"^[0-9a-f]{7}$", gen.hex_string(7))
+        assert re.match(r"^sess_[a-z0-9]{40}$", gen.session_id(40))
+        assert gen.hex_string(0) == ""
+
+    def test_reproducible_with_seed(self):
+        """IDs should be reproducible when the random module is seeded."""
+        random.seed(123)
+        first = [IdPool(block_size=4).uuid() for _ in range(3)]
+        random.seed(123)
+        second = [IdPool(block_size=4).uuid() for _ in range(3)]
+        assert first == second
+
+
+class TestCharStream:
+    """Tests for the buffered character stream."""
+
+    def test_take_spans_refills_without_skipping(self):
+        """Reads crossing a refill should keep the unread tail."""
+        blocks = iter(["abc", "defg", "hijk"])
+        stream = CharStream(lambda: next(blocks))
+
+        assert stream.take(2) == "ab"
+        assert stream.take(5) == "cdefg"
+        assert stream.take(4) == "hijk"
+
+
+class TestAddresses:
+    """Tests for CIDR-pool address generation."""
+
+    def test_format_ipv4(self):
+        """Integers should format as dotted quads."""
+        assert format_ipv4(0xC0A80164) == "192.168.1.100"
+        assert format_ipv4(0) == "0.0.0.0"
+
+    def test_parse_cidr_and_range(self):
+        """CIDR blocks and start-end ranges should parse to spans."""
+        rng = AddressRange.parse("10.0.0.0/8")
+        assert (rng.start, rng.size, rng.version) == (0x0A000000, 1 << 24, 4)
+
+        rng = AddressRange.parse("1.0.0.0-1.0.0.9")
+        assert rng.size == 10
+
+        # Small blocks skip network and broadcast
+        assert AddressRange.parse("10.0.0.0/30").size == 2
+
+    def test_invalid_spec_raises(self):
+        """Malformed specs should raise ValueError."""
+        with pytest.raises(ValueError):
+            AddressRange.parse("10.0.0.0/33")
+        with pytest.raises(ValueError):
+            AddressPool([])
+
+    def test_pool_stays_in_ranges(self):
+        """Drawn addresses should fall inside the configured ranges, never on .0/.255."""
+        pool = AddressPool(["10.1.0.0/16", {"cidr": "192.168.5.0/24", "weight": 2}])
+        networks = [ipaddress.ip_network("10.1.0.0/16"), ipaddress.ip_network("192.168.5.0/24")]
+
+        for text in pool.block(2000):
+            address = ipaddress.ip_address(text)
+            assert any(address in network for network in networks)
+            assert text.rsplit(".", 1)[1] not in ("0", "255")
+
+    def test_ipv6_pool(self):
+        """IPv6 pools should produce compressed addresses in the prefix."""
+        pool = AddressPool(["2001:db8:100::/48"])
+        network = ipaddress.ip_network("2001:db8:100::/48")
+        assert all(ipaddress.ip_address(a) in network for a in pool.block(100))
+
+    def test_theme_address_config(self):
+        """ctx.gen helpers should use the theme's address pools."""
+        gen = LuaGeneratorUtils(
+            {
+                "constants": {
+                    "addresses": {
+                        "internal": ["10.9.0.0/16"],
+                        "datacenters": {"eu-west": ["10.10.0.0/16"]},
+                    }
+                }
+            }
+        )
+
+        assert gen.ip_address(True).startswith("10.9.")
+        assert gen.datacenter_ip("eu-west").startswith("10.10.")
+        assert gen.datacenter_ip().startswith("10.10.")
+        assert ipaddress.ip_address(gen.ipv6_address()).version == 6
+        with pytest.raises(LuaGeneratorError, match="Unknown datacenter 'mars'"):
+            gen.datacenter_ip("mars")
+
+    def test_single_range_datacenter(self):
+        """A datacenter given one CIDR string instead of a list should use that range."""
+        gen = LuaGeneratorUtils(
+            {"constants": {"addresses": {"datacenters": {"eu-west": "10.10.0.0/16"}}}}
+        )
+
+        assert gen.datacenter_ip("eu-west").startswith("10.10.")
+
+    def test_datacenter_falls_back_to_internal(self, gen):
+        """Without datacenters, datacenter_ip should return an internal address."""
+        assert ipaddress.ip_address(gen.datacenter_ip()).is_private
+
+    def test_invalid_address_config_raises(self):
+        """Malformed address pools should fail when the theme loads."""
+        with pytest.raises(LuaGeneratorError):
+            LuaGeneratorUtils({"constants": {"addresses": {"internal": ["not-an-ip"]}}})
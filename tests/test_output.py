@@ -4,14 +4,49 @@ Tests for agnolog.output module.
 Tests output handlers for file and stream output.
 """
 
-from io import StringIO
+import csv
+import errno
+import gzip
+import json
+import os
+import socket
+import threading
+import time
+from dataclasses import replace
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO, TextIOWrapper
 from unittest.mock import MagicMock
 
+import pytest
+
+from agnolog.core.errors import (
+    FileWriteError,
+    InvalidConfigValueError,
+    MissingDependencyError,
+    NetworkSendError,
+    UnsupportedFormatError,
+)
+from agnolog.core.types import LogEntry, LogSeverity
+from agnolog.formatters import JSONFormatter, LoghubCSVFormatter, TextFormatter
 from agnolog.output import (
+    ColumnarFileHandler,
+    CompressedWriter,
     FileOutputHandler,
+    HttpBulkHandler,
+    LoghubFileHandler,
+    MergeGroupTableWriter,
+    MmapFileHandler,
+    PartitionedFileHandler,
+    QueuedOutputHandler,
     RotatingFileHandler,
+    SegmentedFileHandler,
+    SocketOutputHandler,
     StreamOutputHandler,
+    TeeHandler,
 )
+from agnolog.output.compression import ZSTD_AVAILABLE
+from agnolog.output.network_handler import parse_address
 
 
 class TestStreamOutputHandler:
@@ -88,6 +123,64 @@ class TestStreamOutputHandler:
         # flush should not have been called on write
         assert mock_stream.flush.call_count == 0
 
+    def test_buffered_writes_by_size(self):
+        """Buffered mode should hold content until the buffer size is reached."""
+        stream = StringIO()
+        handler = StreamOutputHandler(stream=stream, auto_flush=False, buffer_size=10)
+
+        handler.write("1234")
+        assert stream.getvalue() == ""
+
+        handler.write("56789")
+        assert stream.getvalue() == "1234\n56789\n"
+
+    def test_buffered_close_writes_pending(self):
+        """Closing should write buffered content."""
+        stream = StringIO()
+        handler = StreamOutputHandler(stream=stream, auto_flush=False, buffer_size=1024)
+
+        handler.write("line")
+        handler.close()
+
+        assert stream.getvalue() == "line\n"
+
+    def test_flush_interval(self, monkeypatch):
+        """Pending content should be flushed once the interval has passed."""
+        clock = [100.0]
+        monkeypatch.setattr("agnolog.output.stream_handler.time.monotonic", lambda: clock[0])
+        stream = StringIO()
+        handler = StreamOutputHandler(
+            stream=stream, auto_flush=False, buffer_size=1024, flush_interval=1.0
+        )
+
+        handler.write("early")
+        assert stream.getvalue() == ""
+
+        clock[0] += 1.5
+        handler.write("late")
+        assert stream.getvalue() == "early\nlate\n"
+
+    def test_binary_writes_encoded_bytes(self):
+        """Binary mode should write encoded bytes to the stream's buffer."""
+        raw = BytesIO()
+        stream = TextIOWrapper(raw, encoding="utf-8")
+        stream.write("text first\n")
+        handler = StreamOutputHandler(stream=stream, auto_flush=False, binary=True)
+
+        handler.write("Zoë")
+        handler.close()
+
+        assert raw.getvalue() == "text first\nZoë\n".encode()
+
+    def test_binary_without_buffer_falls_back_to_text(self):
+        """Streams without a binary buffer should get text."""
+        stream = StringIO()
+        handler = StreamOutputHandler(stream=stream, binary=True)
+
+        handler.write("line")
+
+        assert stream.getvalue() == "line\n"
+
 
 class TestFileOutputHandler:
     """Tests for FileOutputHandler."""
@@ -255,6 +348,993 @@ class TestRotatingFileHandler:
         backup_files = list(tmp_path.glob("test.log.*"))
         assert len(backup_files) == 0
 
+    def test_size_counts_encoded_bytes(self, tmp_path):
+        """Rotation should count UTF-8 bytes, not characters."""
+        output_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(str(output_file), max_size=20, max_files=3)
+
+        # 6 characters, 18 bytes with the newline: two do not fit in 20 bytes
+        handler.write("\u4e16\u754c\u4e16\u754c\u4e16")
+        handler.write("\u4e16\u754c\u4e16\u754c\u4e16")
+        handler.close()
+
+        assert handler.rotation_count == 1
+        assert (tmp_path / "test.log.1").read_text(
+            encoding="utf-8"
+        ) == "\u4e16\u754c" * 2 + "\u4e16\n"
+
+    def test_write_batch_is_not_split(self, tmp_path):
+        """A batch should land in a single file."""
+        output_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(str(output_file), max_size=30, max_files=3)
+
+        handler.write("first")
+        handler.write_batch([f"Line {i}" for i in range(10)])
+        handler.close()
+
+        assert handler.rotation_count == 1
+        assert (tmp_path / "test.log.1").read_text() == "first\n"
+        assert output_file.read_text().splitlines() == [f"Line {i}" for i in range(10)]
+
+    def test_oversized_write_does_not_rotate_empty_file(self, tmp_path):
+        """A write larger than max_size should not leave an empty backup."""
+        output_file = tmp_path / "test.log"
+        handler = RotatingFileHandler(str(output_file), max_size=10, max_files=3)
+
+        handler.write("x" * 50)
+        handler.close()
+
+        assert handler.rotation_count == 0
+        assert output_file.read_text() == "x" * 50 + "\n"
+
+
+class TestCompressedWriter:
+    """Tests for CompressedWriter and compressed file handlers."""
+
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_gzip_members_round_trip(self, tmp_path, threads):
+        """Blocks should be independent gzip members that decompress in order."""
+        path = tmp_path / "out.gz"
+        data = b"".join(b"line %d\n" % i for i in range(5000))
+
+        with CompressedWriter(open(path, "wb"), threads=threads, block_size=1000) as writer:
+            for i in range(0, len(data), 250):
+                writer.write(data[i : i + 250])
+
+        raw = path.read_bytes()
+        assert gzip.decompress(raw) == data
+        # One gzip member (magic 1f 8b 08) per block
+        assert raw.count(b"\x1f\x8b\x08") == -(-len(data) // 1000)
+        assert writer.bytes_in == len(data)
+        assert writer.bytes_out == len(raw)
+
+    def test_empty_file_is_valid(self, tmp_path):
+        """Closing without writes should still leave a valid archive."""
+        path = tmp_path / "empty.gz"
+
+        CompressedWriter(open(path, "wb")).close()
+
+        assert gzip.decompress(path.read_bytes()) == b""
+
+    def test_unknown_codec(self, tmp_path):
+        """An unknown codec should raise a configuration error."""
+        with pytest.raises(InvalidConfigValueError):
+            FileOutputHandler(str(tmp_path / "out.bz2"), compression="bzip2")
+
+    @pytest.mark.skipif(ZSTD_AVAILABLE, reason="zstandard is installed")
+    def test_missing_codec_package(self, tmp_path):
+        """zstd without the zstandard package should say what to install."""
+        with pytest.raises(MissingDependencyError, match="agnolog\\[compression\\]"):
+            FileOutputHandler(str(tmp_path / "out.zst"), compression="zstd")
+        assert not (tmp_path / "out.zst").exists()
+
+    def test_file_handler_append_adds_members(self, tmp_path):
+        """Appending to a compressed file should keep it readable."""
+        path = tmp_path / "out.log.gz"
+
+        for text in ("first", "second"):
+            with FileOutputHandler(str(path), compression="gzip") as handler:
+                handler.write(text)
+
+        assert gzip.decompress(path.read_bytes()).decode() == "first\nsecond\n"
+
+    def test_rotating_handler_backup_names(self, tmp_path):
+        """Compressed backups should keep the codec extension last."""
+        path = tmp_path / "test.log.gz"
+        handler = RotatingFileHandler(str(path), max_size=30, max_files=2, compression="gzip")
+
+        for i in range(10):
+            handler.write(f"Line {i}: " + "x" * 20)
+        handler.close()
+
+        backups = sorted(p.name for p in tmp_path.glob("test.log.*.gz"))
+        assert backups == ["test.log.1.gz", "test.log.2.gz"]
+        assert gzip.decompress((tmp_path / "test.log.1.gz").read_bytes()) == (
+            b"Line 8: " + b"x" * 20 + b"\n"
+        )
+
+
+class TestMmapFileHandler:
+    """Tests for MmapFileHandler."""
+
+    def test_writes_across_windows(self, tmp_path):
+        """Writes spanning several small windows should land intact and in order."""
+        path = tmp_path / "out.log"
+        lines = [f"line {i} " + "x" * (i % 50) for i in range(1000)]
+        handler = MmapFileHandler(str(path), window_size=1)
+
+        for line in lines[:10]:
+            handler.write(line)
+        # One write larger than a window
+        handler.write("\n".join(lines[10:]))
+        handler.close()
+
+        assert path.read_text().splitlines() == lines
+        assert handler.bytes_written == path.stat().st_size
+
+    def test_preallocation_is_truncated(self, tmp_path):
+        """The estimate from expected_lines should be cut to the bytes written."""
+        path = tmp_path / "out.log"
+        handler = MmapFileHandler(str(path), expected_lines=10_000)
+
+        handler.write("a" * 99)
+        handler.write("b" * 99)
+        handler.close()
+
+        assert handler.allocated >= 10_000 * 100
+        assert path.read_text() == "a" * 99 + "\n" + "b" * 99 + "\n"
+
+    def test_empty_file(self, tmp_path):
+        """Closing without writes should leave an empty file."""
+        path = tmp_path / "out.log"
+
+        MmapFileHandler(str(path), expected_lines=100).close()
+
+        assert path.read_bytes() == b""
+
+    def test_full_disk_raises(self, tmp_path, monkeypatch):
+        """A failed preallocation should raise instead of mapping a sparse file."""
+        if not hasattr(os, "posix_fallocate"):
+            pytest.skip("posix_fallocate not available")
+
+        def no_space(fd, offset, length):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        monkeypatch.setattr(os, "posix_fallocate", no_space)
+        handler = MmapFileHandler(str(tmp_path / "out.log"), expected_lines=100)
+
+        with pytest.raises(FileWriteError):
+            handler.write("line")
+        handler.close()
+
+    def test_unsupported_fallocate_falls_back(self, tmp_path, monkeypatch):
+        """File systems without fallocate should get a sparse file instead."""
+        if not hasattr(os, "posix_fallocate"):
+            pytest.skip("posix_fallocate not available")
+
+        def unsupported(fd, offset, length):
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        monkeypatch.setattr(os, "posix_fallocate", unsupported)
+        path = tmp_path / "out.log"
+        with MmapFileHandler(str(path), expected_lines=100) as handler:
+            handler.write("line")
+
+        assert path.read_text() == "line\n"
+
+
+class StreamListener:
+    """Local TCP/Unix listener collecting the bytes of each accepted connection."""
+
+    def __init__(self, server: socket.socket, drop_first: bool = False):
+        self.server = server
+        self.server.listen()
+        self.connections: list[bytes] = []
+        self._drop_first = drop_first
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            with conn:
+                if self._drop_first and not self.connections:
+                    self.connections.append(b"")
+                    continue
+                chunks = []
+                while data := conn.recv(65536):
+                    chunks.append(data)
+                self.connections.append(b"".join(chunks))
+
+    def wait(self, count: int = 1) -> list[bytes]:
+        deadline = time.monotonic() + 5
+        while len(self.connections) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.server.close()
+        return self.connections
+
+
+@pytest.fixture
+def tcp_listener():
+    """Start a TCP listener on a free local port."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    return StreamListener(server)
+
+
+class TestSocketOutputHandler:
+    """Tests for SocketOutputHandler."""
+
+    def test_parse_address(self):
+        """Should split supported URLs into transport and socket address."""
+        assert parse_address("tcp://127.0.0.1:5140") == ("tcp", ("127.0.0.1", 5140))
+        assert parse_address("udp://collector:514") == ("udp", ("collector", 514))
+        assert parse_address("unix:///run/app.sock") == ("unix", "/run/app.sock")
+
+        for url in ("http://host:80", "tcp://host", "unix://"):
+            with pytest.raises(InvalidConfigValueError):
+                parse_address(url)
+
+    def test_tcp_batches_lines(self, tcp_listener):
+        """Lines should arrive intact, batched into few sends."""
+        port = tcp_listener.server.getsockname()[1]
+        handler = SocketOutputHandler(f"tcp://127.0.0.1:{port}")
+        lines = [f"line {i}" for i in range(1000)]
+
+        for i in range(0, 1000, 100):
+            handler.write("\n".join(lines[i : i + 100]))
+        handler.close()
+
+        assert tcp_listener.wait()[0].decode().splitlines() == lines
+        assert handler.stats.messages == 1000
+        assert handler.stats.sends == 1
+
+    def test_tcp_octet_framing(self, tcp_listener):
+        """Octet framing should prefix each message with its length."""
+        port = tcp_listener.server.getsockname()[1]
+        handler = SocketOutputHandler(f"tcp://127.0.0.1:{port}", framing="octet")
+
+        handler.write("<14>1 first\n<14>1 second é")
+        handler.close()
+
+        assert tcp_listener.wait()[0] == "11 <14>1 first15 <14>1 second é".encode()
+
+    def test_tcp_reconnects(self, monkeypatch):
+        """A dropped connection should be re-established and the batch resent."""
+        monkeypatch.setattr("agnolog.output.network_handler.NETWORK_RECONNECT_DELAY", 0.01)
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        listener = StreamListener(server, drop_first=True)
+        handler = SocketOutputHandler(f"tcp://127.0.0.1:{server.getsockname()[1]}", batch_bytes=0)
+
+        for i in range(100):
+            handler.write(f"line {i}")
+            if handler.stats.reconnects:
+                break
+            time.sleep(0.01)
+        handler.close()
+
+        assert handler.stats.reconnects == 1
+        assert listener.wait(2)[1].endswith(f"line {i}\n".encode())
+
+    def test_unix_stream(self, tmp_path):
+        """Should send over a Unix stream socket."""
+        path = str(tmp_path / "out.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        listener = StreamListener(server)
+
+        with SocketOutputHandler(f"unix://{path}") as handler:
+            handler.write("a\nb")
+
+        assert listener.wait()[0] == b"a\nb\n"
+
+    def test_udp_one_datagram_per_line(self):
+        """Each line should be its own datagram."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(5)
+        handler = SocketOutputHandler(f"udp://127.0.0.1:{server.getsockname()[1]}")
+
+        handler.write("first\nsecond")
+        handler.close()
+
+        assert [server.recv(1024), server.recv(1024)] == [b"first", b"second"]
+        assert handler.stats.messages == 2
+        server.close()
+
+    def test_udp_rejects_octet_framing(self):
+        """Datagrams carry one message each, so octet framing is invalid."""
+        with pytest.raises(InvalidConfigValueError):
+            SocketOutputHandler("udp://127.0.0.1:514", framing="octet")
+
+    def test_connection_refused(self):
+        """An unreachable stream destination should raise NetworkSendError."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        server.close()
+
+        with pytest.raises(NetworkSendError):
+            SocketOutputHandler(f"tcp://127.0.0.1:{port}")
+
+
+class MockBulkServer(ThreadingHTTPServer):
+    """Local HTTP server recording request bodies; fails the first `failures` requests."""
+
+    daemon_threads = True
+
+    def __init__(self, failures: int = 0, status: int = 503, response: bytes = b"{}"):
+        self.requests: list[tuple[dict[str, str], bytes]] = []
+        self.clients: set[int] = set()
+        self.failures = failures
+        self.status = status
+        self.response = response
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), MockBulkRequestHandler)
+        threading.Thread(target=self.serve_forever, args=(0.01,), daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class MockBulkRequestHandler(BaseHTTPRequestHandler):
+    """Keep-alive request handler of MockBulkServer."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            failed = server.failures > 0
+            if failed:
+                server.failures -= 1
+            else:
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                server.requests.append((dict(self.headers), body))
+                server.clients.add(self.client_address[1])
+        payload = b"unavailable" if failed else server.response
+        self.send_response(server.status if failed else 200)
+        if failed:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def bulk_server():
+    """Start a local mock bulk ingestion server."""
+    server = MockBulkServer()
+    yield server
+    server.stop()
+
+
+class TestHttpBulkHandler:
+    """Tests for HttpBulkHandler."""
+
+    def _entries(self, timestamp, count):
+        return [
+            LogEntry(
+                log_type="player.login",
+                timestamp=timestamp + timedelta(seconds=i),
+                severity=LogSeverity.INFO,
+                category="AUTH" if i % 2 else "PLAYER",
+                data={"username": f"user{i}"},
+            )
+            for i in range(count)
+        ]
+
+    def test_elasticsearch_bulk(self, bulk_server, sample_timestamp):
+        """Should post action/document line pairs in batches over keep-alive connections."""
+        handler = HttpBulkHandler(f"{bulk_server.url}/_bulk", batch_rows=10, concurrency=1)
+
+        handler.write_entries(self._entries(sample_timestamp, 25))
+        handler.close()
+
+        assert len(bulk_server.requests) == 3
+        assert len(bulk_server.clients) == 1
+        headers, body = bulk_server.requests[0]
+        assert headers["Content-Type"] == "application/x-ndjson"
+        lines = body.decode().splitlines()
+        assert len(lines) == 20
+        assert json.loads(lines[0]) == {"index": {"_index": "agnolog"}}
+        assert json.loads(lines[1])["username"] == "user0"
+        assert handler.stats.entries == 25
+
+    def test_loki_push(self, bulk_server, sample_timestamp):
+        """Should group entries into streams with nanosecond timestamps."""
+        entries = self._entries(sample_timestamp, 4)
+        with HttpBulkHandler(bulk_server.url, api="loki", compress=True) as handler:
+            handler.write_entries(entries)
+
+        headers, body = bulk_server.requests[0]
+        assert headers["Content-Encoding"] == "gzip"
+        streams = json.loads(body)["streams"]
+        assert sorted(stream["stream"]["category"] for stream in streams) == ["AUTH", "PLAYER"]
+        values = streams[0]["values"]
+        assert len(values) == 2
+        assert int(values[0][0]) == int(entries[0].timestamp.timestamp() * 1e6) * 1000
+
+    def test_splunk_hec(self, bulk_server, sample_timestamp):
+        """Should send one event object per entry with custom headers."""
+        handler = HttpBulkHandler(
+            bulk_server.url, api="splunk", headers={"Authorization": "Splunk token"}
+        )
+
+        handler.write_entries(self._entries(sample_timestamp, 3))
+        handler.close()
+
+        headers, body = bulk_server.requests[0]
+        assert headers["Authorization"] == "Splunk token"
+        events = [json.loads(line) for line in body.decode().splitlines()]
+        assert [event["sourcetype"] for event in events] == ["player.login"] * 3
+        assert json.loads(events[0]["event"])["username"] == "user0"
+
+    def test_retries_retryable_status(self, sample_timestamp, monkeypatch):
+        """503 responses should be retried until the request succeeds."""
+        monkeypatch.setattr("agnolog.output.http_handler.HTTP_RETRY_DELAY", 0.01)
+        server = MockBulkServer(failures=2)
+        try:
+            handler = HttpBulkHandler(server.url, api="loki")
+            handler.write_entries(self._entries(sample_timestamp, 5))
+            handler.close()
+        finally:
+            server.stop()
+
+        assert len(server.requests) == 1
+        assert handler.stats.retries == 2
+
+    def test_client_error_raises(self, sample_timestamp):
+        """Non-retryable statuses should surface as NetworkSendError on close."""
+        server = MockBulkServer(failures=1, status=400)
+        try:
+            handler = HttpBulkHandler(server.url)
+            handler.write_entries(self._entries(sample_timestamp, 5))
+            with pytest.raises(NetworkSendError, match="HTTP 400"):
+                handler.close()
+        finally:
+            server.stop()
+
+    def test_counts_rejected_documents(self, sample_timestamp):
+        """Per-document errors of a bulk response should be counted."""
+        response = json.dumps(
+            {"errors": True, "items": [{"index": {"status": 201}}, {"index": {"error": {}}}]}
+        ).encode()
+        server = MockBulkServer(response=response)
+        try:
+            with HttpBulkHandler(server.url) as handler:
+                handler.write_entries(self._entries(sample_timestamp, 2))
+        finally:
+            server.stop()
+
+        assert handler.stats.rejected == 1
+
+    def test_invalid_options(self):
+        """Should reject unknown APIs, non-HTTP URLs and non-JSON Elasticsearch documents."""
+        from agnolog.formatters import TextFormatter
+
+        with pytest.raises(InvalidConfigValueError):
+            HttpBulkHandler("http://localhost:9200", api="kafka")
+        with pytest.raises(InvalidConfigValueError):
+            HttpBulkHandler("tcp://localhost:9200")
+        with pytest.raises(InvalidConfigValueError):
+            HttpBulkHandler("http://localhost:9200", formatter=TextFormatter())
+
+
+class TestColumnarFileHandler:
+    """Tests for ColumnarFileHandler."""
+
+    @pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+    def test_round_trip(self, file_format, tmp_path, sample_log_entries):
+        """Entries should read back from the written file."""
+        ipc = pytest.importorskip("pyarrow.ipc")
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        path = tmp_path / f"logs.{file_format}"
+        with ColumnarFileHandler(str(path), file_format=file_format) as handler:
+            handler.write_entries(sample_log_entries)
+
+        if file_format == "parquet":
+            table = pq.read_table(path)
+        else:
+            table = ipc.open_file(path).read_all()
+        assert table.num_rows == len(sample_log_entries)
+        assert table.column("index").to_pylist() == [0, 1, 2, 3, 4]
+        assert handler.entry_count == 5
+
+    def test_row_group_per_log_type(self, tmp_path, sample_log_entries):
+        """Each log type should get its own Parquet row group."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "logs.parquet"
+
+        with ColumnarFileHandler(str(path)) as handler:
+            handler.write_entries(sample_log_entries)
+
+        assert pq.ParquetFile(path).num_row_groups == len(sample_log_entries)
+        assert handler.row_group_count == len(sample_log_entries)
+
+    def test_empty_file_is_valid(self, tmp_path):
+        """Closing without entries should still leave a readable file."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "empty.parquet"
+
+        ColumnarFileHandler(str(path)).close()
+
+        assert pq.read_table(path).num_rows == 0
+
+    def test_unknown_format_raises(self, tmp_path):
+        """Unknown formats should be rejected."""
+        with pytest.raises(UnsupportedFormatError):
+            ColumnarFileHandler(str(tmp_path / "logs.orc"), file_format="orc")
+
+
+class SlowHandler(StreamOutputHandler):
+    """Stream handler whose writes wait for an event."""
+
+    def __init__(self, stream, gate):
+        super().__init__(stream=stream, add_newline=False)
+        self._gate = gate
+
+    def write(self, content):
+        self._gate.wait()
+        super().write(content)
+
+
+class TestQueuedOutputHandler:
+    """Tests for QueuedOutputHandler."""
+
+    def test_writes_in_order(self):
+        """Queued writes should reach the wrapped handler in order."""
+        stream = StringIO()
+        handler = QueuedOutputHandler(StreamOutputHandler(stream=stream))
+
+        for i in range(100):
+            handler.write(f"line {i}")
+        handler.write_batch(["a", "b"])
+        handler.close()
+
+        lines = stream.getvalue().splitlines()
+        assert lines == [f"line {i}" for i in range(100)] + ["a", "b"]
+        assert handler.stats.chunks == 101
+
+    def test_flush_waits_for_writer(self):
+        """flush() should return once queued content is written."""
+        stream = StringIO()
+        handler = QueuedOutputHandler(StreamOutputHandler(stream=stream))
+
+        handler.write("line")
+        handler.flush()
+
+        assert stream.getvalue() == "line\n"
+        handler.close()
+
+    def test_stalls_when_full(self):
+        """Writes into a full queue should block and be counted as stalls."""
+        gate = threading.Event()
+        stream = StringIO()
+        handler = QueuedOutputHandler(SlowHandler(stream, gate), max_chunks=2)
+        # Release the writer shortly after the queue fills up
+        threading.Timer(0.05, gate.set).start()
+
+        for i in range(5):
+            handler.write(str(i))
+        handler.close()
+
+        assert stream.getvalue() == "01234"
+        assert handler.stats.stalls >= 1
+        assert handler.stats.stall_seconds > 0
+        assert handler.stats.high_water_mark == 2
+
+    def test_writer_error_is_raised(self):
+        """A failure on the writer thread should surface in the caller."""
+        inner = MagicMock()
+        inner.write.side_effect = OSError("disk full")
+        handler = QueuedOutputHandler(inner)
+
+        handler.write("line")
+        with pytest.raises(OSError, match="disk full"):
+            handler.flush()
+        handler.close()
+        inner.close.assert_called_once()
+
+    def test_invalid_capacity(self):
+        """Queue capacity must be positive."""
+        with pytest.raises(ValueError):
+            QueuedOutputHandler(StreamOutputHandler(stream=StringIO()), max_chunks=0)
+
+
+class StubRegistry:
+    """Registry stub: server.cpu and server.memory share the server_metrics group."""
+
+    def __init__(self, metadata):
+        self._metadata = metadata
+
+    def get_metadata(self, name):
+        groups = ("server_metrics",) if name.startswith("server.") else ()
+        return replace(self._metadata, name=name, merge_groups=groups)
+
+
+def table_entry(timestamp, log_type, **data):
+    """Build an entry of a log type with the given data."""
+    return LogEntry(
+        log_type=log_type,
+        timestamp=timestamp,
+        severity=LogSeverity.INFO,
+        category="SERVER",
+        data=data,
+    )
+
+
+class TestMergeGroupTableWriter:
+    """Tests for MergeGroupTableWriter."""
+
+    @pytest.fixture
+    def entries(self, sample_timestamp):
+        return [
+            table_entry(sample_timestamp, "server.cpu", cpu=1.5),
+            table_entry(sample_timestamp, "server.memory", used_mb=512),
+            table_entry(sample_timestamp, "player.login", user="a"),
+        ]
+
+    @pytest.fixture
+    def samples(self, entries):
+        return {entry.log_type: [entry] for entry in entries}
+
+    def test_one_table_per_merge_group(self, tmp_path, sample_metadata, entries, samples):
+        """Grouped types should share a table; ungrouped types get their own."""
+        with MergeGroupTableWriter(
+            str(tmp_path), registry=StubRegistry(sample_metadata), samples=samples
+        ) as writer:
+            writer.write_entries(entries)
+
+        assert sorted(writer.paths) == ["player.login", "server_metrics"]
+        with open(writer.paths["server_metrics"], newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["type"] for row in rows] == ["server.cpu", "server.memory"]
+        assert rows[0]["cpu"] == "1.5"
+        assert rows[0]["used_mb"] == ""
+
+    def test_unified_columns_from_samples(self, tmp_path, sample_metadata, entries, samples):
+        """Table columns should be the union of the members' sampled fields."""
+        with MergeGroupTableWriter(
+            str(tmp_path), "ndjson", registry=StubRegistry(sample_metadata), samples=samples
+        ) as writer:
+            writer.write(entries[0])
+
+        row = json.loads(writer.paths["server_metrics"].read_text())
+        assert list(row)[6:] == ["cpu", "used_mb", "extra"]
+        assert row["used_mb"] is None
+
+    def test_unsampled_fields_go_to_extra(self, tmp_path, sample_metadata, sample_timestamp):
+        """Fields outside the sampled schema should land in extra."""
+        with MergeGroupTableWriter(
+            str(tmp_path), "ndjson", registry=StubRegistry(sample_metadata)
+        ) as writer:
+            writer.write(table_entry(sample_timestamp, "player.login", user="a"))
+
+        row = json.loads(writer.paths["player.login"].read_text())
+        assert row["extra"] == {"user": "a"}
+
+    def test_parquet_tables(self, tmp_path, sample_metadata, entries, samples):
+        """Parquet tables should share the unified schema."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        with MergeGroupTableWriter(
+            str(tmp_path), "parquet", registry=StubRegistry(sample_metadata), samples=samples
+        ) as writer:
+            writer.write_entries(entries)
+
+        table = pq.read_table(writer.paths["server_metrics"])
+        assert table.column("cpu").to_pylist() == [1.5, None]
+        assert table.column("used_mb").to_pylist() == [None, 512]
+
+    def test_unknown_format_raises(self, tmp_path):
+        """Unknown table formats should be rejected."""
+        with pytest.raises(UnsupportedFormatError):
+            MergeGroupTableWriter(str(tmp_path), "orc")
+
+    def test_close_closes_every_table_after_a_failure(
+        self, tmp_path, sample_metadata, entries, samples
+    ):
+        """A table failing to close should not leave the others unwritten."""
+        writer = MergeGroupTableWriter(
+            str(tmp_path), registry=StubRegistry(sample_metadata), samples=samples
+        )
+        writer.write_entries(entries)
+        failing = writer._sinks["server_metrics"]
+        failing.flush = MagicMock(side_effect=FileWriteError("disk", "No space left on device"))
+
+        with pytest.raises(FileWriteError):
+            writer.close()
+
+        with open(writer.paths["player.login"], newline="") as f:
+            assert [row["user"] for row in csv.DictReader(f)] == ["a"]
+        failing._file.close()
+
+    def test_sanitised_names_do_not_collide(self, tmp_path, sample_metadata, sample_timestamp):
+        """Tables whose names sanitise alike should still get their own files."""
+        with MergeGroupTableWriter(
+            str(tmp_path), "ndjson", registry=StubRegistry(sample_metadata)
+        ) as writer:
+            writer.write_entries(
+                [
+                    table_entry(sample_timestamp, "net.a+b", index=0),
+                    table_entry(sample_timestamp, "net.a_b", index=1),
+                ]
+            )
+
+        assert writer.paths["net.a+b"].name == "net.a_b.ndjson"
+        assert writer.paths["net.a_b"].name == "net.a_b-2.ndjson"
+        assert json.loads(writer.paths["net.a_b"].read_text())["type"] == "net.a_b"
+
+
+class TestSegmentedFileHandler:
+    """Tests for SegmentedFileHandler."""
+
+    @pytest.fixture
+    def entries(self, sample_timestamp):
+        """20 entries, 10 minutes apart, from 12:30 to 15:40."""
+        return [
+            table_entry(sample_timestamp + timedelta(minutes=10 * i), "server.cpu", index=i)
+            for i in range(20)
+        ]
+
+    @staticmethod
+    def indexes(path):
+        return [json.loads(line)["index"] for line in path.read_text().splitlines()]
+
+    def test_hourly_segments(self, tmp_path, entries):
+        """Each hour of log time should get its own file, named after it."""
+        with SegmentedFileHandler(
+            str(tmp_path / "server.log"), formatter=JSONFormatter(), interval="hour"
+        ) as handler:
+            handler.write_entries(entries[:7])
+            handler.write_entries(entries[7:])
+
+        names = [path.name for path in handler.paths]
+        assert names == [f"server-2024-01-15_{hour}.log" for hour in (12, 13, 14, 15)]
+        assert self.indexes(tmp_path / "server-2024-01-15_12.log") == [0, 1, 2]
+        assert self.indexes(tmp_path / "server-2024-01-15_13.log") == list(range(3, 9))
+        assert handler.entry_count == 20
+
+    def test_line_count_parts(self, tmp_path, entries):
+        """max_lines should start numbered parts without an interval."""
+        with SegmentedFileHandler(
+            str(tmp_path / "server.log"), formatter=JSONFormatter(), interval=None, max_lines=8
+        ) as handler:
+            handler.write_entries(entries)
+
+        assert [path.name for path in handler.paths] == [
+            "server-0001.log",
+            "server-0002.log",
+            "server-0003.log",
+        ]
+        assert self.indexes(tmp_path / "server-0003.log") == list(range(16, 20))
+
+    def test_retention_deletes_oldest(self, tmp_path, entries):
+        """Only the newest max_files segments should remain."""
+        with SegmentedFileHandler(
+            str(tmp_path / "server.log"), formatter=JSONFormatter(), max_files=2
+        ) as handler:
+            handler.write_entries(entries)
+
+        remaining = sorted(path.name for path in tmp_path.iterdir())
+        assert remaining == ["server-2024-01-15_14.log", "server-2024-01-15_15.log"]
+        assert len(handler.paths) == 4
+
+    def test_compressed_segments(self, tmp_path, entries):
+        """Compressed segments keep the codec extension and are finished on close."""
+        with SegmentedFileHandler(
+            str(tmp_path / "server.log.gz"),
+            formatter=JSONFormatter(),
+            interval="day",
+            compression="gzip",
+            fsync=True,
+        ) as handler:
+            handler.write_entries(entries)
+
+        path = tmp_path / "server-2024-01-15.log.gz"
+        assert handler.paths == [path]
+        assert len(gzip.decompress(path.read_bytes()).splitlines()) == 20
+
+    def test_requires_a_limit(self, tmp_path):
+        """Without an interval or line limit nothing would ever rotate."""
+        with pytest.raises(ValueError):
+            SegmentedFileHandler(str(tmp_path / "server.log"), interval=None)
+        with pytest.raises(InvalidConfigValueError):
+            SegmentedFileHandler(str(tmp_path / "server.log"), interval="week")
+
+
+class TestPartitionedFileHandler:
+    """Tests for PartitionedFileHandler."""
+
+    @pytest.fixture
+    def entries(self, sample_timestamp):
+        """Two categories alternating, 20 minutes apart, from 12:30 to 15:50."""
+        return [
+            replace(
+                table_entry(sample_timestamp + timedelta(minutes=20 * i), "server.cpu", index=i),
+                category="AUTH" if i % 2 else "SERVER",
+            )
+            for i in range(11)
+        ]
+
+    @staticmethod
+    def rows(path):
+        return [json.loads(line)["index"] for line in path.read_text().splitlines()]
+
+    def test_layout_and_manifest(self, tmp_path, entries):
+        """Entries should land in category/date/hour partitions listed in the manifest."""
+        with PartitionedFileHandler(str(tmp_path), buffer_rows=2) as handler:
+            handler.write_entries(entries)
+
+        part = tmp_path / "category=SERVER" / "date=2024-01-15" / "hour=12" / "part-00000.ndjson"
+        assert self.rows(part) == [0]
+        part = tmp_path / "category=SERVER" / "date=2024-01-15" / "hour=13" / "part-00000.ndjson"
+        assert self.rows(part) == [2, 4]
+
+        manifest = json.loads((tmp_path / "_manifest.json").read_text())
+        assert manifest["rows"] == 11
+        assert manifest["partition_columns"] == ["category", "date", "hour"]
+        first = manifest["partitions"][0]
+        assert (first["category"], first["date"], first["hour"], first["rows"]) == (
+            "AUTH",
+            "2024-01-15",
+            "12",
+            1,
+        )
+        assert first["files"] == [
+            {"path": "category=AUTH/date=2024-01-15/hour=12/part-00000.ndjson", "rows": 1}
+        ]
+
+    def test_evicted_files_are_appended(self, tmp_path, entries):
+        """With one open file, reopened part files should keep earlier rows."""
+        with PartitionedFileHandler(str(tmp_path), max_open_files=1, buffer_rows=1) as handler:
+            handler.write_entries(entries)
+
+        written = sorted(index for path in handler.paths for index in self.rows(path))
+        assert written == list(range(11))
+
+    def test_rows_per_file(self, tmp_path, sample_timestamp):
+        """max_rows_per_file should start new part files."""
+        entries = [table_entry(sample_timestamp, "server.cpu", index=i) for i in range(5)]
+
+        with PartitionedFileHandler(str(tmp_path), max_rows_per_file=2) as handler:
+            handler.write_entries(entries)
+
+        assert [path.name for path in handler.paths] == [
+            "part-00000.ndjson",
+            "part-00001.ndjson",
+            "part-00002.ndjson",
+        ]
+        assert self.rows(handler.paths[2]) == [4]
+
+    def test_category_is_escaped(self, tmp_path, sample_timestamp):
+        """Path separators in a category should not create directories."""
+        entry = replace(table_entry(sample_timestamp, "x", index=0), category="a/b")
+
+        with PartitionedFileHandler(str(tmp_path), compression="gzip") as handler:
+            handler.write_entry(entry)
+
+        (path,) = handler.paths
+        assert path.parts[-4] == "category=a%2Fb"
+        assert path.name == "part-00000.ndjson.gz"
+        assert json.loads(gzip.decompress(path.read_bytes()))["index"] == 0
+
+
+class TestLoghubFileHandler:
+    """Tests for LoghubFileHandler."""
+
+    def test_writes_three_files(self, populated_registry, sample_log_entries, tmp_path):
+        """Should write matching .log lines and CSV rows, then the templates file."""
+        formatter = LoghubCSVFormatter(registry=populated_registry)
+
+        with LoghubFileHandler(str(tmp_path / "server"), formatter=formatter) as handler:
+            handler.write_entries(sample_log_entries)
+
+        log_path, structured_path, templates_path = handler.paths
+        lines = log_path.read_text().splitlines()
+        rows = list(csv.DictReader(structured_path.open()))
+        assert len(lines) == len(rows) == len(sample_log_entries)
+        assert [row["Content"] for row in rows] == lines
+        templates = list(csv.reader(templates_path.open()))
+        assert len(templates) - 1 == handler.template_count >= 1
+
+    def test_compressed(self, populated_registry, sample_log_entries, tmp_path):
+        """Compression should add the codec extension to every file."""
+        formatter = LoghubCSVFormatter(registry=populated_registry)
+
+        with LoghubFileHandler(
+            str(tmp_path / "server"), formatter=formatter, compression="gzip"
+        ) as handler:
+            handler.write_entries(sample_log_entries)
+
+        assert [path.name for path in handler.paths] == [
+            "server.log.gz",
+            "server_structured.csv.gz",
+            "server_templates.csv.gz",
+        ]
+        assert len(gzip.decompress(handler.paths[0].read_bytes()).splitlines()) == len(
+            sample_log_entries
+        )
+
+
+class FailingHandler(StreamOutputHandler):
+    """Stream handler whose writes fail."""
+
+    def write(self, content):
+        raise OSError("disk full")
+
+
+class TestTeeHandler:
+    """Tests for TeeHandler."""
+
+    def test_fans_out_to_every_sink(self, populated_registry, sample_log_entries, tmp_path):
+        """Each sink should receive every entry in its own format."""
+        ndjson = FileOutputHandler(str(tmp_path / "out.ndjson"))
+        text = StringIO()
+        loghub = LoghubFileHandler(
+            str(tmp_path / "server"), formatter=LoghubCSVFormatter(registry=populated_registry)
+        )
+
+        with TeeHandler(
+            [
+                (JSONFormatter(), ndjson),
+                (TextFormatter(), StreamOutputHandler(stream=text, add_newline=False)),
+                loghub,
+            ],
+            max_chunks=1,
+        ) as tee:
+            for entry in sample_log_entries:
+                tee.write_entry(entry)
+
+        count = len(sample_log_entries)
+        documents = [
+            json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()
+        ]
+        assert [document["type"] for document in documents] == [
+            entry.log_type for entry in sample_log_entries
+        ]
+        assert len(text.getvalue().splitlines()) == count
+        assert loghub.entry_count == count
+        assert tee.entry_count == count
+        assert [stats.chunks for stats in tee.stats] == [count] * 3
+
+    def test_sink_error_is_raised(self, sample_log_entries):
+        """A failing sink should surface its error without blocking the others."""
+        good = StringIO()
+        tee = TeeHandler(
+            [
+                (JSONFormatter(), FailingHandler(stream=StringIO())),
+                (JSONFormatter(), StreamOutputHandler(stream=good, add_newline=False)),
+            ]
+        )
+
+        tee.write_entries(sample_log_entries)
+        with pytest.raises(OSError, match="disk full"):
+            tee.close()
+        assert len(good.getvalue().splitlines()) == len(sample_log_entries)
+
+    def test_string_handler_needs_formatter(self):
+        """A handler of formatted strings cannot be a sink on its own."""
+        with pytest.raises(ValueError):
+            TeeHandler([StreamOutputHandler(stream=StringIO())])
+
 
 class TestOutputHandlerInterface:
     """Tests for output handler interface compliance."""
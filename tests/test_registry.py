@@ -4,6 +4,8 @@ Tests for agnolog.core.registry module.
 Tests the LogTypeRegistry class and register_log_type decorator.
 """
 
+from pathlib import Path
+
 import pytest
 
 from agnolog.core.errors import (
@@ -11,10 +13,13 @@ from agnolog.core.errors import (
     InvalidLogTypeError,
     LogTypeNotFoundError,
 )
+from agnolog.core.factory import LogFactory
+from agnolog.core.lua_adapter import get_lua_registry
 from agnolog.core.registry import (
     LogTypeRegistry,
     get_registry,
     register_log_type,
+    register_lua_generators,
 )
 from agnolog.core.types import (
     LogSeverity,
@@ -430,3 +435,43 @@ class TestPopulatedRegistry:
         """Should have technical types."""
         assert populated_registry.is_registered("technical.connection_open")
         assert populated_registry.is_registered("technical.error")
+
+
+class TestMixedThemeRegistration:
+    """Tests for loading several themes side by side under namespaces."""
+
+    RESOURCES = Path(__file__).parent.parent / "resources"
+
+    def test_namespaced_types_registered(self, isolated_registries):
+        """Each theme's types should be registered under its namespace."""
+        register_lua_generators(self.RESOURCES / "mmorpg", namespace="mmorpg")
+        register_lua_generators(self.RESOURCES / "chess.com", namespace="chess.com")
+
+        assert isolated_registries.is_registered("mmorpg:player.login")
+        assert isolated_registries.is_registered("chess.com:player.login")
+        assert not isolated_registries.is_registered("player.login")
+
+    def test_each_namespace_has_own_sandbox(self, isolated_registries):
+        """Namespaces should not share a sandbox."""
+        register_lua_generators(self.RESOURCES / "mmorpg", namespace="mmorpg")
+        register_lua_generators(self.RESOURCES / "chess.com", namespace="chess.com")
+
+        lua_registry = get_lua_registry()
+        assert sorted(lua_registry.namespaces()) == ["chess.com", "mmorpg"]
+        assert lua_registry.get_sandbox("mmorpg") is not lua_registry.get_sandbox("chess.com")
+
+    def test_namespaced_entry_uses_qualified_type(self, isolated_registries):
+        """Entries should carry the namespaced log type."""
+        register_lua_generators(self.RESOURCES / "mmorpg", namespace="mmorpg")
+
+        entry = LogFactory(registry=isolated_registries).create("mmorpg:player.login")
+
+        assert entry is not None
+        assert entry.log_type == "mmorpg:player.login"
+        assert entry.category == "PLAYER"
+        assert "error" not in entry.data
+
+    def test_invalid_namespace_raises(self, isolated_registries):
+        """Namespaces containing the separator should be rejected."""
+        with pytest.raises(ValueError):
+            register_lua_generators(self.RESOURCES / "mmorpg", namespace="bad:name")
@@ -287,6 +287,24 @@ class TestLogScheduler:
 
         assert len(entries) == 5
 
+    def test_generate_chunks(self, scheduler):
+        """Chunks should split the generate_range stream."""
+        scheduler.enable_log_types()
+        start = datetime(2024, 1, 15, 12, 0, 0)
+        end = start + timedelta(hours=24)
+
+        chunks = list(scheduler.generate_chunks(start, end, max_logs=25, chunk_size=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        timestamps = [entry.timestamp for chunk in chunks for entry in chunk]
+        assert timestamps == sorted(timestamps)
+
+    def test_generate_chunks_invalid_size(self, scheduler):
+        """Chunk size must be positive."""
+        start = datetime(2024, 1, 15, 12, 0, 0)
+        with pytest.raises(ValueError):
+            next(scheduler.generate_chunks(start, start + timedelta(hours=1), chunk_size=0))
+
     def test_generate_count(self, scheduler):
         """Should generate exact count."""
         scheduler.enable_log_types()